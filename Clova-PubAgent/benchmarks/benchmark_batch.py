@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+/batch 벤치마크 - 대시보드처럼 /search_only, /company_data를 하나씩 반복 호출할 때와
+같은 항목을 /batch 한 번으로 보낼 때의 전체 시간/응답 크기 비교
+
+api.py 앱을 같은 프로세스의 uvicorn으로 띄우고 (LLM은 가짜 공급자) 최신 분기 회사들로
+질문 항목과 (회사, 연도, 분기) 항목을 절반씩 만듦. --duplicates 비율만큼은 앞 항목을 반복
+(대시보드 위젯끼리 같은 회사를 조회하는 경우). 두 방식 모두 캐시를 예열한 뒤 측정.
+
+Usage:
+    python benchmarks/benchmark_batch.py [--items 40] [--duplicates 0.25] [--repeat 3] [--no-raw-data]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import statistics
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_search"))
+
+
+def post_json(url, payload, timeout=300):
+    """(상태 코드, 응답 바이트 수)"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, len(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, len(e.read())
+
+
+def start_inprocess_server(data_path):
+    """api.app을 가짜 LLM 공급자로 띄우고 (base URL, server) 반환"""
+    os.environ["DART_LLM_PROVIDER"] = "fake"
+    os.environ.setdefault("DART_ANALYSIS_PREFETCH_WORKERS", "0")
+
+    import search_engine
+    search_engine.BASE_DATA_PATH = data_path
+    import api
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server, api
+
+
+def build_items(api, count, duplicates):
+    year, quarter = api.search_engine.corpus_index.quarters()[-1]
+    entries = api.search_engine.corpus_index.entries(year, quarter)
+    unique = max(1, round(count * (1 - duplicates)))
+    sample = random.Random(7).sample(entries, min(unique, len(entries)))
+
+    items = []
+    for i, entry in enumerate(sample):
+        if i % 2 == 0:
+            items.append({"query": f"{entry['company_name']} {year}년 {quarter}분기 실적"})
+        else:
+            items.append({"company_name": entry["company_name"], "year": year, "quarter": quarter})
+    rng = random.Random(11)
+    while len(items) < count:
+        items.append(dict(rng.choice(items[:len(sample)])))
+    return items
+
+
+def run_separate(base_url, items, options):
+    """항목마다 /search_only 또는 /company_data 호출 (대시보드의 기존 반복문)"""
+    total_bytes, failed = 0, 0
+    for item in items:
+        endpoint = "/search_only" if "query" in item else "/company_data"
+        status, size = post_json(f"{base_url}{endpoint}", {**item, **options})
+        total_bytes += size
+        failed += status != 200
+    return total_bytes, failed
+
+
+def run_batch(base_url, items, options):
+    status, size = post_json(f"{base_url}/batch", {"items": items, **options})
+    return size, 0 if status == 200 else len(items)
+
+
+def measure(fn, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total_bytes, failed = fn()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), total_bytes, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/batch 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--items', type=int, default=40)
+    parser.add_argument('--duplicates', type=float, default=0.25, help='반복 항목 비율')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-raw-data', action='store_true', help='include_raw_data=false로 요청')
+    args = parser.parse_args()
+
+    base_url, server, api = start_inprocess_server(os.path.abspath(args.data))
+    items = build_items(api, args.items, args.duplicates)
+    options = {"include_raw_data": False} if args.no_raw_data else {}
+
+    # 파일/인덱스/파싱 캐시 예열
+    run_separate(base_url, items, options)
+
+    print(f"📊 항목 {len(items)}개 (질문/회사 데이터 절반씩, 반복 {args.duplicates:.0%}), "
+          f"raw_data {'제외' if args.no_raw_data else '포함'}, {args.repeat}회 중앙값\n")
+    for label, fn in (("개별 호출 (반복문)", lambda: run_separate(base_url, items, options)),
+                      ("/batch 1회", lambda: run_batch(base_url, items, options))):
+        seconds, total_bytes, failed = measure(fn, args.repeat)
+        print(f"{label:<20} {seconds * 1e3:9.1f}ms  응답 {total_bytes / 1024:9.1f}K  실패 {failed}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
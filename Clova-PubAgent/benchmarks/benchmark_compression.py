@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+zstd 압축 벤치마크 - 사전 유무별 압축률과 복원 처리량
+
+Usage:
+    python benchmarks/benchmark_compression.py [--data dart_api_data] [--quarter 2025/Q1] [--files 500]
+"""
+
+import os
+import sys
+import glob
+import time
+import json
+import random
+import shutil
+import argparse
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_agent", "pub_agent", "utils"))
+
+import zstandard as zstd
+from corpus_compress import DEFAULT_DICT_SIZE, compress_bytes, train_dictionary, latest_dictionary
+from corpus_io import read_document_bytes
+
+
+def measure_decode(label, compressed, decompressor, source_bytes, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in compressed:
+            decompressor.decompress(payload)
+    elapsed = time.perf_counter() - start
+    throughput = source_bytes * rounds / elapsed / 1024 / 1024
+    ratio = source_bytes / sum(len(p) for p in compressed)
+    print(f"{label:<24} 압축률 x{ratio:5.2f}  복원 {throughput:8.1f} MB/s  "
+          f"({elapsed / (rounds * len(compressed)) * 1e6:7.1f} µs/파일)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='zstd 압축 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--quarter', default='2025/Q1')
+    parser.add_argument('--files', type=int, default=500, help='측정할 파일 수')
+    parser.add_argument('--level', type=int, default=19)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data, args.quarter, "companies", "*.json")))
+    random.seed(0)
+    files = random.sample(files, min(args.files, len(files)))
+    sources = []
+    for file_path in files:
+        with open(file_path, 'rb') as f:
+            sources.append(f.read())
+    source_bytes = sum(len(s) for s in sources)
+    print(f"📊 {len(sources)}개 파일, {source_bytes / 1024 / 1024:.1f}MB (level {args.level})\n")
+
+    # 측정 대상과 겹치지 않도록 별도 작업 디렉토리에서 사전 학습
+    work_dir = tempfile.mkdtemp(prefix="dart_zstd_bench_")
+    try:
+        quarter_dir = os.path.join(work_dir, args.quarter, "companies")
+        os.makedirs(quarter_dir)
+        for file_path in glob.glob(os.path.join(args.data, args.quarter, "companies", "*.json")):
+            if file_path not in files:
+                os.symlink(file_path, os.path.join(quarter_dir, os.path.basename(file_path)))
+
+        start = time.perf_counter()
+        train_dictionary(work_dir, dict_size=DEFAULT_DICT_SIZE)
+        print(f"   사전 학습 {time.perf_counter() - start:.1f}s\n")
+        dictionary = latest_dictionary(work_dir)
+
+        plain = [compress_bytes(s, None, args.level) for s in sources]
+        with_dict = [compress_bytes(s, dictionary, args.level) for s in sources]
+
+        measure_decode("zstd (사전 없음)", plain, zstd.ZstdDecompressor(), source_bytes, args.rounds)
+        measure_decode("zstd + 학습 사전", with_dict, zstd.ZstdDecompressor(dict_data=dictionary), source_bytes, args.rounds)
+
+        # 실제 읽기 경로 (사전 조회 + 복원 + JSON 파싱) vs 평문 JSON
+        for source_path, payload in zip(files[:100], with_dict[:100]):
+            with open(os.path.join(quarter_dir, os.path.basename(source_path) + ".zst"), 'wb') as f:
+                f.write(payload)
+        compressed_paths = sorted(glob.glob(os.path.join(quarter_dir, "*.json.zst")))
+
+        start = time.perf_counter()
+        for path in files[:len(compressed_paths)]:
+            json.loads(read_document_bytes(path))
+        plain_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in compressed_paths:
+            json.loads(read_document_bytes(path))
+        zst_elapsed = time.perf_counter() - start
+
+        count = len(compressed_paths)
+        print(f"\n읽기+파싱 (평문 .json)   {plain_elapsed / count * 1e3:6.2f} ms/파일")
+        print(f"읽기+파싱 (.json.zst)    {zst_elapsed / count * 1e3:6.2f} ms/파일")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+요약 컨텍스트 벤치마크 - 기존 방식(요약 섹션 마크다운 전체 연결) vs 토큰 예산 컨텍스트 빌더
+분기 전체 회사에 대해 프롬프트 크기(추정 토큰)와 컨텍스트 구성 시간을 비교하고,
+--llm N 지정 시 기존 컨텍스트가 가장 큰 N개 회사로 Gemini 요약 지연 시간도 측정
+
+Usage:
+    python benchmarks/benchmark_context_builder.py [--data dart_api_data] [--year 2025] [--quarter 2] [--budget 6000]
+    python benchmarks/benchmark_context_builder.py --llm 5    # GOOGLE_API_KEY 필요
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_agent", "pub_agent", "utils"))
+
+from corpus_index import CorpusIndex
+from corpus_io import load_document
+from postprocess_regular import DartRegularPostprocessor
+from context_builder import SummaryContextBuilder, estimate_tokens
+
+# search_engine.SUMMARY_API_KEYS와 동일
+SUMMARY_API_KEYS = ("api_02", "api_08", "api_12")
+QUERIES = ("실적 어때?", "배당 정책 알려줘", "자회사 투자 현황")
+
+
+def legacy_context(processed, quarter_comparison=""):
+    """기존 generate_summary 컨텍스트 (요약 섹션 마크다운을 그대로 연결)"""
+    api_data = processed.get("api_data", {})
+    selected = {key: api_data[key] for key in SUMMARY_API_KEYS if key in api_data} or api_data
+    context = f"""# 메타데이터: {processed.get("metadata", {})}\n\n\n# 데이터"""
+    for section in selected.values():
+        context += f"\n\n{section}"
+    if quarter_comparison:
+        context += f"\n\n\n{quarter_comparison}"
+    return context
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def describe(label, tokens, seconds):
+    print(f"{label:<16} 평균 {sum(tokens) / len(tokens):8.0f}  p50 {percentile(tokens, 0.5):7d}  "
+          f"p95 {percentile(tokens, 0.95):7d}  최대 {max(tokens):7d}  "
+          f"구성 {sum(seconds) / len(seconds) * 1e3:6.2f}ms/건")
+
+
+def measure_llm(contexts, query):
+    # 검색 엔진과 같은 모델/게이트웨이 (동시 호출/분당 호출 제한, 재시도 공유)
+    sys.path.append(os.path.join(ROOT_DIR, "dart_search"))
+    from search_engine import SUMMARY_MODEL
+    from llm_gateway import get_chat_model
+
+    llm = get_chat_model("gemini", SUMMARY_MODEL, temperature=0.1, convert_system_message_to_human=True)
+    prompt = "다음 DART 공시 데이터를 바탕으로 핵심 요약을 3-5줄로 작성하세요.\n\n{context}\n\n질문: {query}"
+    latencies = []
+    for context in contexts:
+        start = time.perf_counter()
+        llm.invoke(prompt.format(context=context, query=query))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요약 컨텍스트 빌더 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--quarter', type=int, default=2)
+    parser.add_argument('--budget', type=int, default=6000, help='토큰 예산')
+    parser.add_argument('--max-rows', type=int, default=20, help='표당 최대 행 수')
+    parser.add_argument('--files', type=int, default=0, help='측정할 파일 수 (0이면 전체)')
+    parser.add_argument('--llm', type=int, default=0, help='Gemini 지연 시간을 잴 회사 수 (기존 컨텍스트가 큰 순)')
+    args = parser.parse_args()
+
+    index = CorpusIndex(args.data)
+    entries = index.entries(args.year, args.quarter)
+    if args.files:
+        entries = entries[:args.files]
+
+    postprocessor = DartRegularPostprocessor()
+    builder = SummaryContextBuilder(args.budget, args.max_rows, template_keys=SUMMARY_API_KEYS)
+
+    legacy_tokens, legacy_seconds = [], []
+    built_tokens, built_seconds = [], []
+    samples = []
+    for entry in entries:
+        raw = load_document(entry["file_path"])
+        processed = postprocessor.process_regular_data(raw)
+
+        start = time.perf_counter()
+        old = legacy_context(processed)
+        legacy_seconds.append(time.perf_counter() - start)
+        legacy_tokens.append(estimate_tokens(old))
+
+        for query in QUERIES:
+            start = time.perf_counter()
+            new = builder.build(raw, query)["context"]
+            built_seconds.append(time.perf_counter() - start)
+            built_tokens.append(estimate_tokens(new))
+
+        samples.append((legacy_tokens[-1], entry["company_name"], old, builder.build(raw, QUERIES[0])["context"]))
+
+    print(f"📊 {args.year}년 {args.quarter}분기 {len(entries)}개 회사, 예산 {args.budget}토큰 / 표당 {args.max_rows}행\n")
+    print("추정 토큰 (프롬프트 템플릿 제외)")
+    describe("기존", legacy_tokens, legacy_seconds)
+    describe("컨텍스트 빌더", built_tokens, built_seconds)
+    over_budget = sum(1 for tokens in legacy_tokens if tokens > args.budget)
+    print(f"\n기존 방식에서 예산 초과: {over_budget}개 회사, "
+          f"총 토큰 {sum(legacy_tokens):,} → {sum(built_tokens) // len(QUERIES):,} (질문 평균)")
+
+    samples.sort(reverse=True)
+    print("\n기존 컨텍스트가 가장 큰 회사")
+    for tokens, name, _, new in samples[:5]:
+        print(f"  {name:<20} {tokens:8,d} → {estimate_tokens(new):6,d} 토큰")
+
+    if args.llm:
+        targets = samples[:args.llm]
+        print(f"\n⏱️  Gemini 요약 지연 시간 ({len(targets)}개 회사)")
+        old_latencies = measure_llm([old for _, _, old, _ in targets], QUERIES[0])
+        new_latencies = measure_llm([new for _, _, _, new in targets], QUERIES[0])
+        for (_, name, _, _), old_s, new_s in zip(targets, old_latencies, new_latencies):
+            print(f"  {name:<20} {old_s:6.1f}s → {new_s:6.1f}s")
+        print(f"  평균 {sum(old_latencies) / len(old_latencies):6.1f}s → {sum(new_latencies) / len(new_latencies):6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+회사명 퍼지 검색 벤치마크 - 기존 SequenceMatcher 전수 비교 vs 자모 trigram 인덱스
+오타(모음 치환, 글자 누락, 인접 글자 교환, 띄어쓰기)를 넣은 회사명으로 top-1 정확도와 지연 시간 비교
+
+Usage:
+    python benchmarks/benchmark_fuzzy_names.py [--data dart_api_data] [--year 2025] [--quarter 2] [--queries 300]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from difflib import SequenceMatcher
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_agent", "pub_agent", "utils"))
+
+from corpus_index import CorpusIndex
+from corpus_io import is_document_filename, strip_document_suffix
+
+
+def legacy_find_similar(target_name, file_list):
+    """기존 find_similar_company_names (SequenceMatcher, 유사도 0.5 초과, 상위 5개)"""
+    candidates = []
+    for filename in file_list:
+        if is_document_filename(filename):
+            company_part = strip_document_suffix(filename).split('_', 1)[1]
+            similarity = SequenceMatcher(None, target_name, company_part).ratio()
+            if similarity > 0.5:
+                candidates.append((filename, company_part, similarity))
+    candidates.sort(key=lambda x: x[2], reverse=True)
+    return candidates[:5]
+
+
+def _compose(lead, vowel, tail):
+    return chr(0xAC00 + lead * 588 + vowel * 28 + tail)
+
+
+def misspell(name, rng):
+    """한 글자 수준의 오타 하나"""
+    hangul = [i for i, c in enumerate(name) if 0xAC00 <= ord(c) <= 0xD7A3]
+    kind = rng.choice(["vowel", "drop", "swap", "space"])
+
+    if kind == "vowel" and hangul:
+        i = rng.choice(hangul)
+        offset = ord(name[i]) - 0xAC00
+        vowel = (offset % 588) // 28
+        new_vowel = (vowel + rng.choice([-1, 1])) % 21
+        return name[:i] + _compose(offset // 588, new_vowel, offset % 28) + name[i + 1:]
+    if kind == "drop" and len(name) >= 4:
+        i = rng.randrange(1, len(name))
+        return name[:i] + name[i + 1:]
+    if kind == "swap" and len(name) >= 3:
+        i = rng.randrange(len(name) - 1)
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    i = rng.randrange(1, len(name))
+    return name[:i] + " " + name[i:]
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='회사명 퍼지 검색 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--quarter', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+
+    index = CorpusIndex(args.data)
+    entries = [e for e in index.entries(args.year, args.quarter) if len(e["company_name"]) >= 3]
+    file_list = index.filenames(args.year, args.quarter)
+
+    start = time.perf_counter()
+    index.fuzzy_find("warmup", args.year, args.quarter)
+    print(f"📊 {len(file_list)}개 회사, 퍼지 인덱스 구축 {(time.perf_counter() - start) * 1e3:.1f}ms\n")
+
+    rng = random.Random(7)
+    cases = []
+    for entry in rng.sample(entries, min(args.queries, len(entries))):
+        typo = misspell(entry["company_name"], rng)
+        # 오타가 다른 회사의 정확한 이름이면 정답이 모호하므로 제외
+        if index.find(typo, args.year, args.quarter)[1] != "exact":
+            cases.append((typo, entry["filename"]))
+
+    results = {}
+    for label, search in (
+        ("SequenceMatcher", lambda q: [c[0] for c in legacy_find_similar(q, file_list)]),
+        ("자모 trigram 인덱스", lambda q: [e["filename"] for e, _ in index.fuzzy_find(q, args.year, args.quarter)]),
+    ):
+        latencies = []
+        top1 = top5 = 0
+        for query, expected in cases:
+            start = time.perf_counter()
+            found = search(query)
+            latencies.append(time.perf_counter() - start)
+            top1 += bool(found) and found[0] == expected
+            top5 += expected in found
+        results[label] = (top1, top5, latencies)
+
+    print(f"{'':<22} {'top-1':>7} {'top-5':>7} {'평균':>10} {'p95':>10}")
+    for label, (top1, top5, latencies) in results.items():
+        print(f"{label:<20} {top1 / len(cases):7.1%} {top5 / len(cases):7.1%} "
+              f"{sum(latencies) / len(latencies) * 1e3:8.3f}ms {percentile(latencies, 0.95) * 1e3:8.3f}ms")
+    print(f"\n(오타 질의 {len(cases)}개)")
+
+
+if __name__ == "__main__":
+    main()
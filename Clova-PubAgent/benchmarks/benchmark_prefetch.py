@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+추측 프리페치 벤치마크 - 규칙 기반 파서가 확신하지 못해 LLM으로 넘어가는 질문에서
+LLM 파싱 동안 후보 파일을 미리 로드/후처리했을 때의 적중률과 "LLM 응답 후 데이터 준비까지" 시간 비교
+
+LLM 파싱은 --llm-latency초 대기로 대신하고, 정답(LLM 응답)은 질문을 만든 회사/기간으로 둠.
+디스크 후처리 캐시는 임시 디렉토리를 써서 매 파일이 콜드 로드가 되도록 함.
+
+Usage:
+    python benchmarks/benchmark_prefetch.py [--data dart_api_data] [--year 2025] [--quarter 2] [--queries 200]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_agent", "pub_agent", "utils"))
+
+from corpus_index import CorpusIndex
+from query_parser import QueryParser, FAST_PATH_MIN_CONFIDENCE
+from disclosure_cache import DisclosureCache
+from processed_cache import ProcessedDiskCache
+from speculative_prefetch import SpeculativePrefetcher
+
+
+# 파서 확신도가 FAST_PATH_MIN_CONFIDENCE 미만이 되는 질문 유형
+TEMPLATES = (
+    "{name}랑 {other} 중에 {name} {quarter}분기 실적 알려줘",   # 회사 여러 개
+    "작년이랑 올해 {name} 실적 비교해줘",                       # 연도 여러 개
+    "이번에{name}실적 어땠어",                                  # 단어 경계 아님
+    "{typo} {quarter}분기 실적",                                # 오타 (후보 없음/빗나감)
+)
+
+
+def make_queries(entries, count, quarter, seed=7):
+    rng = random.Random(seed)
+    names = [entry["company_name"] for entry in entries if len(entry["company_name"]) >= 3]
+    queries = []
+    for i in range(count):
+        name, other = rng.sample(names, 2)
+        typo = name[:-1] + ("가" if name[-1] != "가" else "나")
+        template = TEMPLATES[i % len(TEMPLATES)]
+        queries.append((template.format(name=name, other=other, typo=typo, quarter=quarter), name))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='추측 프리페치 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--quarter', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--candidates', type=int, default=2, help='질문당 미리 로드할 파일 수')
+    parser.add_argument('--llm-latency', type=float, default=0.3, help='LLM 파싱 대기 시간(초)')
+    args = parser.parse_args()
+
+    index = CorpusIndex(args.data)
+    query_parser = QueryParser(index)
+    entries = index.entries(args.year, args.quarter)
+    queries = make_queries(entries, args.queries, args.quarter)
+
+    with tempfile.TemporaryDirectory() as cache_root:
+        # 비교 대상마다 따로 콜드 캐시
+        def fresh_cache(label):
+            return DisclosureCache(disk_cache=ProcessedDiskCache(cache_root=os.path.join(cache_root, label)))
+
+        sequential_cache = fresh_cache("sequential")
+        speculative_cache = fresh_cache("speculative")
+        prefetcher = SpeculativePrefetcher(speculative_cache.load_processed, max_candidates=args.candidates)
+
+        fast_path = 0
+        sequential_waits, speculative_waits = [], []
+        for query, truth in queries:
+            if query_parser.parse(query)["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+                fast_path += 1
+                continue
+            entry, _ = index.find(truth, args.year, args.quarter)
+            if not entry:
+                continue
+
+            # 기존: LLM 응답 후 로드
+            time.sleep(args.llm_latency)
+            start = time.perf_counter()
+            sequential_cache.load_processed(entry["file_path"])
+            sequential_waits.append(time.perf_counter() - start)
+
+            # 추측 프리페치: LLM 대기 중 후보 로드, 응답 후 적중이면 재사용
+            file_paths = []
+            for guess in query_parser.candidates(query, k=args.candidates):
+                guessed, _ = index.find(guess["company_name"], guess["year"], guess["quarter"])
+                file_paths.append(guessed["file_path"] if guessed else None)
+            speculation = prefetcher.start(file_paths)
+            time.sleep(args.llm_latency)
+            start = time.perf_counter()
+            hit, data = prefetcher.resolve(speculation, entry["file_path"])
+            if not hit:
+                speculative_cache.load_processed(entry["file_path"])
+            speculative_waits.append(time.perf_counter() - start)
+
+    stats = prefetcher.stats()
+    measured = len(sequential_waits)
+    print(f"📊 {args.year}년 {args.quarter}분기, 질문 {len(queries)}개 (규칙 기반 확정 {fast_path}개 제외, LLM 경로 {measured}개)")
+    print(f"   LLM 파싱 {args.llm_latency:.1f}s 가정, 질문당 후보 최대 {args.candidates}개\n")
+    print(f"추측 시작 {stats['started']}회, 후보 없음 {stats['skipped']}회")
+    print(f"적중 {stats['hits']} / 빗나감 {stats['misses']} → 적중률 {stats['hit_rate'] * 100:.1f}% "
+          f"(시도한 질문 기준), LLM 경로 전체 기준 {stats['hits'] / measured * 100 if measured else 0:.1f}%")
+    print(f"로드한 후보 파일 {stats['files_loaded']}개 중 버린 파일 {stats['files_wasted']}개\n")
+    print("LLM 응답 후 데이터 준비까지")
+    for label, waits in (("기존 (순차)", sequential_waits), ("추측 프리페치", speculative_waits)):
+        ordered = sorted(waits)
+        print(f"  {label:<14} 평균 {sum(waits) / len(waits) * 1e3:7.2f}ms  "
+              f"p50 {ordered[len(ordered) // 2] * 1e3:7.2f}ms  p95 {ordered[int(len(ordered) * 0.95)] * 1e3:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+응답 크기/인코딩 벤치마크 - /summarize, /search_only, /company_data 응답을
+기존 방식(response_model 검증 + jsonable_encoder + json)과 변경 후(요청 옵션으로 raw_data 축소 +
+orjson 직접 인코딩)로 만들어 회사당 크기(원본/gzip/brotli)와 인코딩 시간 비교
+
+/summarize, /search_only의 raw_data는 후처리된 공시(마크다운 표), /company_data는 원본 행 데이터.
+LLM은 호출하지 않음 (요약은 가짜 공급자의 lorem 텍스트).
+brotli 크기는 brotli 패키지가 있을 때만 출력.
+
+Usage:
+    python benchmarks/benchmark_responses.py [--data dart_api_data] [--companies 20] [--repeat 5]
+"""
+
+import os
+import sys
+import gzip
+import time
+import random
+import argparse
+import statistics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_search"))
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# 옵션별 요청 (기본값 = 기존 응답과 동일)
+OPTIONS = (
+    ("전체 (기존과 동일)", {}),
+    ("raw_data 제외", {"include_raw_data": False}),
+    ("섹션 3개", {"sections": ["api_02", "api_08", "api_12"]}),
+    ("섹션별 20행", {"page_size": 20}),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='응답 크기/인코딩 벤치마크')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5, help='회사당 인코딩 반복 횟수')
+    args = parser.parse_args()
+
+    os.environ["DART_LLM_PROVIDER"] = "fake"
+    import search_engine
+    search_engine.BASE_DATA_PATH = os.path.abspath(args.data)
+    import api
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fake_llm import fake_summary
+
+    engine = api.search_engine
+    year, quarter = engine.corpus_index.quarters()[-1]
+    entries = engine.corpus_index.entries(year, quarter)
+    sample = random.Random(7).sample(entries, min(args.companies, len(entries)))
+    summary = fake_summary(f"## 회사 {year}년 {quarter}분기 보고서 요약", 1200)
+
+    # 엔드포인트: (경로, 응답 모델, 요청 모델, raw_data 종류, raw_data 외 필드)
+    endpoints = (
+        ("/summarize", api.SummaryResponse, api.QueryRequest, "processed",
+         lambda result: {"summary": summary, "extracted_info": {"year": year, "quarter": quarter},
+                         "company_name": result["company_name"], "success": True, "cached": False}),
+        ("/search_only", api.SearchResponse, api.QueryRequest, "processed",
+         lambda result: {"extracted_info": {"year": year, "quarter": quarter},
+                         "company_name": result["company_name"], "success": True}),
+        ("/company_data", api.CompanyDataResponse, api.CompanyDataRequest, "raw",
+         lambda result: {"company_name": result["company_name"], "year": year, "quarter": quarter, "success": True}),
+    )
+
+    results = []
+    for entry in sample:
+        result = engine.get_company_data(entry["company_name"], year, quarter)
+        if not result.get("error"):
+            result["processed"] = engine.load_disclosure_file(entry["file_path"])
+            results.append(result)
+    print(f"📊 {year}년 {quarter}분기 회사 {len(results)}개, 인코딩 {args.repeat}회 반복 "
+          f"({api.JSON_RESPONSE_CLASS.__name__}, 압축 {'gzip/br' if brotli else 'gzip'})\n")
+    print(f"{'엔드포인트':<14} {'응답':<20} {'크기':>9} {'gzip':>9} {'br':>9} {'인코딩':>9}")
+
+    for path, response_model, request_model, kind, base in endpoints:
+        raw_key = "raw_data" if kind == "raw" else "processed"
+        request_fields = {"query": "q"} if request_model is api.QueryRequest else \
+            {"company_name": "q", "year": year, "quarter": quarter}
+
+        def measure(build, encode):
+            sizes, gzipped, brotlied, seconds = [], [], [], []
+            for result in results:
+                content = build(result)
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    body = encode(content)
+                seconds.append((time.perf_counter() - start) / args.repeat)
+                sizes.append(len(body))
+                gzipped.append(len(gzip.compress(body, compresslevel=9)))
+                if brotli:
+                    brotlied.append(len(brotli.compress(body, quality=4)))
+            return sizes, gzipped, brotlied, seconds
+
+        def row(label, measured):
+            sizes, gzipped, brotlied, seconds = measured
+            kb = lambda values: f"{statistics.mean(values) / 1024:8.1f}K" if values else f"{'-':>9}"
+            print(f"{path:<14} {label:<20} {kb(sizes)} {kb(gzipped)} {kb(brotlied)} "
+                  f"{statistics.mean(seconds) * 1e3:7.2f}ms")
+
+        # 기존: 핸들러가 dict 반환 → response_model 검증 → jsonable_encoder → json.dumps
+        legacy = measure(lambda result: {**base(result), "raw_data": result[raw_key]},
+                         lambda content: JSONResponse(jsonable_encoder(response_model(**content))).body)
+        row("기존 (json)", legacy)
+
+        for label, options in OPTIONS:
+            request = request_model(**request_fields, **options)
+
+            def build(result, request=request):
+                raw_data, raw_data_pages = api.shape_raw_data(result[raw_key], request)
+                return {**base(result), "raw_data": raw_data, "raw_data_pages": raw_data_pages}
+
+            row(label, measure(build, lambda content: api.JSON_RESPONSE_CLASS(content).body))
+        print()
+
+
+if __name__ == "__main__":
+    main()
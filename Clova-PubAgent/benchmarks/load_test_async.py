@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+API 부하 테스트 - 동기 엔진 호출(기존 핸들러) vs 비동기 엔진 호출(ainvoke) 동시 처리량 비교
+
+기본 모드는 api.py 앱을 같은 프로세스의 uvicorn으로 띄우고, 요약/파싱 LLM을 가짜 공급자
+(DART_LLM_PROVIDER=fake, --llm-latency는 DART_FAKE_LLM_LATENCY 형식)로 바꿔
+외부 API 비용 없이 이벤트 루프 블로킹 효과만 측정:
+    /summarize_blocking : 기존 핸들러와 동일 (async def 안에서 search_and_summarize 동기 호출)
+    /summarize          : await asearch_and_summarize
+부하 중 /health 응답 시간도 함께 재서 다른 요청이 얼마나 막히는지 확인
+
+--url 지정 시 실행 중인 서버의 --endpoint만 측정 (실제 LLM, 요약 캐시는 서버에서 끌 것:
+DART_SUMMARY_CACHE_ENTRIES=0 DART_SUMMARY_CACHE_DISK=0)
+
+Usage:
+    python benchmarks/load_test_async.py [--concurrency 16] [--requests 64] [--llm-latency 1.0]
+    python benchmarks/load_test_async.py --url http://localhost:6000 --endpoint /summarize
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "dart_search"))
+
+# 규칙 기반 파서로 바로 풀리는 질문 (파싱 단계는 LLM 없이, 요약만 LLM)
+QUERIES = (
+    "삼성전자 2025년 2분기 실적 요약해줘",
+    "SK하이닉스 2025년 2분기 배당 알려줘",
+    "카카오 2025년 2분기 직원 현황",
+    "NAVER 2025년 2분기 투자 현황",
+    "현대자동차 2025년 2분기 실적",
+    "LG에너지솔루션 2025년 2분기 실적",
+)
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def post_json(url, payload, timeout):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def probe_health(base_url, stop, latencies, interval=0.05):
+    """부하 중 /health 응답 시간 (이벤트 루프가 막히면 길어짐)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=60) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except OSError:
+            pass
+        stop.wait(interval)
+
+
+def run_load(base_url, endpoint, concurrency, total, timeout):
+    latencies, errors = [], 0
+    health = []
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(base_url, stop, health), daemon=True)
+    prober.start()
+
+    def one(i):
+        start = time.perf_counter()
+        status = post_json(f"{base_url}{endpoint}", {"query": QUERIES[i % len(QUERIES)]}, timeout)
+        return status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(one, i) for i in range(total)]:
+            try:
+                status, seconds = future.result()
+                latencies.append(seconds)
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    return {
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "errors": errors,
+        "health_p50": percentile(health, 0.5),
+        "health_max": max(health) if health else 0.0,
+    }
+
+
+def report(label, result):
+    print(f"{label:<22} {result['throughput']:6.2f} req/s  p50 {result['p50']:6.2f}s  p95 {result['p95']:6.2f}s  "
+          f"오류 {result['errors']:3d}  /health p50 {result['health_p50'] * 1e3:7.1f}ms  최대 {result['health_max'] * 1e3:8.1f}ms")
+
+
+def start_inprocess_server(data_path, latency):
+    """api.app을 지연 모델로 띄우고 base URL 반환"""
+    # 요약 캐시를 끄지 않으면 두 번째 요청부터 LLM을 타지 않음
+    os.environ["DART_SUMMARY_CACHE_ENTRIES"] = "0"
+    os.environ["DART_SUMMARY_CACHE_DISK"] = "0"
+    # 가짜 LLM 공급자 (llm_gateway/fake_llm.py), 게이트웨이 제한은 부하가 막히지 않게 올림
+    os.environ["DART_LLM_PROVIDER"] = "fake"
+    os.environ["DART_FAKE_LLM_LATENCY"] = latency
+    for model in ("HCX_007", "GEMINI_2_5_PRO"):
+        os.environ.setdefault(f"DART_LLM_RPM_{model}", "1000000")
+        os.environ.setdefault(f"DART_LLM_CONCURRENCY_{model}", "1024")
+    # API 요청 수용 제한도 부하 동시성보다 크게 (제한 자체의 효과는 측정 대상 아님)
+    os.environ.setdefault("DART_API_SUMMARIZE_CONCURRENCY", "1024")
+    os.environ.setdefault("DART_API_SUMMARIZE_QUEUE", "1024")
+
+    import search_engine
+    search_engine.BASE_DATA_PATH = data_path
+    import api
+    import uvicorn
+
+    @api.app.post("/summarize_blocking")
+    async def summarize_blocking(request: api.QueryRequest):
+        """변경 전 /summarize: async 핸들러 안에서 동기 엔진 호출"""
+        return api.search_engine.search_and_summarize(request.query)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동기/비동기 API 부하 테스트')
+    parser.add_argument('--url', help='실행 중인 서버 주소 (미지정 시 같은 프로세스에서 실행)')
+    parser.add_argument('--endpoint', default='/summarize', help='--url 사용 시 측정할 엔드포인트')
+    parser.add_argument('--data', default=os.path.join(ROOT_DIR, 'dart_api_data'))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--llm-latency', default='1.0',
+                        help='가짜 LLM 호출당 지연: 초 또는 분포 (예: uniform:0.5:1.5, lognormal:1.0:0.4)')
+    parser.add_argument('--timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    if args.url:
+        print(f"🚀 {args.url}{args.endpoint}: 동시 {args.concurrency}, 요청 {args.requests}개\n")
+        report(args.endpoint, run_load(args.url.rstrip('/'), args.endpoint, args.concurrency, args.requests, args.timeout))
+        return
+
+    base_url, server = start_inprocess_server(args.data, args.llm_latency)
+    # 파일/인덱스 캐시 예열 (측정은 LLM 대기 중 블로킹 여부만)
+    for query in QUERIES:
+        post_json(f"{base_url}/summarize", {"query": query}, args.timeout)
+
+    print(f"🚀 같은 프로세스 uvicorn (워커 1개), LLM 지연 {args.llm_latency}s, "
+          f"동시 {args.concurrency}, 요청 {args.requests}개\n")
+    report("기존 (동기 호출)", run_load(base_url, "/summarize_blocking", args.concurrency, args.requests, args.timeout))
+    report("비동기 (ainvoke)", run_load(base_url, "/summarize", args.concurrency, args.requests, args.timeout))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -5,38 +5,40 @@ LLM 호출 없이 파일 검색 및 로드만 담당
 """
 
 import os
-import json
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional, List
-from difflib import SequenceMatcher
-from pub_agent.utils import DartRegularPostprocessor
+from pub_agent.utils import (
+    DartRegularPostprocessor, get_corpus_index, get_disclosure_cache, get_timeline_store, quarter_document
+)
 
 BASE_DATA_PATH = "/home/sese/Insight-Agent/Clova-PubAgent/dart_api_data"
 
+# 타임라인 분기별 후처리 결과 캐시 항목 수 ((corp_code, 분기 파일, mtime) 기준 LRU)
+PROCESSED_QUARTER_ENTRIES = int(os.getenv("DART_PROCESSED_QUARTER_ENTRIES", "256"))
+
 class DocumentSearcher:
     """순수 문서 검색 및 로드 기능만 제공"""
 
     def __init__(self):
         self.base_path = BASE_DATA_PATH
         self.postprocessor = DartRegularPostprocessor()
-
-    def find_similar_company_names(self, target_name: str, file_list: List[str]) -> List[str]:
-        """파일 리스트에서 유사한 회사명 찾기"""
-        candidates = []
-
-        for filename in file_list:
-            if filename.endswith('.json'):
-                try:
-                    if '_' in filename:
-                        company_part = filename.split('_', 1)[1].replace('.json', '')
-                        similarity = SequenceMatcher(None, target_name, company_part).ratio()
-                        if similarity > 0.5:  # 50% 이상 유사도
-                            candidates.append((filename, company_part, similarity))
-                except:
-                    continue
-
-        # 유사도 순으로 정렬
-        candidates.sort(key=lambda x: x[2], reverse=True)
-        return candidates[:5]  # 상위 5개만 반환
+        # 회사 → 파일 인덱스 (DartSearchEngine과 같은 프로세스면 공유)
+        self.corpus_index = get_corpus_index(self.base_path)
+        # 로드/후처리된 공시 캐시 (프로세스 전역 LRU)
+        self.disclosure_cache = get_disclosure_cache()
+        # 회사별 전 분기 타임라인 (분기 추가/수정 시 자동 재생성)
+        self.timeline_store = get_timeline_store(self.base_path)
+        # 타임라인 분기의 후처리 결과 (분기 파일이 바뀌면 mtime이 달라져 다시 후처리)
+        self._processed_quarters: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._processed_lock = threading.Lock()
+
+    def find_similar_company_names(self, target_name: str, year: int, quarter: int) -> List:
+        """분기 인덱스에서 유사한 회사명 찾기 (자모 trigram 퍼지 검색, 상위 5개)"""
+        return [
+            (entry["filename"], entry["company_name"], similarity)
+            for entry, similarity in self.corpus_index.fuzzy_find(target_name, year, quarter, k=5)
+        ]
 
     def find_and_load_disclosure(self, company_name: str, year: int, quarter: int) -> Optional[Dict]:
         """회사명, 연도, 분기로 공시 파일 검색 및 로드"""
@@ -44,66 +46,32 @@ class DocumentSearcher:
             print("파일 검색에 필요한 정보가 부족합니다.")
             return None
 
-        target_path = os.path.join(self.base_path, str(year), f"Q{quarter}", "companies")
-
-        if not os.path.exists(target_path):
-            print(f"경로를 찾을 수 없습니다: {target_path}")
+        if not self.corpus_index.has_quarter(year, quarter):
+            print(f"{year}년 {quarter}분기 데이터를 찾을 수 없습니다.")
             return None
 
         try:
-            file_list = os.listdir(target_path)
-
-            exact_match = None
-            partial_matches = []
-
-            for filename in file_list:
-                if filename.endswith('.json') and '_' in filename:
-                    try:
-                        file_company_name = filename.split('_', 1)[1].replace('.json', '')
-                        # 정확히 일치하는 경우
-                        if company_name == file_company_name:
-                            exact_match = filename
-                            break
-                        # 부분 매칭 후보 저장
-                        elif company_name in file_company_name or file_company_name in company_name:
-                            partial_matches.append((filename, file_company_name))
-                    except:
-                        continue
-
-            # 정확 매칭 우선
-            if exact_match:
-                file_path = os.path.join(target_path, exact_match)
-                print(f"파일을 찾았습니다: {exact_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
-                    processed_data = self.postprocessor.process_regular_data(raw_data)
-                    return {"raw_data": raw_data, "processed_data": processed_data}
-
-            # 부분 매칭이 여러 개 있으면 가장 짧은 이름 선택
-            if partial_matches:
-                partial_matches.sort(key=lambda x: len(x[1]))  # 이름 길이 기준 정렬
-                best_match = partial_matches[0][0]
-                file_path = os.path.join(target_path, best_match)
-                print(f"부분 매칭 파일을 사용합니다: {best_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
-                    processed_data = self.postprocessor.process_regular_data(raw_data)
-                    return {"raw_data": raw_data, "processed_data": processed_data}
+            entry, match_type = self.corpus_index.find(company_name, year, quarter)
+
+            # 정확 매칭 우선, 없으면 가장 짧은 이름의 부분 매칭
+            if entry:
+                if match_type == "exact":
+                    print(f"파일을 찾았습니다: {entry['filename']}")
+                else:
+                    print(f"부분 매칭 파일을 사용합니다: {entry['filename']}")
+                return self.disclosure_cache.get(entry["file_path"])
 
             # 유사도 검색
-            similar_companies = self.find_similar_company_names(company_name, file_list)
+            similar_companies = self.find_similar_company_names(company_name, year, quarter)
             if similar_companies:
                 print(f"정확한 매칭을 찾지 못했습니다. 유사한 회사들:")
                 for filename, company_part, similarity in similar_companies:
                     print(f"  - {company_part} (유사도: {similarity:.2f})")
 
                 best_match = similar_companies[0][0]
-                file_path = os.path.join(target_path, best_match)
+                file_path = self.corpus_index.get_by_filename(best_match, year, quarter)["file_path"]
                 print(f"가장 유사한 파일을 사용합니다: {best_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
-                    processed_data = self.postprocessor.process_regular_data(raw_data)
-                    return {"raw_data": raw_data, "processed_data": processed_data}
+                return self.disclosure_cache.get(file_path)
 
             print(f"'{company_name}'와 유사한 회사를 찾지 못했습니다.")
             return None
@@ -116,53 +84,23 @@ class DocumentSearcher:
         """회사명으로 사용 가능한 분기 보고서 목록 조회"""
         print(f"[SEARCHER] {company_name}의 분기 보고서 목록 조회 시작")
 
-        available_reports = []
-
-        # 2024, 2025년의 모든 분기 검색
-        for year in [2022,2023,2024, 2025]:
-            for quarter in [1, 2, 3, 4]:
-                target_path = os.path.join(self.base_path, str(year), f"Q{quarter}", "companies")
-
-                if not os.path.exists(target_path):
-                    continue
-
-                try:
-                    file_list = os.listdir(target_path)
-
-                    for filename in file_list:
-                        if filename.endswith('.json') and '_' in filename:
-                            try:
-                                file_company_name = filename.split('_', 1)[1].replace('.json', '')
-
-                                # 정확 매칭 또는 부분 매칭
-                                if (company_name == file_company_name or
-                                    company_name in file_company_name or
-                                    file_company_name in company_name):
-
-                                    # 파일이 실제로 존재하는지 확인
-                                    file_path = os.path.join(target_path, filename)
-                                    if os.path.exists(file_path):
-                                        available_reports.append({
-                                            "year": year,
-                                            "quarter": quarter,
-                                            "company_name": file_company_name,
-                                            "filename": filename,
-                                            "file_path": file_path
-                                        })
-                                        break  # 같은 분기에서 첫 번째 매칭만 취함
-                            except:
-                                continue
-
-                except Exception as e:
-                    print(f"경로 {target_path} 검색 중 오류: {e}")
-                    continue
+        # 2022~2025년의 모든 분기 검색 (인덱스 조회, 최신순)
+        available_reports = [
+            {
+                "year": entry["year"],
+                "quarter": entry["quarter"],
+                "company_name": entry["company_name"],
+                "filename": entry["filename"],
+                "file_path": entry["file_path"],
+                # manifest.json이 있는 분기만 채워짐 (파일을 열지 않고 누락 API 확인)
+                "successful_apis": entry["successful_apis"]
+            }
+            for entry in self.corpus_index.find_company_quarters(company_name, years=[2022, 2023, 2024, 2025])
+        ]
 
         if not available_reports:
             return {"error": f"'{company_name}'에 해당하는 분기 보고서를 찾을 수 없습니다."}
 
-        # 연도, 분기 순으로 정렬 (최신순)
-        available_reports.sort(key=lambda x: (x["year"], x["quarter"]), reverse=True)
-
         return {
             "company_name": company_name,
             "available_reports": available_reports,
@@ -170,69 +108,75 @@ class DocumentSearcher:
             "success": True
         }
 
+    def get_company_timeline(self, company_name: str) -> Dict:
+        """회사명으로 전 분기 타임라인 조회 (파일 하나 읽기)"""
+        print(f"[SEARCHER] {company_name}의 분기 타임라인 조회 시작")
+
+        # 가장 최신 분기에서 매칭된 회사의 고유번호 기준
+        matches = self.corpus_index.find_company_quarters(company_name, years=[2022, 2023, 2024, 2025])
+        corp_code = next((entry["corp_code"] for entry in matches if entry["corp_code"]), None)
+        if not corp_code:
+            return {"error": f"'{company_name}'에 해당하는 분기 보고서를 찾을 수 없습니다."}
+
+        try:
+            timeline = self.timeline_store.get(corp_code)
+        except Exception as e:
+            return {"error": f"타임라인 조회 중 오류 발생: {str(e)}"}
+
+        if not timeline:
+            return {"error": f"'{company_name}'에 해당하는 분기 보고서를 찾을 수 없습니다."}
+
+        return {
+            "company_name": timeline["corp_name"],
+            "corp_code": corp_code,
+            "timeline": timeline,
+            "success": True
+        }
+
+    def get_quarter_data(self, timeline: Dict, info: Dict) -> Dict:
+        """타임라인 한 분기의 {"raw_data", "processed_data"} (후처리 결과는 캐시에서 재사용)"""
+        raw_data = quarter_document(timeline, info["year"], info["quarter"])
+        key = (timeline["corp_code"], info["filename"], info["mtime"])
+
+        with self._processed_lock:
+            processed_data = self._processed_quarters.get(key)
+            if processed_data is not None:
+                self._processed_quarters.move_to_end(key)
+                return {"raw_data": raw_data, "processed_data": processed_data}
+
+        processed_data = self.postprocessor.process_regular_data(raw_data)
+        with self._processed_lock:
+            self._processed_quarters[key] = processed_data
+            while len(self._processed_quarters) > PROCESSED_QUARTER_ENTRIES:
+                self._processed_quarters.popitem(last=False)
+        return {"raw_data": raw_data, "processed_data": processed_data}
+
     def get_company_data(self, company_name: str, year: int, quarter: int) -> Dict:
         """회사명, 연도, 분기로 직접 원본 데이터 조회"""
         print(f"[SEARCHER] {company_name} {year}년 {quarter}분기 데이터 조회 시작")
 
-        target_path = os.path.join(self.base_path, str(year), f"Q{quarter}", "companies")
-
-        if not os.path.exists(target_path):
+        if not self.corpus_index.has_quarter(year, quarter):
             return {"error": f"{year}년 {quarter}분기 데이터 경로를 찾을 수 없습니다."}
 
         try:
-            file_list = os.listdir(target_path)
-
-            exact_match = None
-            partial_matches = []
-
-            for filename in file_list:
-                if filename.endswith('.json') and '_' in filename:
-                    try:
-                        file_company_name = filename.split('_', 1)[1].replace('.json', '')
-
-                        # 정확히 일치하는 경우
-                        if company_name == file_company_name:
-                            exact_match = filename
-                            break
-                        # 부분 매칭 후보 저장
-                        elif company_name in file_company_name or file_company_name in company_name:
-                            partial_matches.append((filename, file_company_name))
-                    except:
-                        continue
-
-            # 정확 매칭 우선
-            if exact_match:
-                file_path = os.path.join(target_path, exact_match)
-                print(f"파일을 찾았습니다: {exact_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    processed_data = self.postprocessor.process_regular_data(data)
-                    return {
-                        "company_name": data.get("metadata", {}).get("corp_name"),
-                        "year": year,
-                        "quarter": quarter,
-                        "raw_data": data,
-                        "processed_data": processed_data,
-                        "success": True
-                    }
-
-            # 부분 매칭이 있으면 사용
-            if partial_matches:
-                partial_matches.sort(key=lambda x: len(x[1]))  # 이름 길이 기준 정렬
-                best_match = partial_matches[0][0]
-                file_path = os.path.join(target_path, best_match)
-                print(f"부분 매칭 파일을 사용합니다: {best_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    processed_data = self.postprocessor.process_regular_data(data)
-                    return {
-                        "company_name": data.get("metadata", {}).get("corp_name"),
-                        "year": year,
-                        "quarter": quarter,
-                        "raw_data": data,
-                        "processed_data": processed_data,
-                        "success": True
-                    }
+            entry, match_type = self.corpus_index.find(company_name, year, quarter)
+
+            # 정확 매칭 우선, 없으면 부분 매칭 사용
+            if entry:
+                if match_type == "exact":
+                    print(f"파일을 찾았습니다: {entry['filename']}")
+                else:
+                    print(f"부분 매칭 파일을 사용합니다: {entry['filename']}")
+                cached = self.disclosure_cache.get(entry["file_path"])
+                data = cached["raw_data"]
+                return {
+                    "company_name": data.get("metadata", {}).get("corp_name"),
+                    "year": year,
+                    "quarter": quarter,
+                    "raw_data": data,
+                    "processed_data": cached["processed_data"],
+                    "success": True
+                }
 
             return {"error": f"'{company_name}'의 {year}년 {quarter}분기 데이터를 찾을 수 없습니다."}
 
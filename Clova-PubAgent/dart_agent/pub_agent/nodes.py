@@ -6,12 +6,15 @@ DART Agent LangGraph 노드들
 
 import os
 from typing import Dict, Any
-from langchain_naver import ChatClovaX
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from dotenv import load_dotenv
 
 from pub_agent.document_searcher import DocumentSearcher
+from pub_agent.utils import (
+    compare_quarters, format_comparison, get_query_parser, FAST_PATH_MIN_CONFIDENCE,
+    get_query_cache, get_chat_model
+)
 from dart_revised_search.dart_integrated_system import DartIntegratedSystem
 
 class DartAgentNodes:
@@ -19,15 +22,18 @@ class DartAgentNodes:
 
     def __init__(self):
         # LLM 초기화
-        self.query_parser_llm = ChatClovaX(
-            model="HCX-007",
-            temperature=0.1
-        )
+        self.query_parser_llm = get_chat_model("clova", "HCX-007", temperature=0.1)
 
 
         # 문서 검색기 초기화
         self.searcher = DocumentSearcher()
 
+        # 규칙 기반 질문 파서 (확신도가 높으면 HCX-007 호출 생략)
+        self.query_parser = get_query_parser(self.searcher.base_path)
+
+        # 질문 파싱 결과 캐시 (SQLite, 검색 엔진과 공유)
+        self.query_cache = get_query_cache(self.searcher.base_path)
+
         # DART 통합 시스템 초기화 (수정공시 검색용)
         self.dart_system = DartIntegratedSystem()
 
@@ -42,6 +48,39 @@ class DartAgentNodes:
                 "error": "질문이 제공되지 않았습니다."
             }
 
+        # 같은 질문은 이전 파싱 결과 재사용
+        cached_info = self.query_cache.get(query)
+        if cached_info:
+            print(f"[NODE] 파싱 캐시 적중: {cached_info.get('company_name')} {cached_info.get('year')}년 {cached_info.get('quarter')}분기")
+            return {
+                **state,
+                "search_params": {
+                    "company_name": cached_info.get("company_name"),
+                    "year": cached_info.get("year"),
+                    "quarter": cached_info.get("quarter"),
+                    "extracted_info": cached_info
+                }
+            }
+
+        # 회사명/연도/분기가 확실하면 LLM 없이 바로 검색 파라미터 구성
+        fast_info = self.query_parser.parse(query)
+        if fast_info["company_name"] and fast_info["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+            print(f"[NODE] 규칙 기반 파싱: {fast_info['company_name']} {fast_info['year']}년 {fast_info['quarter']}분기")
+            # 검색 엔진과 같은 형태로 저장 (confidence 제외)
+            info = {
+                "company_name": fast_info["company_name"],
+                "year": fast_info["year"],
+                "quarter": fast_info["quarter"]
+            }
+            self.query_cache.put(query, info, source="rule")
+            return {
+                **state,
+                "search_params": {
+                    **info,
+                    "extracted_info": info
+                }
+            }
+
         parser = JsonOutputParser()
 
         prompt = ChatPromptTemplate.from_template(
@@ -75,6 +114,8 @@ class DartAgentNodes:
                 "query": query,
                 "format_instructions": parser.get_format_instructions()
             })
+            if isinstance(extracted_info, dict) and extracted_info.get("company_name"):
+                self.query_cache.put(query, extracted_info, source="llm")
 
             # 추출된 정보를 search_params에 저장
             search_params = {
@@ -112,21 +153,28 @@ class DartAgentNodes:
                 }
             }
 
-        # 전체 분기보고서 검색
-        quarterly_reports = self.searcher.get_company_quarterly_reports(company_name)
+        # 전체 분기보고서 검색 (회사별 타임라인 한 번 읽기)
+        company_timeline = self.searcher.get_company_timeline(company_name)
 
-        if quarterly_reports.get("error"):
+        if company_timeline.get("error"):
             return {
                 "regular_results": {
-                    "error": quarterly_reports.get("error")
+                    "error": company_timeline.get("error")
                 }
             }
 
-        # 모든 분기보고서 실제 데이터 로드하고 요청된 항목 표시
-        available_reports = quarterly_reports.get("available_reports", [])
+        # 모든 분기보고서 데이터를 타임라인에서 꺼내고 요청된 항목 표시 (최신순)
+        timeline = company_timeline["timeline"]
         loaded_reports = []
 
-        for report in available_reports:
+        for info in reversed(timeline["quarters"]):
+            report = {
+                "year": info["year"],
+                "quarter": info["quarter"],
+                "company_name": company_timeline.get("company_name"),
+                "filename": info["filename"]
+            }
+
             # 요청된 연도/분기와 일치하는지 표시
             if (requested_year and requested_quarter and
                 report["year"] == requested_year and report["quarter"] == requested_quarter):
@@ -134,20 +182,24 @@ class DartAgentNodes:
             else:
                 report["is_target"] = False
 
-            # 모든 분기의 실제 데이터 로드
-            loaded_data = self.searcher.get_company_data(company_name, report["year"], report["quarter"])
-            if loaded_data.get("success"):
-                report["raw_data"] = loaded_data.get("raw_data")
-                report["processed_data"] = loaded_data.get("processed_data")
+            # 후처리 결과는 분기 파일이 바뀔 때까지 재사용
+            quarter_data = self.searcher.get_quarter_data(timeline, info)
+            report["raw_data"] = quarter_data["raw_data"]
+            report["processed_data"] = quarter_data["processed_data"]
 
             loaded_reports.append(report)
 
+        # 요청 분기(없으면 최신 분기)의 전분기 대비 변동
+        target = next((report for report in loaded_reports if report["is_target"]), loaded_reports[0])
+        quarter_comparison = format_comparison(compare_quarters(timeline, target["year"], target["quarter"]))
+
         # 검색 결과를 results에 저장
         results = {
-            "company_name": quarterly_reports.get("company_name"),
+            "company_name": company_timeline.get("company_name"),
             "search_type": "dart_regular_disclosure_all",
             "available_reports": loaded_reports,
-            "total_count": quarterly_reports.get("total_count", 0),
+            "total_count": len(loaded_reports),
+            "quarter_comparison": quarter_comparison,
             "requested_year": requested_year,
             "requested_quarter": requested_quarter,
             "success": True
@@ -4,7 +4,78 @@ Utility functions for DART Agent
 """
 
 from .postprocess_regular import DartRegularPostprocessor
+from .corpus_index import CorpusIndex, get_corpus_index
+from .disclosure_cache import DisclosureCache, get_disclosure_cache
+from .corpus_pack import PackReader, pack_quarter, unpack_quarter
+from .corpus_io import load_document, load_document_sections, is_document_filename, strip_document_suffix
+from .corpus_compress import train_dictionary, write_company_file
+from .corpus_store import CorpusStore
+from .processed_cache import ProcessedDiskCache
+from .corpus_manifest import load_manifest, record_files, validate_quarter
+from .company_timeline import (
+    CompanyTimelineStore, get_timeline_store, quarter_document, compare_quarters, format_comparison
+)
+from .query_parser import QueryParser, get_query_parser, FAST_PATH_MIN_CONFIDENCE
+from .query_cache import QueryParseCache, get_query_cache
+from .summary_cache import SummaryCache, get_summary_cache, summary_key, summary_intent
+from .context_builder import SummaryContextBuilder, estimate_tokens, query_section_keys
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .speculative_prefetch import SpeculativePrefetcher
+from .llm_gateway import ModelPool, GatewayChatModel, get_chat_model, get_model_pool, llm_stats
+from .fake_llm import FakeChatModel
+from .analysis_prefetch import AnalysisPrefetcher, analysis_key
+from .admission import AdmissionLane, AdmissionRejected
+from .single_flight import SingleFlight
 
 __all__ = [
-    "DartRegularPostprocessor"
+    "DartRegularPostprocessor",
+    "CorpusIndex",
+    "get_corpus_index",
+    "DisclosureCache",
+    "get_disclosure_cache",
+    "PackReader",
+    "pack_quarter",
+    "unpack_quarter",
+    "load_document",
+    "load_document_sections",
+    "is_document_filename",
+    "strip_document_suffix",
+    "train_dictionary",
+    "write_company_file",
+    "CorpusStore",
+    "ProcessedDiskCache",
+    "load_manifest",
+    "record_files",
+    "validate_quarter",
+    "CompanyTimelineStore",
+    "get_timeline_store",
+    "quarter_document",
+    "compare_quarters",
+    "format_comparison",
+    "QueryParser",
+    "get_query_parser",
+    "FAST_PATH_MIN_CONFIDENCE",
+    "QueryParseCache",
+    "get_query_cache",
+    "SummaryCache",
+    "get_summary_cache",
+    "summary_key",
+    "summary_intent",
+    "SummaryContextBuilder",
+    "estimate_tokens",
+    "query_section_keys",
+    "RateLimiter",
+    "get_rate_limiter",
+    "SpeculativePrefetcher",
+    "ModelPool",
+    "GatewayChatModel",
+    "get_chat_model",
+    "get_model_pool",
+    "llm_stats",
+    "FakeChatModel",
+    "AnalysisPrefetcher",
+    "analysis_key",
+    "AdmissionLane",
+    "AdmissionRejected",
+    "SingleFlight"
 ]
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Admission control - bounded lanes of concurrent requests for the API
+A lane admits at most `concurrency` requests at a time and lets at most
+`max_queue` more wait for a slot. When the queue is full a request is
+rejected at once (429), and one that waited `queue_timeout` seconds
+without getting a slot is rejected too (503). Both carry a Retry-After
+estimated from the lane's recent service times.
+
+Each lane also has its own thread pool for blocking work (lane.run), so
+file loads of one lane never queue behind another lane's.
+"""
+
+import math
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Callable, Optional
+
+
+class AdmissionRejected(Exception):
+    """Request not admitted: status_code 429 (queue full) or 503 (queue wait timed out)"""
+
+    def __init__(self, lane: str, status_code: int, retry_after: int, message: str):
+        super().__init__(message)
+        self.lane = lane
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted request's slot; release() is idempotent"""
+
+    def __init__(self, lane: "AdmissionLane"):
+        self.lane = lane
+        self.started = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.lane._leave(time.perf_counter() - self.started)
+
+
+class AdmissionLane:
+    """Concurrency slots + bounded wait queue + thread pool for one group of endpoints"""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, queue_timeout: float = 30.0,
+                 workers: Optional[int] = None):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.workers = workers or self.concurrency
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"lane-{name}")
+
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        # Moving average of how long an admitted request holds its slot
+        self._avg_seconds = 1.0
+
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.max_waiting = 0
+        self.waited_seconds = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would likely get a slot"""
+        with self._lock:
+            backlog = self._waiting + 1
+            return max(1, math.ceil(self._avg_seconds * backlog / self.concurrency))
+
+    async def enter(self) -> Ticket:
+        """Wait for a slot (raises AdmissionRejected if the queue is full or the wait times out)"""
+        with self._lock:
+            # Waiting includes requests whose slot is free but not taken yet
+            if self._active + self._waiting >= self.concurrency + self.max_queue:
+                self.rejected_full += 1
+                full = True
+            else:
+                self._waiting += 1
+                self.max_waiting = max(self.max_waiting, self._waiting)
+                full = False
+        if full:
+            raise AdmissionRejected(self.name, 429, self.retry_after(),
+                                    "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.rejected_timeout += 1
+            raise AdmissionRejected(self.name, 503, self.retry_after(),
+                                    "대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        with self._lock:
+            self._active += 1
+            self.admitted += 1
+            self.waited_seconds += time.perf_counter() - start
+        return Ticket(self)
+
+    def _leave(self, held_seconds: float):
+        with self._lock:
+            self._active -= 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * held_seconds
+        self._slots.release()
+
+    @asynccontextmanager
+    async def admit(self):
+        ticket = await self.enter()
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run blocking `fn` on this lane's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "workers": self.workers,
+                "active": self._active,
+                "waiting": self._waiting,
+                "max_waiting": self.max_waiting,
+                "admitted": self.admitted,
+                "rejected_full": self.rejected_full,
+                "rejected_timeout": self.rejected_timeout,
+                "avg_wait_seconds": round(self.waited_seconds / self.admitted, 4) if self.admitted else 0.0,
+                "avg_service_seconds": round(self._avg_seconds, 3)
+            }
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Analysis prefetch - run every mode analysis of a summary in the background
+After /summarize returns, the beginner and analyst analyses of that summary
+are started on a small thread pool. A later /analyze_mode for the same
+summary takes the finished result, or waits for the one still running,
+instead of making its own LLM call.
+
+Entries are keyed by mode plus a sha256 of the normalized question and
+the summary text (HTML tags and entities removed, whitespace collapsed),
+since both end up in the analysis prompt, and kept in an LRU. Failed
+analyses are dropped so the request falls back to a live call.
+
+Settings:
+    DART_ANALYSIS_PREFETCH_WORKERS   analysis threads (0 disables, default 2)
+    DART_ANALYSIS_PREFETCH_ENTRIES   cached analyses (default 256)
+"""
+
+import os
+import re
+import html
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+try:
+    from .query_cache import normalize_query
+except ImportError:
+    from query_cache import normalize_query
+
+
+DEFAULT_MODES = ("beginner", "analyst")
+DEFAULT_WORKERS = int(os.getenv("DART_ANALYSIS_PREFETCH_WORKERS", "2"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("DART_ANALYSIS_PREFETCH_ENTRIES", "256"))
+
+
+def analysis_key(mode: str, query: str, summary: str) -> str:
+    text = re.sub(r'\s+', ' ', html.unescape(re.sub(r'<[^>]+>', '', summary))).strip()
+    digest = hashlib.sha256(f"{normalize_query(query)}\n{text}".encode('utf-8')).hexdigest()
+    return f"{mode}:{digest}"
+
+
+class AnalysisPrefetcher:
+    """Bounded background pool of mode analyses plus an LRU of their futures"""
+
+    def __init__(self, analyze: Callable[[str, str, str], str], modes: Iterable[str] = DEFAULT_MODES,
+                 max_workers: int = DEFAULT_WORKERS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_pending: Optional[int] = None):
+        self.analyze = analyze
+        self.modes = tuple(modes)
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        # Queued + running analyses; beyond this new summaries are not prefetched
+        self.max_pending = max_pending if max_pending is not None else max(1, max_workers) * 4
+        self._executor = (ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-prefetch")
+                          if max_workers > 0 else None)
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.scheduled = 0
+        self.already_cached = 0
+        self.dropped = 0
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def schedule(self, query: str, summary: str) -> int:
+        """Start every mode not cached yet for this question and summary; number of analyses started"""
+        if not self.enabled or not summary:
+            return 0
+
+        started = []
+        evicted = []
+        with self._lock:
+            for mode in self.modes:
+                key = analysis_key(mode, query, summary)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.already_cached += 1
+                    continue
+                if self._pending >= self.max_pending:
+                    self.dropped += 1
+                    continue
+
+                future = self._executor.submit(self.analyze, query, mode, summary)
+                self._entries[key] = future
+                self._pending += 1
+                self.scheduled += 1
+                started.append((key, future))
+                evicted.extend(self._evict())
+
+        # Outside the lock: a future that is already done runs its callback right here,
+        # and cancelling a queued future runs _finished, which takes the lock
+        for key, future in started:
+            future.add_done_callback(lambda done, key=key: self._finished(key, done))
+        for future in evicted:
+            future.cancel()
+        return len(started)
+
+    def _finished(self, key: str, future: Future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                if not future.cancelled():
+                    self.failed += 1
+                    print(f"[ANALYSIS_PREFETCH] 미리 분석 실패: {key[:20]} - {future.exception()}")
+                if self._entries.get(key) is future:
+                    del self._entries[key]
+
+    def _evict(self) -> List[Future]:
+        """Drop the oldest entries past max_entries (lock held); the caller cancels them after releasing it"""
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            _, future = self._entries.popitem(last=False)
+            evicted.append(future)
+        return evicted
+
+    def lookup(self, mode: str, query: str, summary: str) -> Optional[Future]:
+        """Future of the prefetched analysis (finished or still running), None if there is none"""
+        if not self.enabled:
+            return None
+        key = analysis_key(mode, query, summary)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if future.done():
+                self.hits += 1
+            else:
+                self.joined += 1
+            return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            served = self.hits + self.joined
+            return {
+                "workers": self.max_workers,
+                "entries": len(self._entries),
+                "pending": self._pending,
+                "scheduled": self.scheduled,
+                "already_cached": self.already_cached,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "hits": self.hits,
+                "joined": self.joined,
+                "misses": self.misses,
+                "hit_rate": served / (served + self.misses) if served + self.misses else 0.0
+            }
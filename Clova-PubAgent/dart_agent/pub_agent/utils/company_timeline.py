@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+DART company timeline - every quarter of a company in one file
+Each API section keeps its quarters side by side, so "all quarters for X" is a
+single read and quarter-over-quarter comparisons need no extra file loads
+
+Layout: {base_path}/timelines/{corp_code}.json
+{
+  "version", "corp_code", "corp_name", "stock_code",
+  "quarters": [{"year", "quarter", "filename", "mtime", "metadata"}, ...],   # oldest first
+  "series": {"api_02": {"2025Q1": [...], "2025Q2": [...]}, ...}
+}
+
+A timeline is updated when the set of indexed quarter files of the company (or
+one of their mtimes) changes, either on read or by the update command; only
+new or rewritten quarters are loaded, the others are kept from the stored
+file. Recently read timelines stay in memory, keyed by the same stamps.
+
+Usage:
+    python company_timeline.py update dart_api_data
+    python company_timeline.py show dart_api_data 00126380
+"""
+
+import os
+import re
+import sys
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+try:
+    from .corpus_io import load_document, stat_document
+    from .corpus_index import get_corpus_index
+except ImportError:
+    from corpus_io import load_document, stat_document
+    from corpus_index import get_corpus_index
+
+
+TIMELINE_VERSION = 1
+TIMELINE_DIRNAME = "timelines"
+# Timelines kept in memory (a large company's timeline is a few MB as Python objects)
+DEFAULT_MEMORY_ENTRIES = int(os.getenv("DART_TIMELINE_CACHE_ENTRIES", "32"))
+
+# Identification columns repeated in every row (same set the postprocessor hides)
+_ROW_SKIP_FIELDS = {'rcept_no', 'corp_cls', 'corp_code', 'corp_name', 'stlm_dt'}
+_NUMBER_PATTERN = re.compile(r'^-?[\d,]+(\.\d+)?$')
+
+
+def quarter_key(year: int, quarter: int) -> str:
+    return f"{int(year)}Q{int(quarter)}"
+
+
+class CompanyTimelineStore:
+    """Per-company cross-quarter view of the corpus, built incrementally
+
+    Timelines returned by get() are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, base_path: str, timeline_dir: Optional[str] = None,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.base_path = base_path
+        self.timeline_dir = timeline_dir or os.path.join(base_path, TIMELINE_DIRNAME)
+        self.index = get_corpus_index(base_path)
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[List[List[Any]], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def timeline_path(self, corp_code: str) -> str:
+        return os.path.join(self.timeline_dir, f"{corp_code}.json")
+
+    def _company_entries(self, corp_code: str) -> List[Dict[str, Any]]:
+        """Index entries of one company, oldest quarter first"""
+        entries = []
+        for year, quarter in self.index.quarters():
+            entry = self.index.get_by_corp_code(corp_code, year, quarter)
+            if entry:
+                entries.append(entry)
+        return entries
+
+    def _stamps(self, entries: Iterable[Dict[str, Any]]) -> List[List[Any]]:
+        return [
+            [entry["year"], entry["quarter"], entry["filename"], stat_document(entry["file_path"])[0]]
+            for entry in entries
+        ]
+
+    def _is_current(self, timeline: Optional[Dict[str, Any]], stamps: List[List[Any]]) -> bool:
+        if not timeline or timeline.get("version") != TIMELINE_VERSION:
+            return False
+        known = [[q["year"], q["quarter"], q["filename"], q["mtime"]] for q in timeline["quarters"]]
+        return known == stamps
+
+    def build(self, corp_code: str, entries: List[Dict[str, Any]], stamps: List[List[Any]],
+              previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Merge the quarter files of a company into one timeline
+
+        Quarters whose stamp matches one in `previous` are copied from it
+        instead of loading their file again.
+        """
+        known = {}
+        if previous and previous.get("version") == TIMELINE_VERSION:
+            known = {(q["year"], q["quarter"], q["filename"], q["mtime"]): q for q in previous["quarters"]}
+
+        quarters = []
+        series: Dict[str, Dict[str, Any]] = {}
+
+        for entry, stamp in zip(entries, stamps):
+            key = quarter_key(entry["year"], entry["quarter"])
+            reused = known.get(tuple(stamp))
+            if reused is not None:
+                metadata = reused["metadata"]
+                api_data = {
+                    api_key: by_quarter[key]
+                    for api_key, by_quarter in previous["series"].items() if key in by_quarter
+                }
+            else:
+                data = load_document(entry["file_path"])
+                metadata = data.get("metadata", {})
+                api_data = data.get("api_data", {})
+
+            quarters.append({
+                "year": entry["year"],
+                "quarter": entry["quarter"],
+                "filename": entry["filename"],
+                "mtime": stamp[3],
+                "metadata": metadata
+            })
+            for api_key, rows in api_data.items():
+                series.setdefault(api_key, {})[key] = rows
+
+        latest = entries[-1] if entries else {}
+        return {
+            "version": TIMELINE_VERSION,
+            "corp_code": corp_code,
+            "corp_name": latest.get("corp_name"),
+            "stock_code": latest.get("stock_code"),
+            "quarters": quarters,
+            "series": {api_key: series[api_key] for api_key in sorted(series)}
+        }
+
+    def load(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        """Stored timeline as is (no staleness check)"""
+        try:
+            with open(self.timeline_path(corp_code), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, timeline: Dict[str, Any]):
+        path = self.timeline_path(timeline["corp_code"])
+        os.makedirs(self.timeline_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(timeline, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def get(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        """Timeline of a company, updated first if a quarter was added or rewritten"""
+        entries = self._company_entries(corp_code)
+        if not entries:
+            return None
+
+        stamps = self._stamps(entries)
+        with self._lock:
+            cached = self._memory.get(corp_code)
+            if cached is not None and cached[0] == stamps:
+                self._memory.move_to_end(corp_code)
+                return cached[1]
+
+        timeline = self.load(corp_code)
+        if not self._is_current(timeline, stamps):
+            timeline = self.build(corp_code, entries, stamps, previous=timeline)
+            try:
+                self.store(timeline)
+            except OSError as e:
+                print(f"[TIMELINE] 저장 실패: {corp_code} - {e}")
+
+        with self._lock:
+            self._memory[corp_code] = (stamps, timeline)
+            self._memory.move_to_end(corp_code)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return timeline
+
+    def previous_stamp(self, corp_code: str, year: int, quarter: int) -> Optional[List[Any]]:
+        """[year, quarter, filename, mtime] of the latest quarter file before (year, quarter), without reading the timeline"""
+        earlier = [
+            entry for entry in self._company_entries(corp_code)
+            if (entry["year"], entry["quarter"]) < (int(year), int(quarter))
+        ]
+        return self._stamps(earlier[-1:])[0] if earlier else None
+
+    def update(self, force: bool = False) -> Dict[str, int]:
+        """Rebuild every timeline whose quarter files changed"""
+        by_corp_code: Dict[str, List[Dict[str, Any]]] = {}
+        for year, quarter in self.index.quarters():
+            for entry in self.index.entries(year, quarter):
+                if entry["corp_code"]:
+                    by_corp_code.setdefault(entry["corp_code"], []).append(entry)
+
+        stats = {"rebuilt": 0, "current": 0, "failed": 0}
+        for corp_code, entries in sorted(by_corp_code.items()):
+            try:
+                stamps = self._stamps(entries)
+                previous = None if force else self.load(corp_code)
+                if self._is_current(previous, stamps):
+                    stats["current"] += 1
+                    continue
+                self.store(self.build(corp_code, entries, stamps, previous=previous))
+                stats["rebuilt"] += 1
+            except Exception as e:
+                print(f"⚠️  {corp_code} 타임라인 생성 실패: {e}")
+                stats["failed"] += 1
+
+        print(f"🗂️  타임라인 갱신 완료: {stats}")
+        return stats
+
+
+def quarter_document(timeline: Dict[str, Any], year: int, quarter: int) -> Optional[Dict[str, Any]]:
+    """{"metadata", "api_data"} of one quarter, as the collector wrote it"""
+    key = quarter_key(year, quarter)
+    for info in timeline["quarters"]:
+        if info["year"] == int(year) and info["quarter"] == int(quarter):
+            return {
+                "metadata": info["metadata"],
+                "api_data": {
+                    api_key: by_quarter[key]
+                    for api_key, by_quarter in timeline["series"].items() if key in by_quarter
+                }
+            }
+    return None
+
+
+def previous_quarter(timeline: Dict[str, Any], year: int, quarter: int) -> Optional[Tuple[int, int]]:
+    """Latest available quarter before (year, quarter)"""
+    earlier = [
+        (info["year"], info["quarter"]) for info in timeline["quarters"]
+        if (info["year"], info["quarter"]) < (int(year), int(quarter))
+    ]
+    return earlier[-1] if earlier else None
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if not isinstance(value, str) or not _NUMBER_PATTERN.match(value.strip()):
+        return None
+    return float(value.strip().replace(',', ''))
+
+
+def _split_row(row: Dict[str, Any]) -> Tuple[Tuple[str, ...], Dict[str, float]]:
+    """(label of text columns, numeric columns) of an API row"""
+    label = []
+    numbers = {}
+    for field, value in row.items():
+        if field in _ROW_SKIP_FIELDS or value in (None, "", "-"):
+            continue
+        number = _to_number(value)
+        if number is None:
+            # Cell text may carry line breaks; keep labels on one table line
+            label.append(" ".join(str(value).split()))
+        else:
+            numbers[field] = number
+    return tuple(label), numbers
+
+
+def compare_quarters(timeline: Dict[str, Any], year: int, quarter: int,
+                     api_keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Numeric changes of (year, quarter) against the previous available quarter
+
+    Rows are matched by their text columns (e.g. 구분, 사업부문/성별, 법인명);
+    every numeric column present in both quarters with a different value is reported.
+    """
+    previous = previous_quarter(timeline, year, quarter)
+    result = {"current": (int(year), int(quarter)), "previous": previous, "changes": {}}
+    if previous is None:
+        return result
+
+    current_key = quarter_key(year, quarter)
+    previous_key = quarter_key(*previous)
+    api_keys = list(api_keys) if api_keys is not None else list(timeline["series"].keys())
+
+    for api_key in api_keys:
+        by_quarter = timeline["series"].get(api_key, {})
+        if current_key not in by_quarter or previous_key not in by_quarter:
+            continue
+
+        previous_rows = {}
+        for row in by_quarter[previous_key]:
+            label, numbers = _split_row(row)
+            previous_rows.setdefault(label, numbers)
+
+        changes = []
+        for row in by_quarter[current_key]:
+            label, numbers = _split_row(row)
+            before = previous_rows.get(label)
+            if before is None:
+                continue
+            for field, value in numbers.items():
+                if field in before and before[field] != value:
+                    change_rate = (value - before[field]) / abs(before[field]) * 100 if before[field] else None
+                    changes.append({
+                        "label": " / ".join(label),
+                        "field": field,
+                        "previous": before[field],
+                        "current": value,
+                        "change_rate": change_rate
+                    })
+
+        if changes:
+            result["changes"][api_key] = changes
+
+    return result
+
+
+def _format_number(value: float) -> str:
+    return f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
+
+
+def format_comparison(comparison: Dict[str, Any], max_rows: int = 15) -> str:
+    """Markdown tables of compare_quarters() output (largest relative changes first)"""
+    if comparison["previous"] is None or not comparison["changes"]:
+        return ""
+
+    current = "{}년 {}분기".format(*comparison["current"])
+    previous = "{}년 {}분기".format(*comparison["previous"])
+    lines = [f"## 전분기 대비 변동 ({previous} → {current})"]
+
+    for api_key, changes in comparison["changes"].items():
+        ranked = sorted(
+            changes,
+            key=lambda change: abs(change["change_rate"]) if change["change_rate"] is not None else float('inf'),
+            reverse=True
+        )
+        lines.append(f"\n### {api_key}")
+        lines.append("| 항목 | Field | 전분기 | 당분기 | 증감률 |")
+        lines.append("| --- | --- | --- | --- | --- |")
+        for change in ranked[:max_rows]:
+            rate = f"{change['change_rate']:+.1f}%" if change["change_rate"] is not None else "-"
+            lines.append(
+                f"| {change['label'] or '-'} | {change['field']} | {_format_number(change['previous'])} | "
+                f"{_format_number(change['current'])} | {rate} |"
+            )
+
+    return "\n".join(lines)
+
+
+_shared_stores: Dict[str, CompanyTimelineStore] = {}
+_shared_lock = threading.Lock()
+
+
+def get_timeline_store(base_path: str) -> CompanyTimelineStore:
+    """Process-wide CompanyTimelineStore per base path"""
+    key = os.path.abspath(base_path)
+    with _shared_lock:
+        if key not in _shared_stores:
+            _shared_stores[key] = CompanyTimelineStore(base_path)
+        return _shared_stores[key]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 회사별 분기 타임라인')
+    parser.add_argument('command', choices=['update', 'show'])
+    parser.add_argument('base_path', help='데이터 경로 (예: dart_api_data)')
+    parser.add_argument('corp_code', nargs='?', help='show 대상 고유번호')
+    parser.add_argument('--force', action='store_true', help='update 시 전체 재생성')
+
+    args = parser.parse_args()
+    store = CompanyTimelineStore(args.base_path)
+
+    if args.command == 'update':
+        store.update(force=args.force)
+    else:
+        timeline = store.get(args.corp_code)
+        if timeline is None:
+            print(f"{args.corp_code} 데이터가 없습니다.")
+            return 1
+        print(f"{timeline['corp_name']} ({timeline['stock_code']})")
+        for info in timeline["quarters"]:
+            print(f"  {info['year']} Q{info['quarter']}\t{info['filename']}")
+        latest = timeline["quarters"][-1]
+        print(format_comparison(compare_quarters(timeline, latest["year"], latest["quarter"])))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Summary context builder - fits disclosure sections into a token budget
+Sections are ranked by how much the summary template and the user question
+need them; each table drops columns that are "-" on every row and keeps at
+most max_rows rows (totals and the largest amounts first). Sections are
+added in rank order until the budget is spent, the last one truncated to fit.
+
+Token counts are estimates (ASCII ~4 chars/token, Hangul ~1.5 chars/token),
+close enough to keep prompts within budget without a tokenizer dependency.
+"""
+
+import os
+import re
+import math
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+try:
+    from .postprocess_regular import DartRegularPostprocessor
+except ImportError:
+    from postprocess_regular import DartRegularPostprocessor
+
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("DART_SUMMARY_TOKEN_BUDGET", "6000"))
+DEFAULT_MAX_ROWS = int(os.getenv("DART_SUMMARY_MAX_ROWS", "20"))
+
+# Same names the collectors use
+API_SECTION_NAMES = {
+    "api_01": "증자감자현황",
+    "api_02": "배당에관한사항",
+    "api_03": "자기주식취득및처분현황",
+    "api_04": "최대주주현황",
+    "api_05": "최대주주변동현황",
+    "api_06": "소액주주현황",
+    "api_07": "임원현황",
+    "api_08": "직원현황",
+    "api_09": "이사감사개인별보수현황",
+    "api_10": "이사감사전체보수현황",
+    "api_11": "개인별보수지급금액",
+    "api_12": "타법인출자현황",
+    "api_13": "주식의총수현황",
+    "api_14": "채무증권발행실적",
+    "api_15": "기업어음증권미상환잔액",
+    "api_16": "단기사채미상환잔액",
+    "api_17": "회사채미상환잔액",
+    "api_18": "신종자본증권미상환잔액",
+    "api_19": "조건부자본증권미상환잔액",
+    "api_20": "회계감사인명칭및감사의견",
+    "api_21": "감사용역체결현황",
+    "api_22": "회계감사인비감사용역체결현황",
+    "api_23": "사외이사및변동현황",
+    "api_24": "미등기임원보수현황",
+    "api_25": "이사감사전체보수현황주총승인금액",
+    "api_26": "이사감사전체보수현황보수지급금액유형별",
+    "api_27": "공모자금사용내역",
+    "api_28": "사모자금사용내역",
+}
+
+# Question keywords -> sections they point at
+QUERY_SECTION_KEYWORDS = {
+    "api_01": ("증자", "감자"),
+    "api_02": ("배당",),
+    "api_03": ("자사주", "자기주식"),
+    "api_04": ("최대주주", "대주주", "지분"),
+    "api_05": ("최대주주", "대주주", "지배구조"),
+    "api_06": ("소액주주", "주주"),
+    "api_07": ("임원", "경영진", "대표"),
+    "api_08": ("직원", "인력", "고용", "연봉", "임금"),
+    "api_09": ("보수", "연봉"),
+    "api_10": ("보수",),
+    "api_11": ("보수", "연봉"),
+    "api_12": ("투자", "출자", "자회사", "계열사"),
+    "api_13": ("주식수", "발행주식", "주식 수"),
+    "api_14": ("채권", "사채", "증권발행", "자금조달"),
+    "api_15": ("기업어음", "cp"),
+    "api_16": ("단기사채",),
+    "api_17": ("회사채", "사채", "부채"),
+    "api_18": ("신종자본",),
+    "api_19": ("조건부자본",),
+    "api_20": ("감사의견", "감사인", "회계"),
+    "api_21": ("감사용역", "감사 용역", "감사보수", "감사계약"),
+    "api_22": ("비감사",),
+    "api_23": ("사외이사", "이사회"),
+    "api_24": ("보수",),
+    "api_25": ("보수",),
+    "api_26": ("보수",),
+    "api_27": ("공모", "자금사용"),
+    "api_28": ("사모", "자금사용"),
+}
+
+# Larger amounts first when a table has to be capped
+ROW_SORT_FIELDS = {
+    "api_12": "trmend_blce_acntbk_amount",
+    "api_14": "facvalu_totamt",
+    "api_27": "pay_amount",
+    "api_28": "pay_amount",
+}
+
+_TOTAL_LABELS = {"합계", "계", "총계", "소계", "합 계", "총 계"}
+_EMPTY_VALUES = {"-", "", "None", None}
+_NUMBER_PATTERN = re.compile(r'[^\d.\-]')
+
+TEMPLATE_WEIGHT = 3.0
+QUERY_WEIGHT = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ASCII ~4 chars per token, other characters ~1.5"""
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def _approximate_tokens(text: str) -> int:
+    """estimate_tokens from the UTF-8 length (Hangul is 3 bytes) instead of a per-character loop"""
+    wide = (len(text.encode('utf-8')) - len(text)) // 2
+    return math.ceil((len(text) - wide) / 4 + wide / 1.5)
+
+
+def query_section_keys(query: str) -> List[str]:
+    """Sections the question's keywords point at (QUERY_SECTION_KEYWORDS), sorted"""
+    text = (query or "").lower()
+    return sorted(api_key for api_key, keywords in QUERY_SECTION_KEYWORDS.items()
+                  if any(keyword in text for keyword in keywords))
+
+
+def _as_number(value: Any) -> float:
+    try:
+        return float(_NUMBER_PATTERN.sub('', str(value)) or 0)
+    except ValueError:
+        return 0.0
+
+
+class SummaryContextBuilder:
+    """Budgeted markdown context for the summary prompt"""
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, max_rows: int = DEFAULT_MAX_ROWS,
+                 template_keys: Optional[Iterable[str]] = None, exclude_fields: Optional[Iterable[str]] = None):
+        self.token_budget = token_budget
+        self.max_rows = max_rows
+        # None: every section is part of the template
+        self.template_keys = None if template_keys is None else set(template_keys)
+        self.postprocessor = DartRegularPostprocessor()
+        self.exclude_fields = set(exclude_fields or self.postprocessor.exclude_fields)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the built context can differ (part of the summary cache key)"""
+        return f"b{self.token_budget}-r{self.max_rows}"
+
+    def rank_sections(self, api_data: Dict[str, Any], query: str = "") -> List[Tuple[float, str]]:
+        """(score, api_key) best first; sections without data or relevance are left out"""
+        matched = set(query_section_keys(query))
+        ranked = []
+        for api_key, section in api_data.items():
+            if not section or (isinstance(section, str) and section.rstrip().endswith("No data available")):
+                continue
+            score = 0.0
+            if self.template_keys is None or api_key in self.template_keys:
+                score += TEMPLATE_WEIGHT
+            if api_key in matched:
+                score += QUERY_WEIGHT
+            if score > 0:
+                ranked.append((score, api_key))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+    def section_keys(self, query: str = "") -> Optional[List[str]]:
+        """Sections rank_sections can pick for this query (template + keyword matches), None for all"""
+        if self.template_keys is None:
+            return None
+        return sorted(self.template_keys | set(query_section_keys(query)))
+
+    def _title(self, api_key: str) -> str:
+        name = API_SECTION_NAMES.get(api_key)
+        return f"## {api_key} {name}" if name else f"## {api_key}"
+
+    def _order_rows(self, api_key: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Totals first, then largest amounts (when known), otherwise original order"""
+        totals = [row for row in rows if any(str(value).strip() in _TOTAL_LABELS for value in row.values())]
+        others = [row for row in rows if not any(str(value).strip() in _TOTAL_LABELS for value in row.values())]
+        sort_field = ROW_SORT_FIELDS.get(api_key)
+        if sort_field:
+            others.sort(key=lambda row: _as_number(row.get(sort_field)), reverse=True)
+        return totals + others
+
+    def render_section(self, api_key: str, rows: Any, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """{"text", "rows_dropped", "columns_dropped"} for one section"""
+        max_rows = self.max_rows if max_rows is None else max_rows
+
+        # Already rendered markdown (processed data): only rows can be cut
+        if isinstance(rows, str):
+            lines = rows.splitlines()
+            head, body = lines[:3], lines[3:]
+            dropped = max(0, len(body) - max_rows)
+            text = "\n".join(head + body[:max_rows])
+            if dropped:
+                text += f"\n(외 {dropped}행 생략)"
+            return {"text": text, "rows_dropped": dropped, "columns_dropped": 0}
+
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        columns = []
+        for row in rows:
+            for key in row:
+                if key not in self.exclude_fields and key not in columns:
+                    columns.append(key)
+        kept_columns = [c for c in columns if any(row.get(c) not in _EMPTY_VALUES for row in rows)]
+        columns_dropped = len(columns) - len(kept_columns)
+
+        lines = [self._title(api_key)]
+        if not kept_columns:
+            lines.append("No relevant data")
+            return {"text": "\n".join(lines), "rows_dropped": 0, "columns_dropped": columns_dropped}
+
+        if len(rows) == 1:
+            lines.append("| Field | Value |")
+            lines.append("| --- | --- |")
+            for column in kept_columns:
+                lines.append(f"| {column} | {rows[0].get(column, '-')} |")
+            return {"text": "\n".join(lines), "rows_dropped": 0, "columns_dropped": columns_dropped}
+
+        ordered = self._order_rows(api_key, rows)
+        kept_rows = ordered[:max_rows]
+        lines.append("| " + " | ".join(kept_columns) + " |")
+        lines.append("| " + " | ".join(["---"] * len(kept_columns)) + " |")
+        for row in kept_rows:
+            lines.append("| " + " | ".join(str(row.get(column, '-')) for column in kept_columns) + " |")
+
+        rows_dropped = len(rows) - len(kept_rows)
+        if rows_dropped:
+            lines.append(f"(외 {rows_dropped}행 생략)")
+        return {"text": "\n".join(lines), "rows_dropped": rows_dropped, "columns_dropped": columns_dropped}
+
+    def _fit_section(self, api_key: str, rows: Any, budget: int) -> Optional[Dict[str, Any]]:
+        """Largest rendering of a section within budget (halving the row cap), or None"""
+        max_rows = self.max_rows
+        while True:
+            rendered = self.render_section(api_key, rows, max_rows)
+            rendered["tokens"] = estimate_tokens(rendered["text"])
+            if rendered["tokens"] <= budget:
+                return rendered
+            if max_rows <= 1:
+                return None
+            max_rows //= 2
+
+    def build(self, data: Dict[str, Any], query: str = "", quarter_comparison: str = "") -> Dict[str, Any]:
+        """
+        {"context", "stats"}
+
+        stats: tokens kept / removed against an estimate of the same sections
+        rendered in full, the sections kept / dropped (over budget) / skipped
+        (irrelevant) and the rows and columns cut.
+        """
+        api_data = data.get("api_data", {})
+        header = f"""# 메타데이터: {data.get("metadata", {})}\n\n\n# 데이터"""
+        parts = [header]
+        used = estimate_tokens(header)
+        if quarter_comparison:
+            used += estimate_tokens(quarter_comparison)
+
+        ranked = self.rank_sections(api_data, query)
+        stats = {"sections_kept": [], "sections_dropped": [], "sections_skipped": len(api_data) - len(ranked),
+                 "rows_dropped": 0, "columns_dropped": 0}
+        for _, api_key in ranked:
+            rendered = self._fit_section(api_key, api_data[api_key], self.token_budget - used)
+            if rendered is None:
+                stats["sections_dropped"].append(api_key)
+                continue
+            parts.append(rendered["text"])
+            used += rendered["tokens"]
+            stats["sections_kept"].append(api_key)
+            stats["rows_dropped"] += rendered["rows_dropped"]
+            stats["columns_dropped"] += rendered["columns_dropped"]
+
+        if quarter_comparison:
+            parts.append(f"\n{quarter_comparison}")
+
+        context = "\n\n".join(parts)
+        full_tokens = estimate_tokens(header) + estimate_tokens(quarter_comparison) + \
+            self.full_section_tokens({api_key: api_data[api_key] for _, api_key in ranked})
+        stats["tokens_kept"] = estimate_tokens(context)
+        stats["tokens_removed"] = max(0, full_tokens - stats["tokens_kept"])
+        stats["token_budget"] = self.token_budget
+        return {"context": context, "stats": stats}
+
+    def full_section_tokens(self, api_data: Dict[str, Any]) -> int:
+        """Approximate tokens of sections rendered in full, from their cells (nothing is rendered)"""
+        tokens = 0
+        for rows in api_data.values():
+            if isinstance(rows, dict):
+                rows = [rows]
+            if isinstance(rows, str):
+                text = rows
+            else:
+                text = "\n".join(
+                    " | ".join([str(value) for field, value in row.items() if field not in self.exclude_fields])
+                    for row in rows if isinstance(row, dict)
+                )
+            tokens += _approximate_tokens(text)
+        return tokens
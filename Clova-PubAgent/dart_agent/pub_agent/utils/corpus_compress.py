@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+DART corpus compression - zstd-compressed company files with a trained dictionary
+Compressed files are written as {stock_code}_{name}.json.zst; the dictionary used
+for a frame is looked up by its id under {base_path}/zstd_dicts/{dict_id}.dict
+
+Requires the optional `zstandard` package.
+
+Usage:
+    python corpus_compress.py train dart_api_data
+    python corpus_compress.py compress dart_api_data/2025/Q1 [--remove-source]
+"""
+
+import os
+import sys
+import glob
+import json
+import random
+import threading
+from typing import Dict, Any, Optional
+
+try:
+    import zstandard as zstd
+except ImportError:  # optional dependency
+    zstd = None
+
+
+COMPRESSED_SUFFIX = ".zst"
+DICT_DIRNAME = "zstd_dicts"
+DEFAULT_DICT_SIZE = 112 * 1024
+DEFAULT_LEVEL = 19
+
+_dicts: Dict[int, Any] = {}
+_dicts_lock = threading.Lock()
+
+
+def require_zstd():
+    if zstd is None:
+        raise ImportError("zstandard 패키지가 필요합니다: pip install zstandard")
+
+
+def dict_dir_for(document_path: str) -> str:
+    """{base}/{year}/Q{n}/companies/file.json.zst -> {base}/zstd_dicts"""
+    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(document_path)))))
+    return os.path.join(base_path, DICT_DIRNAME)
+
+
+def load_dictionary(dict_dir: str, dict_id: int):
+    """Dictionary by id (cached per process)"""
+    require_zstd()
+    with _dicts_lock:
+        if dict_id not in _dicts:
+            with open(os.path.join(dict_dir, f"{dict_id}.dict"), 'rb') as f:
+                _dicts[dict_id] = zstd.ZstdCompressionDict(f.read())
+        return _dicts[dict_id]
+
+
+def latest_dictionary(base_path: str):
+    """Most recently trained dictionary under base_path (None if not trained)"""
+    require_zstd()
+    dict_files = glob.glob(os.path.join(base_path, DICT_DIRNAME, "*.dict"))
+    if not dict_files:
+        return None
+    newest = max(dict_files, key=os.path.getmtime)
+    return load_dictionary(os.path.dirname(newest), int(os.path.basename(newest).split('.')[0]))
+
+
+def train_dictionary(base_path: str, sample_count: int = 2000, dict_size: int = DEFAULT_DICT_SIZE) -> str:
+    """Train a dictionary on existing plain JSON files and save it under zstd_dicts/"""
+    require_zstd()
+    files = glob.glob(os.path.join(base_path, "*", "Q*", "companies", "*.json"))
+    random.seed(42)
+    samples = []
+    for file_path in random.sample(files, min(sample_count, len(files))):
+        with open(file_path, 'rb') as f:
+            samples.append(f.read())
+
+    dictionary = zstd.train_dictionary(dict_size, samples)
+    dict_dir = os.path.join(base_path, DICT_DIRNAME)
+    os.makedirs(dict_dir, exist_ok=True)
+    dict_path = os.path.join(dict_dir, f"{dictionary.dict_id()}.dict")
+    with open(dict_path, 'wb') as f:
+        f.write(dictionary.as_bytes())
+
+    print(f"📚 사전 학습 완료: {len(samples)}개 샘플 → {dict_path} ({dict_size // 1024}KB)")
+    return dict_path
+
+
+def compress_bytes(payload: bytes, dictionary=None, level: int = DEFAULT_LEVEL) -> bytes:
+    require_zstd()
+    return zstd.ZstdCompressor(level=level, dict_data=dictionary).compress(payload)
+
+
+def decompress_bytes(payload: bytes, document_path: str) -> bytes:
+    """Decompress a frame, loading the dictionary it was written with"""
+    require_zstd()
+    dict_id = zstd.get_frame_parameters(payload).dict_id
+    dictionary = load_dictionary(dict_dir_for(document_path), dict_id) if dict_id else None
+    return zstd.ZstdDecompressor(dict_data=dictionary).decompress(payload)
+
+
+def read_compressed_head(document_path: str, size: int) -> bytes:
+    """First `size` decompressed bytes without decompressing the whole file"""
+    require_zstd()
+    with open(document_path, 'rb') as f:
+        frame_header = f.read(18)
+        dict_id = zstd.get_frame_parameters(frame_header).dict_id
+        dictionary = load_dictionary(dict_dir_for(document_path), dict_id) if dict_id else None
+        f.seek(0)
+        with zstd.ZstdDecompressor(dict_data=dictionary).stream_reader(f) as reader:
+            return reader.read(size)
+
+
+def write_company_file(file_path: str, company_data: Dict[str, Any], compress: bool = False, dictionary=None) -> str:
+    """
+    Write a company document the way the collectors do (indent=2 JSON);
+    with compress=True the same bytes are zstd-compressed into file_path + ".zst"
+    """
+    if not compress:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(company_data, f, ensure_ascii=False, indent=2)
+        return str(file_path)
+
+    payload = json.dumps(company_data, ensure_ascii=False, indent=2).encode('utf-8')
+    compressed_path = str(file_path) + COMPRESSED_SUFFIX
+    _write_atomic(compressed_path, compress_bytes(payload, dictionary))
+    return compressed_path
+
+
+def _write_atomic(path: str, data: bytes):
+    """Readers see the old file or the complete new one, never a partial write"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def compress_quarter(quarter_dir: str, dictionary=None, remove_source: bool = False) -> Dict[str, int]:
+    """Compress every plain JSON of {quarter_dir}/companies"""
+    companies_dir = os.path.join(quarter_dir, "companies")
+    stats = {"files": 0, "source_bytes": 0, "compressed_bytes": 0}
+
+    for file_path in sorted(glob.glob(os.path.join(companies_dir, "*.json"))):
+        with open(file_path, 'rb') as f:
+            payload = f.read()
+        compressed_path = file_path + COMPRESSED_SUFFIX
+        _write_atomic(compressed_path, compress_bytes(payload, dictionary))
+
+        stats["files"] += 1
+        stats["source_bytes"] += len(payload)
+        stats["compressed_bytes"] += os.path.getsize(compressed_path)
+        if remove_source:
+            os.remove(file_path)
+
+    ratio = stats["source_bytes"] / stats["compressed_bytes"] if stats["compressed_bytes"] else 0
+    print(f"🗜️  {stats['files']}개 압축: {stats['source_bytes'] / 1024 / 1024:.1f}MB → "
+          f"{stats['compressed_bytes'] / 1024 / 1024:.1f}MB (x{ratio:.1f})")
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 데이터 zstd 압축')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='기존 JSON으로 사전 학습')
+    train_parser.add_argument('base_path', help='데이터 경로 (예: dart_api_data)')
+    train_parser.add_argument('--samples', type=int, default=2000)
+    train_parser.add_argument('--dict-size', type=int, default=DEFAULT_DICT_SIZE)
+
+    compress_parser = subparsers.add_parser('compress', help='분기 디렉토리 압축')
+    compress_parser.add_argument('quarter_dirs', nargs='+', help='분기 디렉토리 (예: dart_api_data/2025/Q1)')
+    compress_parser.add_argument('--remove-source', action='store_true', help='압축 후 원본 JSON 삭제')
+
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        train_dictionary(args.base_path, args.samples, args.dict_size)
+    else:
+        for quarter_dir in args.quarter_dirs:
+            base_path = os.path.dirname(os.path.dirname(os.path.abspath(quarter_dir)))
+            compress_quarter(quarter_dir, latest_dictionary(base_path), args.remove_source)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+DART corpus index - in-memory company -> file lookup
+Scan dart_api_data/{year}/Q{n}/companies (or companies.pack / manifest.json) once and serve lookups from memory
+"""
+
+import os
+import re
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from .corpus_pack import get_pack_reader, pack_path_for
+    from .corpus_io import make_pack_member_path, is_document_filename, strip_document_suffix, read_document_head, load_document
+    from .corpus_manifest import load_manifest, manifest_path_for
+    from .fuzzy_name_index import FuzzyNameIndex, DEFAULT_MIN_SCORE
+except ImportError:
+    from corpus_pack import get_pack_reader, pack_path_for
+    from corpus_io import make_pack_member_path, is_document_filename, strip_document_suffix, read_document_head, load_document
+    from corpus_manifest import load_manifest, manifest_path_for
+    from fuzzy_name_index import FuzzyNameIndex, DEFAULT_MIN_SCORE
+
+
+# Metadata is always written first by the collectors, so the file head is enough
+_HEAD_BYTES = 1024
+_HEAD_FIELD_PATTERN = re.compile(r'"(corp_code|corp_name|stock_code)"\s*:\s*"([^"]*)"')
+
+
+class CorpusIndex:
+    """Maps (year, quarter) to corp_name / stock_code / corp_code and file path"""
+
+    def __init__(self, base_path: str, refresh_interval: float = 5.0):
+        self.base_path = base_path
+        # Directory mtimes are re-checked at most once per interval
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._quarters: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._last_check = 0.0
+
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild quarters whose companies directory or pack mtime changed"""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_check < self.refresh_interval:
+                return False
+            self._last_check = now
+
+            found = self._scan_quarter_dirs()
+            changed = False
+
+            for key, (source, path, mtime) in found.items():
+                current = self._quarters.get(key)
+                if current is None or current["source"] != source or current["mtime"] != mtime:
+                    self._quarters[key] = self._build_quarter(key[0], key[1], source, path, mtime)
+                    changed = True
+
+            for key in list(self._quarters.keys()):
+                if key not in found:
+                    del self._quarters[key]
+                    changed = True
+
+            if changed:
+                total = sum(len(q["entries"]) for q in self._quarters.values())
+                print(f"[CORPUS_INDEX] {len(self._quarters)}개 분기, {total}개 파일 인덱싱 완료")
+
+            return changed
+
+    def _scan_quarter_dirs(self) -> Dict[Tuple[int, int], Tuple[str, str, float]]:
+        """
+        Find every {year}/Q{n} under base_path
+
+        A companies.pack is used when it is at least as new as the companies
+        directory. Otherwise a manifest.json at least as new as the directory
+        is used (no file is opened) if it lists exactly the directory's files;
+        failing both the directory is scanned.
+        """
+        found = {}
+
+        if not os.path.isdir(self.base_path):
+            return found
+
+        for year_name in os.listdir(self.base_path):
+            if not year_name.isdigit():
+                continue
+            year_path = os.path.join(self.base_path, year_name)
+            if not os.path.isdir(year_path):
+                continue
+
+            for quarter_name in os.listdir(year_path):
+                if not re.fullmatch(r'Q[1-4]', quarter_name):
+                    continue
+                quarter_dir = os.path.join(year_path, quarter_name)
+                companies_dir = os.path.join(quarter_dir, "companies")
+                pack_path = pack_path_for(quarter_dir)
+
+                dir_mtime = self._mtime(companies_dir)
+                pack_mtime = self._mtime(pack_path)
+                manifest_mtime = self._mtime(manifest_path_for(quarter_dir))
+
+                key = (int(year_name), int(quarter_name[1]))
+                if pack_mtime is not None and (dir_mtime is None or pack_mtime >= dir_mtime):
+                    found[key] = ("pack", pack_path, pack_mtime)
+                elif dir_mtime is not None and manifest_mtime is not None and manifest_mtime >= dir_mtime:
+                    found[key] = ("manifest", companies_dir, manifest_mtime)
+                elif dir_mtime is not None:
+                    found[key] = ("dir", companies_dir, dir_mtime)
+
+        return found
+
+    def _mtime(self, path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _build_quarter(self, year: int, quarter: int, source: str, path: str, mtime: float) -> Dict[str, Any]:
+        """Index one quarter (directory or pack)"""
+        entries = []
+        by_name = {}
+        by_filename = {}
+        by_stock_code = {}
+        by_corp_code = {}
+
+        if source == "pack":
+            records = self._pack_records(path)
+        elif source == "manifest":
+            records = self._manifest_records(path)
+        else:
+            records = self._dir_records(path)
+
+        for filename, file_path, head in records:
+            stock_code, file_company_name = strip_document_suffix(filename).split('_', 1)
+
+            entry = {
+                "year": year,
+                "quarter": quarter,
+                "company_name": file_company_name,
+                "corp_name": head.get("corp_name") or file_company_name,
+                "stock_code": head.get("stock_code") or stock_code,
+                "corp_code": head.get("corp_code"),
+                # Only known when the quarter is indexed from its manifest
+                "successful_apis": head.get("successful_apis"),
+                "filename": filename,
+                "file_path": file_path
+            }
+            entries.append(entry)
+            by_filename[filename] = entry
+
+            # The file name may be truncated, so register both names
+            by_name.setdefault(entry["company_name"], entry)
+            by_name.setdefault(entry["corp_name"], entry)
+            if entry["stock_code"]:
+                by_stock_code.setdefault(entry["stock_code"], entry)
+            if entry["corp_code"]:
+                by_corp_code.setdefault(entry["corp_code"], entry)
+
+        return {
+            "source": source,
+            "mtime": mtime,
+            "path": path,
+            "entries": entries,
+            "by_name": by_name,
+            "by_filename": by_filename,
+            "by_stock_code": by_stock_code,
+            "by_corp_code": by_corp_code
+        }
+
+    def _dir_records(self, companies_dir: str) -> List[Tuple[str, str, Dict[str, str]]]:
+        records = []
+        filenames = set(os.listdir(companies_dir))
+        for filename in sorted(filenames):
+            if not is_document_filename(filename):
+                continue
+            # Compressed copy next to the original JSON - index the plain file only
+            if strip_document_suffix(filename) + '.json' in filenames and not filename.endswith('.json'):
+                continue
+            file_path = os.path.join(companies_dir, filename)
+            records.append((filename, file_path, self._read_metadata_head(file_path)))
+        return records
+
+    def _manifest_records(self, companies_dir: str) -> List[Tuple[str, str, Dict[str, str]]]:
+        manifest = load_manifest(os.path.dirname(companies_dir))
+        if manifest is None:
+            return self._dir_records(companies_dir)
+
+        # A manifest that does not cover the directory (e.g. written for part of the quarter) would hide companies
+        filenames = set(manifest["files"])
+        present = {filename for filename in os.listdir(companies_dir) if is_document_filename(filename)}
+        if present != {filename for filename in filenames if is_document_filename(filename)}:
+            print(f"[CORPUS_INDEX] manifest가 파일 목록과 달라 디렉토리 스캔: {companies_dir}")
+            return self._dir_records(companies_dir)
+
+        records = []
+        for filename in sorted(filenames):
+            record = manifest["files"][filename]
+            if not record.get("valid") or not is_document_filename(filename):
+                continue
+            if strip_document_suffix(filename) + '.json' in filenames and not filename.endswith('.json'):
+                continue
+            records.append((filename, os.path.join(companies_dir, filename), record))
+        return records
+
+    def _pack_records(self, pack_path: str) -> List[Tuple[str, str, Dict[str, str]]]:
+        reader = get_pack_reader(pack_path)
+        return [
+            (entry["filename"], make_pack_member_path(pack_path, entry["filename"]), entry)
+            for entry in reader.entries
+        ]
+
+    def _read_metadata_head(self, file_path: str) -> Dict[str, str]:
+        """Read corp_code / corp_name / stock_code from the first bytes of a file"""
+        try:
+            head = read_document_head(file_path, _HEAD_BYTES).decode('utf-8', errors='ignore')
+        except Exception:
+            return {}
+
+        fields = {}
+        for key, value in _HEAD_FIELD_PATTERN.findall(head):
+            fields.setdefault(key, value)
+
+        if "corp_code" not in fields:
+            # Unusual layout - fall back to a full parse
+            try:
+                metadata = load_document(file_path).get("metadata", {})
+                fields = {k: metadata[k] for k in ("corp_code", "corp_name", "stock_code") if metadata.get(k)}
+            except Exception:
+                return {}
+
+        return fields
+
+    def _get_quarter(self, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return self._quarters.get((int(year), int(quarter)))
+
+    def quarters(self) -> List[Tuple[int, int]]:
+        """Available (year, quarter) pairs, oldest first"""
+        self.refresh()
+        with self._lock:
+            return sorted(self._quarters.keys())
+
+    def has_quarter(self, year: int, quarter: int) -> bool:
+        return self._get_quarter(year, quarter) is not None
+
+    def get_by_filename(self, filename: str, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        quarter_index = self._get_quarter(year, quarter)
+        return quarter_index["by_filename"].get(filename) if quarter_index else None
+
+    def entries(self, year: int, quarter: int) -> List[Dict[str, Any]]:
+        """All indexed files of a quarter"""
+        quarter_index = self._get_quarter(year, quarter)
+        return list(quarter_index["entries"]) if quarter_index else []
+
+    def filenames(self, year: int, quarter: int) -> List[str]:
+        return [entry["filename"] for entry in self.entries(year, quarter)]
+
+    def get_by_corp_code(self, corp_code: str, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        quarter_index = self._get_quarter(year, quarter)
+        return quarter_index["by_corp_code"].get(corp_code) if quarter_index else None
+
+    def get_by_stock_code(self, stock_code: str, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        quarter_index = self._get_quarter(year, quarter)
+        return quarter_index["by_stock_code"].get(stock_code) if quarter_index else None
+
+    def find(self, company_name: str, year: int, quarter: int) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Exact name match first, then the shortest partial match
+        (e.g. 카카오 vs 카카오뱅크 -> 카카오)
+
+        Returns:
+            (entry, match_type) - match_type is "exact", "partial" or "none"
+        """
+        quarter_index = self._get_quarter(year, quarter)
+        if not quarter_index or not company_name:
+            return None, "none"
+
+        exact = quarter_index["by_name"].get(company_name)
+        if exact:
+            return exact, "exact"
+
+        partial_matches = [
+            entry for entry in quarter_index["entries"]
+            if company_name in entry["company_name"] or entry["company_name"] in company_name
+        ]
+        if partial_matches:
+            partial_matches.sort(key=lambda entry: len(entry["company_name"]))
+            return partial_matches[0], "partial"
+
+        return None, "none"
+
+    def fuzzy_find(self, company_name: str, year: int, quarter: int, k: int = 5,
+                   min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Typo-tolerant lookup over the file and corp names of a quarter
+
+        Returns:
+            [(entry, score), ...] best first, one per file
+        """
+        quarter_index = self._get_quarter(year, quarter)
+        if not quarter_index or not company_name:
+            return []
+
+        with self._lock:
+            fuzzy = quarter_index.get("fuzzy")
+            if fuzzy is None:
+                # Built on first use; both names are registered like by_name
+                fuzzy = FuzzyNameIndex(
+                    (name, entry)
+                    for entry in quarter_index["entries"]
+                    for name in {entry["company_name"], entry["corp_name"]}
+                )
+                quarter_index["fuzzy"] = fuzzy
+
+        results = []
+        seen = set()
+        for _, entry, score in fuzzy.search(company_name, k=k * 2, min_score=min_score):
+            if entry["filename"] not in seen:
+                seen.add(entry["filename"])
+                results.append((entry, score))
+        return results[:k]
+
+    def find_company_quarters(self, company_name: str, years: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Best matching file of every available quarter, newest first"""
+        results = []
+
+        for year, quarter in self.quarters():
+            if years is not None and year not in years:
+                continue
+            entry, _ = self.find(company_name, year, quarter)
+            if entry:
+                results.append(entry)
+
+        results.sort(key=lambda entry: (entry["year"], entry["quarter"]), reverse=True)
+        return results
+
+
+_shared_indexes: Dict[str, CorpusIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_corpus_index(base_path: str) -> CorpusIndex:
+    """Process-wide CorpusIndex per base path (built on first use)"""
+    key = os.path.abspath(base_path)
+    with _shared_lock:
+        if key not in _shared_indexes:
+            _shared_indexes[key] = CorpusIndex(key)
+        return _shared_indexes[key]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+DART corpus I/O - read company documents from plain JSON files, zstd-compressed
+JSON files (*.json.zst) or packed quarters
+Packed documents are addressed as "<pack path>::<filename>"
+"""
+
+import os
+import re
+import json
+from typing import Dict, Any, Optional, Tuple, Iterable
+
+try:
+    from .corpus_pack import get_pack_reader, pack_reader
+    from .corpus_compress import COMPRESSED_SUFFIX, decompress_bytes, read_compressed_head
+except ImportError:
+    from corpus_pack import get_pack_reader, pack_reader
+    from corpus_compress import COMPRESSED_SUFFIX, decompress_bytes, read_compressed_head
+
+
+PACK_MEMBER_SEPARATOR = "::"
+DOCUMENT_SUFFIXES = (".json" + COMPRESSED_SUFFIX, ".json")
+
+# Collector files are json.dump(indent=2): top-level keys sit at 2 spaces, api_data keys at 4
+_TOP_KEY_PATTERN = re.compile(r'\n  "(metadata|api_data)": ')
+_SECTION_KEY_PATTERN = re.compile(r'\n    "(api_\d{2})": ')
+_decoder = json.JSONDecoder()
+
+
+def make_pack_member_path(pack_path: str, filename: str) -> str:
+    return f"{pack_path}{PACK_MEMBER_SEPARATOR}{filename}"
+
+
+def split_pack_member_path(document_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(pack path, filename) for packed documents, (None, None) for plain files"""
+    if PACK_MEMBER_SEPARATOR not in document_path:
+        return None, None
+    pack_path, filename = document_path.rsplit(PACK_MEMBER_SEPARATOR, 1)
+    return pack_path, filename
+
+
+def is_document_filename(filename: str) -> bool:
+    """Company documents: {stock_code}_{name}.json or .json.zst"""
+    return '_' in filename and filename.endswith(DOCUMENT_SUFFIXES)
+
+
+def strip_document_suffix(filename: str) -> str:
+    """Company name part of a document filename, whichever encoding it uses"""
+    for suffix in DOCUMENT_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+def read_document_head(document_path: str, size: int) -> bytes:
+    """First `size` bytes of a plain or compressed document"""
+    if document_path.endswith(COMPRESSED_SUFFIX):
+        return read_compressed_head(document_path, size)
+    with open(document_path, 'rb') as f:
+        return f.read(size)
+
+
+def stat_document(document_path: str) -> Tuple[float, int]:
+    """(mtime, size in bytes) of a document"""
+    pack_path, filename = split_pack_member_path(document_path)
+    if pack_path is None:
+        stat = os.stat(document_path)
+        return stat.st_mtime, stat.st_size
+
+    mtime = os.stat(pack_path).st_mtime
+    entry = get_pack_reader(pack_path).get_entry(filename)
+    if entry is None:
+        raise FileNotFoundError(document_path)
+    return mtime, entry["length"]
+
+
+def read_document_bytes(document_path: str) -> bytes:
+    pack_path, filename = split_pack_member_path(document_path)
+    if pack_path is None:
+        with open(document_path, 'rb') as f:
+            payload = f.read()
+        if document_path.endswith(COMPRESSED_SUFFIX):
+            return decompress_bytes(payload, document_path)
+        return payload
+    with pack_reader(pack_path) as reader:
+        return reader.read_bytes(filename)
+
+
+def load_document(document_path: str) -> Dict[str, Any]:
+    """Parsed JSON of a company document"""
+    return json.loads(read_document_bytes(document_path))
+
+
+def load_document_sections(document_path: str, api_keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    {"metadata", "api_data"} with only the requested api_data sections decoded
+
+    Packs use their section index. Plain collector files are scanned for the
+    section keys and only the wanted values are decoded; anything else falls
+    back to a full parse.
+    """
+    api_keys = list(api_keys)
+    pack_path, filename = split_pack_member_path(document_path)
+    if pack_path is not None:
+        with pack_reader(pack_path) as reader:
+            return reader.load_sections(filename, api_keys)
+
+    text = read_document_bytes(document_path).decode('utf-8')
+    sections = _decode_indented_sections(text, api_keys)
+    if sections is not None:
+        return sections
+
+    data = json.loads(text)
+    api_data = data.get("api_data", {})
+    return {
+        "metadata": data.get("metadata", {}),
+        "api_data": {key: api_data[key] for key in api_keys if key in api_data}
+    }
+
+
+def _decode_indented_sections(text: str, api_keys: Iterable[str]) -> Optional[Dict[str, Any]]:
+    top_keys = {match.group(1): match.end() for match in _TOP_KEY_PATTERN.finditer(text)}
+    if "api_data" not in top_keys:
+        return None
+
+    section_starts = {}
+    for match in _SECTION_KEY_PATTERN.finditer(text, top_keys["api_data"]):
+        section_starts.setdefault(match.group(1), match.end())
+
+    try:
+        metadata = _decoder.raw_decode(text, top_keys["metadata"])[0] if "metadata" in top_keys else {}
+        api_data = {
+            key: _decoder.raw_decode(text, section_starts[key])[0]
+            for key in api_keys if key in section_starts
+        }
+    except ValueError:
+        return None
+
+    return {"metadata": metadata, "api_data": api_data}
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+DART corpus manifest - per-quarter record of the collected company files
+{year}/Q{n}/manifest.json lists every company file with its size, mtime,
+sha256, corp_code, successful_apis and collection_date, so gaps and partial
+files can be found without opening the corpus
+
+Collectors record each file they write (under a lock, replaced atomically);
+the validator re-checks only files whose size or mtime changed.
+
+Usage:
+    python corpus_manifest.py validate dart_api_data/2025/Q1 [--full]
+    python corpus_manifest.py report dart_api_data/2025/Q1
+"""
+
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single writer assumed
+    fcntl = None
+
+try:
+    from .corpus_io import read_document_bytes, is_document_filename
+except ImportError:
+    from corpus_io import read_document_bytes, is_document_filename
+
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+TOTAL_APIS = 28
+
+
+def manifest_path_for(quarter_dir: str) -> str:
+    """dart_api_data/{year}/Q{n} -> dart_api_data/{year}/Q{n}/manifest.json"""
+    return os.path.join(quarter_dir, MANIFEST_FILENAME)
+
+
+def load_manifest(quarter_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path_for(quarter_dir), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def _empty_manifest(quarter_dir: str) -> Dict[str, Any]:
+    year_name = os.path.basename(os.path.dirname(os.path.abspath(quarter_dir)))
+    quarter_name = os.path.basename(os.path.abspath(quarter_dir))
+    return {"version": MANIFEST_VERSION, "year_quarter": f"{year_name}_{quarter_name}", "files": {}}
+
+
+def _save_manifest(quarter_dir: str, manifest: Dict[str, Any]):
+    manifest["updated_at"] = datetime.now().isoformat()
+    manifest["files"] = {name: manifest["files"][name] for name in sorted(manifest["files"])}
+    path = manifest_path_for(quarter_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class _ManifestLock:
+    """Exclusive lock shared by collector processes writing the same quarter"""
+
+    def __init__(self, quarter_dir: str):
+        self.lock_path = manifest_path_for(quarter_dir) + ".lock"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.lock_path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+
+
+def describe_file(file_path: str) -> Dict[str, Any]:
+    """Manifest record of one company file (plain or .json.zst)"""
+    stat = os.stat(file_path)
+    record = {
+        "filename": os.path.basename(file_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": None,
+        "corp_code": None,
+        "corp_name": None,
+        "stock_code": None,
+        "successful_apis": None,
+        "collection_date": None,
+        "valid": False
+    }
+
+    try:
+        payload = read_document_bytes(file_path)
+        record["sha256"] = hashlib.sha256(payload).hexdigest()
+        data = json.loads(payload)
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+
+    metadata = data.get("metadata", {})
+    api_data = data.get("api_data", {})
+    record.update({
+        "corp_code": metadata.get("corp_code"),
+        "corp_name": metadata.get("corp_name"),
+        "stock_code": metadata.get("stock_code"),
+        # Older batch files keep failed APIs as null entries
+        "successful_apis": metadata.get("successful_apis", sum(1 for rows in api_data.values() if rows)),
+        "collection_date": metadata.get("collection_date"),
+        "valid": True
+    })
+    return record
+
+
+def record_files(quarter_dir: str, file_paths: Iterable[str]) -> Dict[str, Any]:
+    """Add or refresh the manifest records of freshly written files"""
+    records = [describe_file(str(file_path)) for file_path in file_paths]
+
+    with _ManifestLock(quarter_dir):
+        manifest = load_manifest(quarter_dir)
+        if manifest is None:
+            # First manifest of a quarter that may already hold files (e.g. a resumed collection):
+            # describe those too, or the index would trust a manifest listing only this run's files
+            manifest = _empty_manifest(quarter_dir)
+            written = {record["filename"] for record in records}
+            companies_dir = os.path.join(quarter_dir, "companies")
+            for filename in sorted(os.listdir(companies_dir)) if os.path.isdir(companies_dir) else []:
+                if is_document_filename(filename) and filename not in written:
+                    manifest["files"][filename] = describe_file(os.path.join(companies_dir, filename))
+        for record in records:
+            manifest["files"][record["filename"]] = record
+        _save_manifest(quarter_dir, manifest)
+    return manifest
+
+
+def validate_quarter(quarter_dir: str, full: bool = False, min_apis: int = TOTAL_APIS) -> Dict[str, Any]:
+    """
+    Bring the manifest in line with {quarter_dir}/companies
+
+    Only new files and files whose size or mtime changed are read again;
+    full=True re-hashes every file and reports checksum mismatches.
+    """
+    companies_dir = os.path.join(quarter_dir, "companies")
+    result = {"checked": 0, "unchanged": 0, "added": [], "changed": [], "removed": [],
+              "corrupted": [], "invalid": [], "partial": []}
+
+    with _ManifestLock(quarter_dir):
+        manifest = load_manifest(quarter_dir) or _empty_manifest(quarter_dir)
+        known = manifest["files"]
+        present = set()
+
+        for filename in sorted(os.listdir(companies_dir)):
+            if not is_document_filename(filename):
+                continue
+            present.add(filename)
+            file_path = os.path.join(companies_dir, filename)
+            stat = os.stat(file_path)
+            previous = known.get(filename)
+
+            if previous is not None and not full and \
+                    previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+                result["unchanged"] += 1
+                continue
+
+            record = describe_file(file_path)
+            result["checked"] += 1
+            if previous is None:
+                result["added"].append(filename)
+            elif previous["size"] != record["size"] or previous["mtime"] != record["mtime"]:
+                result["changed"].append(filename)
+            elif previous["sha256"] != record["sha256"]:
+                result["corrupted"].append(filename)
+            known[filename] = record
+
+        for filename in sorted(set(known) - present):
+            del known[filename]
+            result["removed"].append(filename)
+
+        _save_manifest(quarter_dir, manifest)
+
+    for filename, record in manifest["files"].items():
+        if not record["valid"]:
+            result["invalid"].append(filename)
+        elif (record["successful_apis"] or 0) < min_apis:
+            result["partial"].append(filename)
+
+    return result
+
+
+def partial_files(quarter_dir: str, min_apis: int = TOTAL_APIS) -> List[Dict[str, Any]]:
+    """Manifest records with fewer than min_apis successful APIs (fewest first)"""
+    manifest = load_manifest(quarter_dir) or _empty_manifest(quarter_dir)
+    records = [r for r in manifest["files"].values() if r["valid"] and (r["successful_apis"] or 0) < min_apis]
+    return sorted(records, key=lambda r: (r["successful_apis"] or 0, r["filename"]))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 분기별 수집 파일 manifest')
+    parser.add_argument('command', choices=['validate', 'report'])
+    parser.add_argument('quarter_dirs', nargs='+', help='분기 디렉토리 (예: dart_api_data/2025/Q1)')
+    parser.add_argument('--full', action='store_true', help='validate 시 모든 파일 체크섬 재계산')
+    parser.add_argument('--min-apis', type=int, default=TOTAL_APIS, help=f'이 개수 미만이면 일부 누락으로 보고 (기본값: {TOTAL_APIS})')
+
+    args = parser.parse_args()
+
+    for quarter_dir in args.quarter_dirs:
+        if args.command == 'validate':
+            result = validate_quarter(quarter_dir, full=args.full, min_apis=args.min_apis)
+            print(f"🔎 {quarter_dir}: 검사 {result['checked']}개, 변경 없음 {result['unchanged']}개")
+            for key, label in (("added", "추가"), ("changed", "변경"), ("removed", "삭제"),
+                               ("corrupted", "체크섬 불일치"), ("invalid", "손상"), ("partial", "일부 API 누락")):
+                if result[key]:
+                    print(f"   {label}: {len(result[key])}개")
+            for filename in result["corrupted"] + result["invalid"]:
+                print(f"   ⚠️  {filename}")
+        else:
+            records = partial_files(quarter_dir, args.min_apis)
+            print(f"📋 {quarter_dir}: 일부 API 누락 {len(records)}개")
+            for record in records:
+                print(f"{record['corp_code']}\t{record['successful_apis']}/{TOTAL_APIS}\t{record['filename']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+DART corpus pack - one file per quarter with an offset index
+Layout: MAGIC | header length (uint64 LE) | header JSON | compact JSON documents
+Each header entry also records the (offset, length) of metadata and every api_data section
+
+Usage:
+    python corpus_pack.py pack dart_api_data/2025/Q1
+    python corpus_pack.py unpack dart_api_data/2025/Q1
+    python corpus_pack.py list dart_api_data/2025/Q1
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+try:
+    from .corpus_compress import COMPRESSED_SUFFIX, decompress_bytes
+except ImportError:
+    from corpus_compress import COMPRESSED_SUFFIX, decompress_bytes
+
+
+PACK_MAGIC = b"DARTPAK1"
+PACK_VERSION = 2
+PACK_FILENAME = "companies.pack"
+_LENGTH_FORMAT = "<Q"
+_PREFIX_SIZE = len(PACK_MAGIC) + struct.calcsize(_LENGTH_FORMAT)
+
+
+def pack_path_for(quarter_dir: str) -> str:
+    """dart_api_data/{year}/Q{n} -> dart_api_data/{year}/Q{n}/companies.pack"""
+    return os.path.join(quarter_dir, PACK_FILENAME)
+
+
+class PackReader:
+    """Memory-mapped reader of a packed quarter"""
+
+    def __init__(self, pack_path: str):
+        self.pack_path = pack_path
+        # Readers that are mid-read; a retired reader is closed when the last one finishes
+        self._holders = 0
+        self._retired = False
+        self._state_lock = threading.Lock()
+        self._file = open(pack_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(PACK_MAGIC)] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"Not a DART pack file: {pack_path}")
+
+        header_length = struct.unpack_from(_LENGTH_FORMAT, self._map, len(PACK_MAGIC))[0]
+        self.header = json.loads(self._map[_PREFIX_SIZE:_PREFIX_SIZE + header_length].decode('utf-8'))
+        self.data_offset = _PREFIX_SIZE + header_length
+
+        self.entries: List[Dict[str, Any]] = self.header["entries"]
+        self._by_filename = {entry["filename"]: entry for entry in self.entries}
+        self._by_corp_code = {entry["corp_code"]: entry for entry in self.entries if entry.get("corp_code")}
+
+    def get_entry(self, filename: str) -> Optional[Dict[str, Any]]:
+        return self._by_filename.get(filename)
+
+    def get_entry_by_corp_code(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        return self._by_corp_code.get(corp_code)
+
+    def read_bytes(self, filename: str) -> bytes:
+        """Raw JSON bytes of one company document (a slice of the mapping)"""
+        entry = self._by_filename.get(filename)
+        if entry is None:
+            raise KeyError(f"{filename} not found in {self.pack_path}")
+        start = self.data_offset + entry["offset"]
+        return self._map[start:start + entry["length"]]
+
+    def load(self, filename: str) -> Dict[str, Any]:
+        return json.loads(self.read_bytes(filename))
+
+    def load_sections(self, filename: str, api_keys: Iterable[str]) -> Dict[str, Any]:
+        """Decode only metadata and the requested api_data sections"""
+        entry = self._by_filename.get(filename)
+        if entry is None:
+            raise KeyError(f"{filename} not found in {self.pack_path}")
+
+        sections = entry.get("sections")
+        if sections is None:
+            # Version 1 packs have no section index
+            data = self.load(filename)
+            api_data = data.get("api_data", {})
+            return {
+                "metadata": data.get("metadata", {}),
+                "api_data": {key: api_data[key] for key in api_keys if key in api_data}
+            }
+
+        start = self.data_offset + entry["offset"]
+
+        def decode(span):
+            return json.loads(self._map[start + span[0]:start + span[0] + span[1]])
+
+        return {
+            "metadata": decode(entry["metadata"]) if entry.get("metadata") else {},
+            "api_data": {key: decode(sections[key]) for key in api_keys if key in sections}
+        }
+
+    def acquire(self):
+        with self._state_lock:
+            self._holders += 1
+
+    def release(self):
+        with self._state_lock:
+            self._holders -= 1
+            close = self._retired and self._holders == 0
+        if close:
+            self.close()
+
+    def retire(self):
+        """The pack file was replaced: close now, or after the last holder releases"""
+        with self._state_lock:
+            self._retired = True
+            close = self._holders == 0
+        if close:
+            self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_document(data: Dict[str, Any]) -> Tuple[bytes, Dict[str, List[int]]]:
+    """
+    Compact JSON of a document plus [offset, length] spans of metadata and each
+    api_data section (same bytes as json.dumps with compact separators)
+    """
+    parts = []
+    spans = {}
+    size = 0
+
+    def write(chunk: bytes, span_key: Optional[str] = None):
+        nonlocal size
+        if span_key is not None:
+            spans[span_key] = [size, len(chunk)]
+        parts.append(chunk)
+        size += len(chunk)
+
+    write(b"{")
+    for i, (key, value) in enumerate(data.items()):
+        if i:
+            write(b",")
+        write(_dumps(key) + b":")
+        if key == "api_data" and isinstance(value, dict):
+            write(b"{")
+            for j, (api_key, items) in enumerate(value.items()):
+                if j:
+                    write(b",")
+                write(_dumps(api_key) + b":")
+                write(_dumps(items), api_key)
+            write(b"}")
+        elif key == "metadata":
+            write(_dumps(value), "metadata")
+        else:
+            write(_dumps(value))
+    write(b"}")
+
+    return b"".join(parts), spans
+
+
+def pack_quarter(quarter_dir: str, output_path: Optional[str] = None) -> str:
+    """
+    Pack every company JSON of {quarter_dir}/companies into one file
+    (*.json.zst files are decompressed and packed under their .json name)
+    """
+    companies_dir = os.path.join(quarter_dir, "companies")
+    output_path = output_path or pack_path_for(quarter_dir)
+
+    entries = []
+    chunks = []
+    offset = 0
+
+    source_names = set(os.listdir(companies_dir))
+    for source_name in sorted(source_names):
+        filename = source_name[:-len(COMPRESSED_SUFFIX)] if source_name.endswith(COMPRESSED_SUFFIX) else source_name
+        if not filename.endswith('.json') or '_' not in filename:
+            continue
+        if source_name != filename and filename in source_names:
+            continue
+
+        source_path = os.path.join(companies_dir, source_name)
+        with open(source_path, 'rb') as f:
+            payload = f.read()
+        if source_name != filename:
+            payload = decompress_bytes(payload, source_path)
+        data = json.loads(payload)
+
+        payload, spans = _encode_document(data)
+        metadata = data.get("metadata", {})
+        entries.append({
+            "filename": filename,
+            "corp_code": metadata.get("corp_code"),
+            "corp_name": metadata.get("corp_name"),
+            "stock_code": metadata.get("stock_code"),
+            "offset": offset,
+            "length": len(payload),
+            "metadata": spans.pop("metadata", None),
+            "sections": spans
+        })
+        chunks.append(payload)
+        offset += len(payload)
+
+    year_name = os.path.basename(os.path.dirname(os.path.abspath(quarter_dir)))
+    quarter_name = os.path.basename(os.path.abspath(quarter_dir))
+    header = json.dumps({
+        "version": PACK_VERSION,
+        "year_quarter": f"{year_name}_{quarter_name}",
+        "entries": entries
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # Write next to the target and rename so readers never see a partial pack
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack(_LENGTH_FORMAT, len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, output_path)
+
+    print(f"📦 {len(entries)}개 회사 → {output_path} ({os.path.getsize(output_path) / 1024 / 1024:.1f}MB)")
+    return output_path
+
+
+def unpack_quarter(quarter_dir: str, pack_path: Optional[str] = None, overwrite: bool = False) -> int:
+    """Restore {quarter_dir}/companies/*.json from a pack (collector format)"""
+    pack_path = pack_path or pack_path_for(quarter_dir)
+    companies_dir = os.path.join(quarter_dir, "companies")
+    os.makedirs(companies_dir, exist_ok=True)
+
+    reader = PackReader(pack_path)
+    written = 0
+    try:
+        for entry in reader.entries:
+            file_path = os.path.join(companies_dir, entry["filename"])
+            if os.path.exists(file_path) and not overwrite:
+                continue
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(reader.load(entry["filename"]), f, ensure_ascii=False, indent=2)
+            written += 1
+    finally:
+        reader.close()
+
+    print(f"📂 {written}개 파일 복원 → {companies_dir}")
+    return written
+
+
+_readers: Dict[str, Any] = {}
+_readers_lock = threading.Lock()
+
+
+def _current_reader(pack_path: str) -> PackReader:
+    """Shared reader of the pack as it is now (call with _readers_lock held)"""
+    mtime = os.stat(pack_path).st_mtime
+    cached = _readers.get(pack_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    reader = PackReader(pack_path)
+    _readers[pack_path] = (mtime, reader)
+    if cached is not None:
+        # A replaced pack is a new inode; the old mapping is closed once its holders are done
+        cached[1].retire()
+    return reader
+
+
+def get_pack_reader(pack_path: str) -> PackReader:
+    """
+    Shared reader per pack, reopened when the pack file is replaced
+    For the index (entries / get_entry) only; read document bytes through pack_reader()
+    """
+    with _readers_lock:
+        return _current_reader(pack_path)
+
+
+@contextmanager
+def pack_reader(pack_path: str):
+    """Shared reader held open for the block, even if the pack is replaced meanwhile"""
+    with _readers_lock:
+        reader = _current_reader(pack_path)
+        reader.acquire()
+    try:
+        yield reader
+    finally:
+        reader.release()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 분기 데이터 pack/unpack')
+    parser.add_argument('command', choices=['pack', 'unpack', 'list'])
+    parser.add_argument('quarter_dirs', nargs='+', help='분기 디렉토리 (예: dart_api_data/2025/Q1)')
+    parser.add_argument('--overwrite', action='store_true', help='unpack 시 기존 파일 덮어쓰기')
+
+    args = parser.parse_args()
+
+    for quarter_dir in args.quarter_dirs:
+        if args.command == 'pack':
+            pack_quarter(quarter_dir)
+        elif args.command == 'unpack':
+            unpack_quarter(quarter_dir, overwrite=args.overwrite)
+        else:
+            reader = PackReader(pack_path_for(quarter_dir))
+            for entry in reader.entries:
+                print(f"{entry['corp_code']}\t{entry['filename']}\t{entry['length']}")
+            reader.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+DART corpus store - normalized SQLite store of the 28 periodic-report APIs
+One table per API (api_01 .. api_28) plus a reports table indexed by corp_code, year, quarter
+
+Usage:
+    python corpus_store.py ingest dart_api_data --db dart_corpus.sqlite
+    python corpus_store.py load --db dart_corpus.sqlite --corp-code 00126380 --year 2025 --quarter 1
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Iterable
+
+try:
+    from .corpus_io import load_document, stat_document
+    from .corpus_index import CorpusIndex
+except ImportError:
+    from corpus_io import load_document, stat_document
+    from corpus_index import CorpusIndex
+
+
+# Fields repeated on every row; stored once per section and only overridden per row when different
+COMMON_FIELDS = ('rcept_no', 'corp_cls', 'corp_code', 'corp_name', 'stlm_dt')
+API_TABLE_PATTERN = re.compile(r'api_\d{2}')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_id INTEGER PRIMARY KEY,
+    corp_code TEXT,
+    corp_name TEXT,
+    stock_code TEXT,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    collection_date TEXT,
+    successful_apis INTEGER,
+    source_mtime REAL,
+    metadata TEXT NOT NULL,
+    UNIQUE (year, quarter, filename)
+);
+CREATE INDEX IF NOT EXISTS idx_reports_corp ON reports (corp_code, year, quarter);
+CREATE INDEX IF NOT EXISTS idx_reports_period ON reports (year, quarter);
+
+CREATE TABLE IF NOT EXISTS sections (
+    report_id INTEGER NOT NULL,
+    api_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    common TEXT,
+    key_order TEXT,
+    payload TEXT,
+    PRIMARY KEY (report_id, api_key)
+) WITHOUT ROWID;
+"""
+
+
+class CorpusStore:
+    """SQLite-backed corpus with a loader that rebuilds the original company dict"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._columns: Dict[str, List[str]] = {}
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        self._load_columns()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _load_columns(self):
+        conn = self._conn()
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        for row in tables:
+            if API_TABLE_PATTERN.fullmatch(row["name"]):
+                info = conn.execute(f'PRAGMA table_info("{row["name"]}")').fetchall()
+                self._columns[row["name"]] = [c["name"] for c in info if not c["name"].startswith('_') and c["name"] not in ("report_id", "row_no")]
+
+    def _ensure_api_table(self, api_key: str, fields: Iterable[str]):
+        conn = self._conn()
+        if api_key not in self._columns:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{api_key}" ('
+                'report_id INTEGER NOT NULL, row_no INTEGER NOT NULL, '
+                '_common TEXT, _key_order TEXT, PRIMARY KEY (report_id, row_no)) WITHOUT ROWID'
+            )
+            self._columns[api_key] = []
+
+        for field in fields:
+            if field not in self._columns[api_key]:
+                conn.execute(f'ALTER TABLE "{api_key}" ADD COLUMN "{field}" TEXT')
+                self._columns[api_key].append(field)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest_document(self, data: Dict[str, Any], year: int, quarter: int, filename: str, source_mtime: Optional[float] = None) -> int:
+        """Insert or replace one company document; returns its report_id"""
+        conn = self._conn()
+        metadata = data.get("metadata", {})
+
+        existing = conn.execute(
+            "SELECT report_id FROM reports WHERE year = ? AND quarter = ? AND filename = ?",
+            (year, quarter, filename)
+        ).fetchone()
+        if existing:
+            self._delete_report(existing["report_id"])
+
+        cursor = conn.execute(
+            "INSERT INTO reports (corp_code, corp_name, stock_code, year, quarter, filename, "
+            "collection_date, successful_apis, source_mtime, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                metadata.get("corp_code"), metadata.get("corp_name"), metadata.get("stock_code"),
+                year, quarter, filename, metadata.get("collection_date"), metadata.get("successful_apis"),
+                source_mtime, json.dumps(metadata, ensure_ascii=False)
+            )
+        )
+        report_id = cursor.lastrowid
+
+        for position, (api_key, items) in enumerate(data.get("api_data", {}).items()):
+            if not API_TABLE_PATTERN.fullmatch(api_key) or not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                # Sections outside the api_XX list format are kept verbatim
+                conn.execute(
+                    "INSERT INTO sections (report_id, api_key, position, row_count, payload) VALUES (?, ?, ?, ?, ?)",
+                    (report_id, api_key, position, 0, json.dumps(items, ensure_ascii=False))
+                )
+                continue
+            self._ingest_section(report_id, api_key, position, items)
+
+        return report_id
+
+    def _ingest_section(self, report_id: int, api_key: str, position: int, items: List[Dict[str, Any]]):
+        conn = self._conn()
+        first = items[0] if items else {}
+        common = {field: first[field] for field in COMMON_FIELDS if field in first}
+        key_order = list(first.keys())
+
+        fields = []
+        for item in items:
+            for key in item:
+                if key not in COMMON_FIELDS and key not in fields:
+                    fields.append(key)
+        self._ensure_api_table(api_key, fields)
+
+        conn.execute(
+            "INSERT INTO sections (report_id, api_key, position, row_count, common, key_order) VALUES (?, ?, ?, ?, ?, ?)",
+            (report_id, api_key, position, len(items), json.dumps(common, ensure_ascii=False), json.dumps(key_order))
+        )
+
+        for row_no, item in enumerate(items):
+            row_common = {field: item[field] for field in COMMON_FIELDS if field in item}
+            row_keys = list(item.keys())
+            values = [item.get(field) for field in fields]
+            conn.execute(
+                f'INSERT INTO "{api_key}" (report_id, row_no, _common, _key_order'
+                + ''.join(f', "{field}"' for field in fields)
+                + ') VALUES (?, ?, ?, ?' + ', ?' * len(fields) + ')',
+                [
+                    report_id, row_no,
+                    json.dumps(row_common, ensure_ascii=False) if row_common != common else None,
+                    json.dumps(row_keys) if row_keys != key_order else None,
+                    *values
+                ]
+            )
+
+    def _delete_report(self, report_id: int):
+        conn = self._conn()
+        for api_key in self._columns:
+            conn.execute(f'DELETE FROM "{api_key}" WHERE report_id = ?', (report_id,))
+        conn.execute("DELETE FROM sections WHERE report_id = ?", (report_id,))
+        conn.execute("DELETE FROM reports WHERE report_id = ?", (report_id,))
+
+    def ingest_corpus(self, base_path: str) -> Dict[str, int]:
+        """Ingest every quarter under base_path, skipping documents whose mtime is unchanged"""
+        index = CorpusIndex(base_path)
+        conn = self._conn()
+        stats = {"ingested": 0, "skipped": 0, "failed": 0}
+
+        for year, quarter in index.quarters():
+            quarter_stats = {"ingested": 0, "skipped": 0}
+            known = {
+                row["filename"]: row["source_mtime"]
+                for row in conn.execute("SELECT filename, source_mtime FROM reports WHERE year = ? AND quarter = ?", (year, quarter))
+            }
+            for entry in index.entries(year, quarter):
+                try:
+                    mtime, _ = stat_document(entry["file_path"])
+                    if known.get(entry["filename"]) == mtime:
+                        quarter_stats["skipped"] += 1
+                        continue
+                    self.ingest_document(load_document(entry["file_path"]), year, quarter, entry["filename"], mtime)
+                    quarter_stats["ingested"] += 1
+                except Exception as e:
+                    print(f"⚠️  {entry['filename']} 적재 실패: {e}")
+                    stats["failed"] += 1
+            conn.commit()
+            stats["ingested"] += quarter_stats["ingested"]
+            stats["skipped"] += quarter_stats["skipped"]
+            print(f"🗄️  {year} Q{quarter}: 적재 {quarter_stats['ingested']}건, 건너뜀 {quarter_stats['skipped']}건")
+
+        return stats
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    def find_report(self, corp_code: str, year: int, quarter: int) -> Optional[sqlite3.Row]:
+        return self._conn().execute(
+            "SELECT * FROM reports WHERE corp_code = ? AND year = ? AND quarter = ?",
+            (corp_code, year, quarter)
+        ).fetchone()
+
+    def load(self, corp_code: str, year: int, quarter: int, api_keys: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Rebuild {"metadata", "api_data"} exactly as the collector wrote it"""
+        report = self.find_report(corp_code, year, quarter)
+        if report is None:
+            return None
+        return self.load_report(report["report_id"], api_keys)
+
+    def load_report(self, report_id: int, api_keys: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        report = conn.execute("SELECT metadata FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        if report is None:
+            return None
+
+        wanted = set(api_keys) if api_keys is not None else None
+        api_data = {}
+
+        sections = conn.execute(
+            "SELECT * FROM sections WHERE report_id = ? ORDER BY position", (report_id,)
+        ).fetchall()
+
+        for section in sections:
+            api_key = section["api_key"]
+            if wanted is not None and api_key not in wanted:
+                continue
+            if section["payload"] is not None:
+                api_data[api_key] = json.loads(section["payload"])
+                continue
+            api_data[api_key] = self._load_section_rows(report_id, section)
+
+        return {
+            "metadata": json.loads(report["metadata"]),
+            "api_data": api_data
+        }
+
+    def _load_section_rows(self, report_id: int, section: sqlite3.Row) -> List[Dict[str, Any]]:
+        common = json.loads(section["common"])
+        key_order = json.loads(section["key_order"])
+
+        rows = self._conn().execute(
+            f'SELECT * FROM "{section["api_key"]}" WHERE report_id = ? ORDER BY row_no', (report_id,)
+        ).fetchall()
+
+        items = []
+        for row in rows:
+            row_common = json.loads(row["_common"]) if row["_common"] is not None else common
+            row_keys = json.loads(row["_key_order"]) if row["_key_order"] is not None else key_order
+            items.append({
+                key: row_common[key] if key in COMMON_FIELDS else row[key]
+                for key in row_keys
+            })
+        return items
+
+    def query_api(self, api_key: str, year: int, quarter: int, corp_codes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Cross-company rows of one API for a quarter (without the repeated common fields)"""
+        if api_key not in self._columns:
+            return []
+
+        sql = (
+            f'SELECT r.corp_code, r.corp_name, r.stock_code, a.* FROM "{api_key}" a '
+            'JOIN reports r ON r.report_id = a.report_id WHERE r.year = ? AND r.quarter = ?'
+        )
+        params: List[Any] = [year, quarter]
+        if corp_codes is not None:
+            corp_codes = list(corp_codes)
+            sql += f" AND r.corp_code IN ({', '.join('?' * len(corp_codes))})"
+            params.extend(corp_codes)
+        sql += " ORDER BY r.corp_code, a.row_no"
+
+        results = []
+        for row in self._conn().execute(sql, params):
+            item = {"corp_code": row["corp_code"], "corp_name": row["corp_name"], "stock_code": row["stock_code"]}
+            for field in self._columns[api_key]:
+                if row[field] is not None:
+                    item[field] = row[field]
+            results.append(item)
+        return results
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 정기보고서 SQLite 저장소')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='dart_api_data 전체 적재')
+    ingest_parser.add_argument('base_path', help='데이터 경로 (예: dart_api_data)')
+    ingest_parser.add_argument('--db', default='dart_corpus.sqlite', help='SQLite 파일 경로')
+
+    load_parser = subparsers.add_parser('load', help='회사 문서 복원 출력')
+    load_parser.add_argument('--db', default='dart_corpus.sqlite', help='SQLite 파일 경로')
+    load_parser.add_argument('--corp-code', required=True)
+    load_parser.add_argument('--year', type=int, required=True)
+    load_parser.add_argument('--quarter', type=int, required=True)
+
+    args = parser.parse_args()
+    store = CorpusStore(args.db)
+
+    if args.command == 'ingest':
+        stats = store.ingest_corpus(args.base_path)
+        store._conn().execute("VACUUM")
+        print(f"✅ 적재 완료: {stats} → {args.db} ({os.path.getsize(args.db) / 1024 / 1024:.1f}MB)")
+    else:
+        data = store.load(args.corp_code, args.year, args.quarter)
+        if data is None:
+            print("❌ 해당 문서를 찾을 수 없습니다.")
+            return 1
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+DART disclosure cache - process-wide LRU of loaded and post-processed files
+Keyed by (path, mtime) and bounded by an approximate byte budget. Source
+hashes are remembered separately so hashing a file never parses it.
+"""
+
+import os
+import sys
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Iterable
+
+try:
+    from .postprocess_regular import DartRegularPostprocessor
+    from .corpus_io import stat_document, read_document_bytes, load_document_sections
+    from .processed_cache import ProcessedDiskCache, source_hash
+except ImportError:
+    from postprocess_regular import DartRegularPostprocessor
+    from corpus_io import stat_document, read_document_bytes, load_document_sections
+    from processed_cache import ProcessedDiskCache, source_hash
+
+
+# Parsed JSON takes roughly 2.5x its file size as Python objects
+RAW_SIZE_FACTOR = 2.5
+DEFAULT_MAX_BYTES = int(float(os.getenv("DART_DISCLOSURE_CACHE_MB", "256")) * 1024 * 1024)
+# (path, mtime) -> source sha256 of files hashed without being loaded
+SOURCE_HASH_ENTRIES = 4096
+
+
+class DisclosureCache:
+    """LRU cache of raw disclosure dicts and their processed markdown dicts
+
+    Cached dicts are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, postprocessor: Optional[DartRegularPostprocessor] = None,
+                 disk_cache: Optional[ProcessedDiskCache] = None):
+        self.max_bytes = max_bytes
+        self.postprocessor = postprocessor or DartRegularPostprocessor()
+        # Rendered sections survive restarts on disk (keyed by source sha256 + postprocessor version)
+        self.disk_cache = disk_cache or ProcessedDiskCache(self.postprocessor)
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._source_hashes: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.processed_hits = 0
+        self.processed_misses = 0
+        self.evictions = 0
+        self.partial_loads = 0
+        self.disk_hits = 0
+
+    def get(self, file_path: str) -> Dict[str, Any]:
+        """Return {"raw_data", "processed_data"} for a file"""
+        entry = self._get_entry(file_path)
+        return {
+            "raw_data": entry["raw_data"],
+            "processed_data": self._get_processed(entry)
+        }
+
+    def load_raw(self, file_path: str) -> Dict[str, Any]:
+        """Parsed JSON of a disclosure file"""
+        return self._get_entry(file_path)["raw_data"]
+
+    def load_processed(self, file_path: str) -> Dict[str, Any]:
+        """DartRegularPostprocessor output of a disclosure file (rendered once)"""
+        return self._get_processed(self._get_entry(file_path))
+
+    def load_raw_sections(self, file_path: str, api_keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Parsed JSON restricted to metadata and the given api_data sections
+
+        Served from the cached document when present; otherwise only those
+        sections are decoded (and the partial result is not cached).
+        """
+        api_keys = list(api_keys)
+        entry = self._cached_entry(file_path)
+        if entry is not None:
+            return _select_sections(entry["raw_data"], api_keys)
+
+        with self._lock:
+            self.partial_loads += 1
+        return load_document_sections(file_path, api_keys)
+
+    def load_processed_sections(self, file_path: str, api_keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Processed output restricted to the given api_data sections
+
+        Served from the cached document when present; otherwise only those
+        sections are decoded and rendered (and the partial result is not cached).
+        """
+        api_keys = list(api_keys)
+        entry = self._cached_entry(file_path)
+        if entry is not None:
+            return _select_sections(self._get_processed(self._get_entry(file_path)), api_keys)
+
+        with self._lock:
+            self.partial_loads += 1
+        return self.postprocessor.process_regular_data(load_document_sections(file_path, api_keys))
+
+    def _cached_entry(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """The cached, up-to-date entry of a file without loading it (None if not cached)"""
+        with self._lock:
+            entry = self._entries.get(file_path)
+        if entry is not None and entry["mtime"] == stat_document(file_path)[0]:
+            return entry
+        return None
+
+    def source_sha256(self, file_path: str) -> str:
+        """sha256 of the decoded source file (same hash the disk caches use), without parsing it"""
+        entry = self._cached_entry(file_path)
+        if entry is not None:
+            return entry["sha256"]
+
+        mtime = stat_document(file_path)[0]
+        with self._lock:
+            cached = self._source_hashes.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                self._source_hashes.move_to_end(file_path)
+                return cached[1]
+
+        sha256 = source_hash(read_document_bytes(file_path))
+        with self._lock:
+            self._source_hashes[file_path] = (mtime, sha256)
+            self._source_hashes.move_to_end(file_path)
+            while len(self._source_hashes) > SOURCE_HASH_ENTRIES:
+                self._source_hashes.popitem(last=False)
+        return sha256
+
+    def _get_processed(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if entry["processed_data"] is not None:
+                self.processed_hits += 1
+                return entry["processed_data"]
+            self.processed_misses += 1
+
+        processed_data = self.disk_cache.load(entry["path"], entry["sha256"])
+        if processed_data is None:
+            processed_data = self.postprocessor.process_regular_data(entry["raw_data"])
+            self.disk_cache.store(entry["path"], entry["sha256"], processed_data)
+        else:
+            with self._lock:
+                self.disk_hits += 1
+
+        with self._lock:
+            if entry["processed_data"] is None:
+                entry["processed_data"] = processed_data
+                added = self._processed_size(processed_data)
+                entry["size"] += added
+                # The entry may already have been evicted by another thread
+                if self._entries.get(entry["path"]) is entry:
+                    self._bytes += added
+                    self._evict()
+            return entry["processed_data"]
+
+    def _get_entry(self, file_path: str) -> Dict[str, Any]:
+        mtime = stat_document(file_path)[0]
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry["mtime"] == mtime:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        payload = read_document_bytes(file_path)
+        raw_data = json.loads(payload)
+
+        entry = {
+            "path": file_path,
+            "mtime": mtime,
+            "sha256": source_hash(payload),
+            "raw_data": raw_data,
+            "processed_data": None,
+            # Decoded size, so compressed files are not under-counted
+            "size": int(len(payload) * RAW_SIZE_FACTOR)
+        }
+
+        with self._lock:
+            previous = self._entries.pop(file_path, None)
+            if previous is not None:
+                self._bytes -= previous["size"]
+            self._entries[file_path] = entry
+            self._bytes += entry["size"]
+            self._evict()
+
+        return entry
+
+    def _processed_size(self, processed_data: Dict[str, Any]) -> int:
+        api_data = processed_data.get("api_data", {})
+        return sum(sys.getsizeof(section) for section in api_data.values())
+
+    def _evict(self):
+        """Drop least recently used entries until under budget (keep the newest one)"""
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["size"]
+            self.evictions += 1
+
+    def invalidate(self, file_path: str):
+        with self._lock:
+            self._source_hashes.pop(file_path, None)
+            entry = self._entries.pop(file_path, None)
+            if entry is not None:
+                self._bytes -= entry["size"]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._source_hashes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "processed_hits": self.processed_hits,
+                "processed_misses": self.processed_misses,
+                "evictions": self.evictions,
+                "partial_loads": self.partial_loads,
+                "disk_hits": self.disk_hits
+            }
+
+
+def _select_sections(data: Dict[str, Any], api_keys: List[str]) -> Dict[str, Any]:
+    api_data = data.get("api_data", {})
+    return {
+        "metadata": data.get("metadata", {}),
+        "api_data": {key: api_data[key] for key in api_keys if key in api_data}
+    }
+
+
+_shared_cache: Optional[DisclosureCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_disclosure_cache() -> DisclosureCache:
+    """Process-wide DisclosureCache (DART_DISCLOSURE_CACHE_MB sets the budget)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DisclosureCache()
+        return _shared_cache
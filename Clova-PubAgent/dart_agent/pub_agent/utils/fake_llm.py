@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Fake LLM provider - local stand-in for Clova / Gemini
+Set DART_LLM_PROVIDER=fake and every get_chat_model() call (search engine,
+agent nodes, LangGraph graphs) gets a FakeChatModel instead of a provider
+client, so the whole stack runs without API keys or network. Calls still go
+through the gateway's ModelPool (limits, retries, metrics); raise
+DART_LLM_RPM_{MODEL} / DART_LLM_CONCURRENCY_{MODEL} for load tests.
+
+Replies:
+    - query parsing prompts (asking for company_name / year / quarter JSON)
+      get JSON built from the "사용자 질문:" line: first word as the company,
+      "2024년" / "3분기" if present, otherwise 2025 Q2
+    - everything else gets a markdown lorem summary under the prompt's last
+      "## ...요약" heading (the report template's)
+
+Settings (MODEL as in llm_gateway, e.g. GEMINI_2_5_PRO):
+    DART_FAKE_LLM_LATENCY[_{MODEL}]   seconds per call: "0.8", "uniform:0.5:2",
+                                      "normal:1.5:0.3" or "lognormal:1.2:0.4"
+                                      (median, sigma); default 0
+    DART_FAKE_LLM_ERROR_RATE          share of calls failing with a retryable 503
+    DART_FAKE_LLM_SUMMARY_CHARS       summary length (default 1200)
+    DART_FAKE_LLM_PARSE_REPLY         fixed JSON for every parsing prompt
+    DART_FAKE_LLM_SEED                seed for latencies and errors
+"""
+
+import os
+import re
+import json
+import math
+import time
+import random
+import asyncio
+from typing import Callable, Iterator, AsyncIterator, List, Optional
+
+from pydantic import PrivateAttr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+try:
+    from .rate_limiter import env_suffix
+except ImportError:
+    from rate_limiter import env_suffix
+
+
+DEFAULT_YEAR = 2025
+DEFAULT_QUARTER = 2
+# Streaming: share of the call latency spent before the first chunk
+FIRST_CHUNK_SHARE = 0.3
+STREAM_CHUNK_CHARS = 24
+
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut "
+         "labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco "
+         "laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor in reprehenderit in "
+         "voluptate velit esse cillum dolore eu fugiat nulla pariatur. ")
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure (retryable, like a 503 from the real APIs)"""
+
+    status_code = 503
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency spec ("0.8", "uniform:a:b", "normal:mean:std", "lognormal:median:sigma") -> sampler"""
+    kind, *params = str(spec).strip().split(":")
+    try:
+        if not params:
+            seconds = float(kind)
+            return lambda rng: seconds
+        a, b = float(params[0]), float(params[1])
+    except (ValueError, IndexError):
+        raise ValueError(f"Invalid fake LLM latency: {spec!r}")
+
+    if kind == "uniform":
+        return lambda rng: rng.uniform(a, b)
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(a, b))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(a), b) if a > 0 else 0.0
+    raise ValueError(f"Invalid fake LLM latency: {spec!r}")
+
+
+def _last_user_query(prompt: str) -> str:
+    matches = re.findall(r'사용자 질문:\s*(.+)', prompt)
+    return matches[-1].strip().strip('"') if matches else ""
+
+
+def fake_parse_reply(query: str) -> dict:
+    """company_name / year / quarter guessed from a query"""
+    year = re.search(r'(20\d{2})\s*년?', query)
+    quarter = re.search(r'([1-4])\s*분기', query)
+    words = re.sub(r'(20\d{2})\s*년?|[1-4]\s*분기', ' ', query).split()
+    return {
+        "company_name": words[0] if words else None,
+        "year": int(year.group(1)) if year else DEFAULT_YEAR,
+        "quarter": int(quarter.group(1)) if quarter else DEFAULT_QUARTER
+    }
+
+
+def fake_summary(prompt: str, chars: int) -> str:
+    # The report template's heading, not the section headings of the context data
+    headings = [h.strip() for h in re.findall(r'^\s*(## .*요약.*)$', prompt, re.MULTILINE)]
+    title = headings[-1] if headings else "## 요약"
+    body = (LOREM * (chars // len(LOREM) + 1))[:chars]
+    return f"{title}\n\n**핵심 요약**\n{body}"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with canned replies and sampled latency"""
+
+    model: str = "fake"
+    latency: str = "0"
+    error_rate: float = 0.0
+    summary_chars: int = 1200
+    parse_reply: Optional[str] = None
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr()
+    _sample: Callable = PrivateAttr()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._rng = random.Random(self.seed)
+        self._sample = parse_latency(self.latency)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if "'company_name'" in prompt and "'quarter'" in prompt:
+            if self.parse_reply:
+                return self.parse_reply
+            return json.dumps(fake_parse_reply(_last_user_query(prompt)), ensure_ascii=False)
+        return fake_summary(prompt, self.summary_chars)
+
+    def _draw(self) -> float:
+        """Latency of this call (raises the injected failure instead if drawn)"""
+        seconds = self._sample(self._rng)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakeProviderError(f"503 fake provider unavailable ({seconds:.2f}s)")
+        return seconds
+
+    def _result(self, messages) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _chunks(self, messages) -> List[str]:
+        text = self._reply(messages)
+        return [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._draw())
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._draw())
+        return self._result(messages)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        seconds = self._draw()
+        chunks = self._chunks(messages)
+        time.sleep(seconds * FIRST_CHUNK_SHARE)
+        for i, text in enumerate(chunks):
+            if i:
+                time.sleep(seconds * (1 - FIRST_CHUNK_SHARE) / (len(chunks) - 1))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        seconds = self._draw()
+        chunks = self._chunks(messages)
+        await asyncio.sleep(seconds * FIRST_CHUNK_SHARE)
+        for i, text in enumerate(chunks):
+            if i:
+                await asyncio.sleep(seconds * (1 - FIRST_CHUNK_SHARE) / (len(chunks) - 1))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+
+def create_fake_model(model: str) -> FakeChatModel:
+    """FakeChatModel configured from DART_FAKE_LLM_* (per-model latency first)"""
+    seed = os.getenv("DART_FAKE_LLM_SEED")
+    return FakeChatModel(
+        model=model,
+        latency=os.getenv(f"DART_FAKE_LLM_LATENCY_{env_suffix(model)}") or os.getenv("DART_FAKE_LLM_LATENCY", "0"),
+        error_rate=float(os.getenv("DART_FAKE_LLM_ERROR_RATE", "0")),
+        summary_chars=int(os.getenv("DART_FAKE_LLM_SUMMARY_CHARS", "1200")),
+        parse_reply=os.getenv("DART_FAKE_LLM_PARSE_REPLY") or None,
+        seed=int(seed) if seed else None
+    )
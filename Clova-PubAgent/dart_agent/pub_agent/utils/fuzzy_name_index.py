@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Fuzzy company-name index - Hangul jamo decomposition + character trigrams
+A typo usually changes a single jamo ("삼성전자" vs "삼성전쟈"), so names are
+compared on their jamo sequence. Candidates come from trigram posting lists;
+the best of them are re-ranked together with the Dice coefficient of their
+syllables, which survives swapped characters ("성삼전자") that break trigrams
+"""
+
+import re
+import heapq
+from collections import Counter
+from typing import Dict, Any, List, Tuple, Iterable, Set
+
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_NAME_NOISE_PATTERN = re.compile(r'\(주\)|㈜|주식회사|[\s\-_.,·&()]')
+
+# Below this score a candidate is rarely the intended company
+DEFAULT_MIN_SCORE = 0.5
+# Trigram candidates re-ranked per requested result
+_RERANK_FACTOR = 4
+_RERANK_MIN = 20
+
+
+def decompose_jamo(text: str) -> str:
+    """Hangul syllables -> conjoining jamo (other characters unchanged)"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            chars.append(chr(0x1100 + offset // 588))
+            chars.append(chr(0x1161 + (offset % 588) // 28))
+            if offset % 28:
+                chars.append(chr(0x11A7 + offset % 28))
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop corporate suffixes / separators, decompose Hangul"""
+    return decompose_jamo(_NAME_NOISE_PATTERN.sub('', name.lower()))
+
+
+def name_trigrams(name: str) -> Set[str]:
+    padded = f"^{normalize_name(name)}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_syllables(name: str) -> Counter:
+    return Counter(_NAME_NOISE_PATTERN.sub('', name.lower()))
+
+
+def _dice(a: Counter, b: Counter) -> float:
+    total = sum(a.values()) + sum(b.values())
+    return 2.0 * sum((a & b).values()) / total if total else 0.0
+
+
+class FuzzyNameIndex:
+    """Trigram index over a list of names, each mapped to a payload"""
+
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        self._names: List[str] = []
+        self._payloads: List[Any] = []
+        self._sizes: List[int] = []
+        self._syllables: List[Counter] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for name, payload in items:
+            grams = name_trigrams(name)
+            if not grams:
+                continue
+            name_id = len(self._names)
+            self._names.append(name)
+            self._payloads.append(payload)
+            self._sizes.append(len(grams))
+            self._syllables.append(name_syllables(name))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[str, Any, float]]:
+        """Top-k (name, payload, score) best first; score is in [0, 1]"""
+        grams = name_trigrams(query)
+        if not grams:
+            return []
+
+        overlaps: Dict[int, int] = {}
+        for gram in grams:
+            for name_id in self._postings.get(gram, ()):
+                overlaps[name_id] = overlaps.get(name_id, 0) + 1
+
+        query_size = len(grams)
+        candidates = heapq.nlargest(
+            max(k * _RERANK_FACTOR, _RERANK_MIN),
+            ((2.0 * overlap / (query_size + self._sizes[name_id]), name_id) for name_id, overlap in overlaps.items())
+        )
+
+        query_syllables = name_syllables(query)
+        scored = []
+        for trigram_score, name_id in candidates:
+            score = (trigram_score + _dice(query_syllables, self._syllables[name_id])) / 2
+            if score >= min_score:
+                # Equal scores: prefer the shorter name (카카오 before 카카오뱅크)
+                scored.append((score, -len(self._names[name_id]), name_id))
+
+        return [
+            (self._names[name_id], self._payloads[name_id], score)
+            for score, _, name_id in heapq.nlargest(k, scored)
+        ]
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+LLM gateway - one shared client and call policy per model
+get_chat_model() returns a LangChain chat model that wraps the provider
+client, so call sites keep building `prompt | llm | parser` chains. Every
+call (invoke / ainvoke / stream / astream) of a model goes through its
+ModelPool:
+
+    - concurrency cap (in-flight calls per model)
+    - token buckets: requests per minute, optionally prompt tokens per minute
+    - retries with full-jitter exponential backoff on transient errors
+      (429, 5xx, timeouts, connection errors); honours Retry-After
+    - optional hedging: a duplicate request once an attempt outlives the
+      model's recent p95 latency, first answer wins (non-streaming only)
+    - per-call latency and token metrics (llm_stats())
+
+Settings (model name upper-cased with other characters as "_",
+e.g. GEMINI_2_5_PRO, HCX_007):
+    DART_LLM_CONCURRENCY_{MODEL}   in-flight calls (default 8)
+    DART_LLM_RPM_{MODEL}           requests per minute (default 60)
+    DART_LLM_BURST_{MODEL}         requests started back to back before the rate applies (default 8)
+    DART_LLM_TPM_{MODEL}           prompt tokens per minute (default off)
+    DART_LLM_MAX_RETRIES           retries after the first attempt (default 3)
+    DART_LLM_BACKOFF_BASE / _MAX   backoff seconds (default 0.5 / 8)
+    DART_LLM_HEDGE                 1 enables hedging (default off, doubles cost on slow calls)
+    DART_LLM_HEDGE_MIN_SAMPLES     latencies needed before hedging (default 20)
+    DART_LLM_PROVIDER              "fake" replaces every provider with the local
+                                   stand-in in fake_llm.py (no keys, no network)
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable, Iterator, AsyncIterator, Optional, List
+
+from pydantic import ConfigDict
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+try:
+    from .rate_limiter import RateLimiter, get_rate_limiter, env_suffix
+    from .context_builder import estimate_tokens
+except ImportError:
+    from rate_limiter import RateLimiter, get_rate_limiter, env_suffix
+    from context_builder import estimate_tokens
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = int(os.getenv("DART_LLM_MAX_RETRIES", "3"))
+DEFAULT_BACKOFF_BASE = float(os.getenv("DART_LLM_BACKOFF_BASE", "0.5"))
+DEFAULT_BACKOFF_MAX = float(os.getenv("DART_LLM_BACKOFF_MAX", "8"))
+HEDGE_ENABLED = os.getenv("DART_LLM_HEDGE", "0") == "1"
+HEDGE_MIN_SAMPLES = int(os.getenv("DART_LLM_HEDGE_MIN_SAMPLES", "20"))
+LATENCY_WINDOW = 256
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = ("RateLimit", "Timeout", "TimedOut", "ServiceUnavailable", "InternalServerError",
+                    "APIConnectionError", "ConnectionError", "ResourceExhausted", "DeadlineExceeded",
+                    "Unavailable", "TooManyRequests")
+_RETRYABLE_MARKERS = ("429", "500", "502", "503", "504", "RESOURCE_EXHAUSTED", "UNAVAILABLE",
+                      "DEADLINE_EXCEEDED", "timed out", "Timeout", "overloaded")
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    for candidate in (getattr(error, "status_code", None), getattr(error, "code", None),
+                      getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(candidate, int):
+            return candidate
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Transient provider errors (rate limits, 5xx, timeouts, dropped connections)"""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(name in type(error).__name__ for name in _RETRYABLE_NAMES):
+        return True
+    text = str(error)
+    return any(marker in text for marker in _RETRYABLE_MARKERS)
+
+
+def _retry_after(error: Exception) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+class ModelPool:
+    """Call policy and metrics shared by every client of one model"""
+
+    def __init__(self, model: str, concurrency: int = DEFAULT_CONCURRENCY, rate_limiter: Optional[RateLimiter] = None,
+                 token_limiter: Optional[RateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 hedge: bool = HEDGE_ENABLED, hedge_min_samples: int = HEDGE_MIN_SAMPLES):
+        self.model = model
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.token_limiter = token_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._attempt_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._call_latencies = deque(maxlen=LATENCY_WINDOW)
+
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttled_seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    # --- admission -------------------------------------------------------
+
+    def _throttle_delay(self, prompt_tokens: int) -> float:
+        delay = self.rate_limiter.reserve() if self.rate_limiter else 0.0
+        if self.token_limiter and prompt_tokens:
+            delay = max(delay, self.token_limiter.reserve(min(prompt_tokens, self.token_limiter.capacity)))
+        if delay:
+            with self._lock:
+                self.throttled_seconds += delay
+        return delay
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _acquire(self, prompt_tokens: int):
+        delay = self._throttle_delay(prompt_tokens)
+        if delay:
+            time.sleep(delay)
+        self._slots.acquire()
+        self._enter()
+
+    async def _aacquire(self, prompt_tokens: int):
+        delay = self._throttle_delay(prompt_tokens)
+        if delay:
+            await asyncio.sleep(delay)
+        # Shared with sync callers, so poll instead of blocking the event loop
+        pause = 0.005
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(pause)
+            pause = min(pause * 2, 0.05)
+        self._enter()
+
+    def _try_acquire_hedge(self) -> bool:
+        """A hedge only goes out if a slot and a request token are free right now"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        if self.rate_limiter and not self.rate_limiter.try_acquire():
+            self._slots.release()
+            return False
+        self._enter()
+        with self._lock:
+            self.hedged += 1
+        return True
+
+    # --- attempts ----------------------------------------------------------
+
+    def _record_attempt(self, seconds: float):
+        with self._lock:
+            self._attempt_latencies.append(seconds)
+
+    def hedge_deadline(self) -> Optional[float]:
+        """p95 attempt latency once enough samples exist (None: no hedging)"""
+        if not self.hedge:
+            return None
+        with self._lock:
+            if len(self._attempt_latencies) < self.hedge_min_samples:
+                return None
+            return _percentile(self._attempt_latencies, 0.95)
+
+    def _attempt(self, fn: Callable[[], Any], prompt_tokens: int, acquired: bool = False):
+        if not acquired:
+            self._acquire(prompt_tokens)
+        start = time.perf_counter()
+        try:
+            result = fn()
+            self._record_attempt(time.perf_counter() - start)
+            return result
+        finally:
+            self._exit()
+
+    async def _aattempt(self, fn: Callable[[], Any], prompt_tokens: int, acquired: bool = False):
+        if not acquired:
+            await self._aacquire(prompt_tokens)
+        start = time.perf_counter()
+        try:
+            result = await fn()
+            self._record_attempt(time.perf_counter() - start)
+            return result
+        finally:
+            self._exit()
+
+    def _hedged_attempt(self, fn: Callable[[], Any], prompt_tokens: int):
+        deadline = self.hedge_deadline()
+        if deadline is None:
+            return self._attempt(fn, prompt_tokens)
+
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.concurrency * 2,
+                                                          thread_name_prefix=f"hedge-{self.model}")
+        primary = self._hedge_executor.submit(self._attempt, fn, prompt_tokens)
+        done, _ = wait([primary], timeout=deadline)
+        if done or not self._try_acquire_hedge():
+            return primary.result()
+
+        # The losing thread cannot be cancelled; its answer is simply dropped
+        hedge = self._hedge_executor.submit(self._attempt, fn, prompt_tokens, True)
+        pending, first_error = [primary, hedge], None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+
+    async def _ahedged_attempt(self, fn: Callable[[], Any], prompt_tokens: int):
+        deadline = self.hedge_deadline()
+        if deadline is None:
+            return await self._aattempt(fn, prompt_tokens)
+
+        primary = asyncio.ensure_future(self._aattempt(fn, prompt_tokens))
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done or not self._try_acquire_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self._aattempt(fn, prompt_tokens, True))
+        pending, first_error = {primary, hedge}, None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # --- retries -------------------------------------------------------------
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full jitter: uniform(0, min(max, base * 2^(attempt-1))), at least Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        return max(delay, min(_retry_after(error), self.backoff_max))
+
+    def _count_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        if attempt >= self.max_retries or not is_retryable(error):
+            self._count_failure()
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    def _start_call(self) -> float:
+        with self._lock:
+            self.calls += 1
+        return time.perf_counter()
+
+    def _finish_call(self, start: float):
+        with self._lock:
+            self.successes += 1
+            self._call_latencies.append(time.perf_counter() - start)
+
+    def call(self, fn: Callable[[], Any], prompt_tokens: int = 0):
+        """Run a blocking call under the pool's limits, retries and hedging"""
+        start = self._start_call()
+        attempt = 0
+        while True:
+            try:
+                result = self._hedged_attempt(fn, prompt_tokens)
+                self._finish_call(start)
+                return result
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                attempt += 1
+                delay = self._backoff(attempt, e)
+                print(f"[LLM_GATEWAY] {self.model} 재시도 {attempt}/{self.max_retries} ({delay:.1f}s 후): {e}")
+                time.sleep(delay)
+
+    async def acall(self, fn: Callable[[], Any], prompt_tokens: int = 0):
+        """Async call (fn returns an awaitable) under the pool's limits, retries and hedging"""
+        start = self._start_call()
+        attempt = 0
+        while True:
+            try:
+                result = await self._ahedged_attempt(fn, prompt_tokens)
+                self._finish_call(start)
+                return result
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                attempt += 1
+                delay = self._backoff(attempt, e)
+                print(f"[LLM_GATEWAY] {self.model} 재시도 {attempt}/{self.max_retries} ({delay:.1f}s 후): {e}")
+                await asyncio.sleep(delay)
+
+    def stream(self, open_stream: Callable[[], Iterator], prompt_tokens: int = 0) -> Iterator:
+        """Stream under the pool's limits; retried only until the first chunk arrives"""
+        start = self._start_call()
+        attempt = 0
+        while True:
+            self._acquire(prompt_tokens)
+            emitted, error = False, None
+            attempt_start = time.perf_counter()
+            try:
+                for chunk in open_stream():
+                    emitted = True
+                    yield chunk
+            except Exception as e:
+                error = e
+                if emitted:
+                    # Chunks already reached the caller; a retry would duplicate them
+                    self._count_failure()
+                    raise
+                if not self._should_retry(attempt, e):
+                    raise
+            finally:
+                self._exit()
+            if error is None:
+                self._record_attempt(time.perf_counter() - attempt_start)
+                self._finish_call(start)
+                return
+            attempt += 1
+            delay = self._backoff(attempt, error)
+            print(f"[LLM_GATEWAY] {self.model} 스트림 재시도 {attempt}/{self.max_retries} ({delay:.1f}s 후): {error}")
+            time.sleep(delay)
+
+    async def astream(self, open_stream: Callable[[], AsyncIterator], prompt_tokens: int = 0) -> AsyncIterator:
+        """Async stream under the pool's limits; retried only until the first chunk arrives"""
+        start = self._start_call()
+        attempt = 0
+        while True:
+            await self._aacquire(prompt_tokens)
+            emitted, error = False, None
+            attempt_start = time.perf_counter()
+            try:
+                async for chunk in open_stream():
+                    emitted = True
+                    yield chunk
+            except Exception as e:
+                error = e
+                if emitted:
+                    # Chunks already reached the caller; a retry would duplicate them
+                    self._count_failure()
+                    raise
+                if not self._should_retry(attempt, e):
+                    raise
+            finally:
+                self._exit()
+            if error is None:
+                self._record_attempt(time.perf_counter() - attempt_start)
+                self._finish_call(start)
+                return
+            attempt += 1
+            delay = self._backoff(attempt, error)
+            print(f"[LLM_GATEWAY] {self.model} 스트림 재시도 {attempt}/{self.max_retries} ({delay:.1f}s 후): {error}")
+            await asyncio.sleep(delay)
+
+    # --- metrics -------------------------------------------------------------
+
+    def record_tokens(self, input_tokens: int, output_tokens: int):
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "latency_p50": round(_percentile(self._call_latencies, 0.5), 3),
+                "latency_p95": round(_percentile(self._call_latencies, 0.95), 3),
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "rate_limit": self.rate_limiter.stats() if self.rate_limiter else None
+            }
+
+
+def _prompt_tokens(messages: List[BaseMessage]) -> int:
+    return estimate_tokens("\n".join(str(message.content) for message in messages))
+
+
+def _usage(message: BaseMessage, prompt_tokens: int, output_text: str):
+    """(input, output) tokens reported by the provider, estimated when missing"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return (usage.get("input_tokens") or prompt_tokens,
+            usage.get("output_tokens") or estimate_tokens(output_text))
+
+
+def _as_chunk(message: BaseMessage) -> AIMessageChunk:
+    """Clients without native streaming yield the whole AIMessage once"""
+    if isinstance(message, AIMessageChunk):
+        return message
+    return AIMessageChunk(content=message.content, usage_metadata=getattr(message, "usage_metadata", None),
+                          response_metadata=message.response_metadata)
+
+
+class GatewayChatModel(BaseChatModel):
+    """Chat model that sends every call of `client` through `pool`"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    client: BaseChatModel
+    pool: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway-{self.client._llm_type}"
+
+    def _result(self, message: AIMessage, prompt_tokens: int) -> ChatResult:
+        self.pool.record_tokens(*_usage(message, prompt_tokens, str(message.content)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt_tokens = _prompt_tokens(messages)
+        message = self.pool.call(lambda: self.client.invoke(messages, stop=stop, **kwargs), prompt_tokens)
+        return self._result(message, prompt_tokens)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt_tokens = _prompt_tokens(messages)
+        message = await self.pool.acall(lambda: self.client.ainvoke(messages, stop=stop, **kwargs), prompt_tokens)
+        return self._result(message, prompt_tokens)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        prompt_tokens = _prompt_tokens(messages)
+        text, last = [], None
+        for chunk in self.pool.stream(lambda: self.client.stream(messages, stop=stop, **kwargs), prompt_tokens):
+            text.append(str(chunk.content))
+            last = chunk
+            yield ChatGenerationChunk(message=_as_chunk(chunk))
+        if last is not None:
+            self.pool.record_tokens(*_usage(last, prompt_tokens, "".join(text)))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        prompt_tokens = _prompt_tokens(messages)
+        text, last = [], None
+        async for chunk in self.pool.astream(lambda: self.client.astream(messages, stop=stop, **kwargs), prompt_tokens):
+            text.append(str(chunk.content))
+            last = chunk
+            yield ChatGenerationChunk(message=_as_chunk(chunk))
+        if last is not None:
+            self.pool.record_tokens(*_usage(last, prompt_tokens, "".join(text)))
+
+
+def _create_client(provider: str, model: str, temperature: float, **kwargs) -> BaseChatModel:
+    if provider == "fake":
+        try:
+            from .fake_llm import create_fake_model
+        except ImportError:
+            from fake_llm import create_fake_model
+        return create_fake_model(model)
+    # Retries belong to the gateway; provider SDK retries would multiply them
+    kwargs.setdefault("max_retries", 0)
+    if provider == "clova":
+        from langchain_naver import ChatClovaX
+        return ChatClovaX(model=model, temperature=temperature, **kwargs)
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature, **kwargs)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+_pools: Dict[str, ModelPool] = {}
+_models: Dict[tuple, GatewayChatModel] = {}
+_shared_lock = threading.Lock()
+
+
+def get_model_pool(model: str) -> ModelPool:
+    """Process-wide ModelPool of a model (limits from DART_LLM_*_{MODEL})"""
+    with _shared_lock:
+        if model not in _pools:
+            suffix = env_suffix(model)
+            tpm = float(os.getenv(f"DART_LLM_TPM_{suffix}", "0"))
+            _pools[model] = ModelPool(
+                model,
+                concurrency=int(os.getenv(f"DART_LLM_CONCURRENCY_{suffix}", DEFAULT_CONCURRENCY)),
+                rate_limiter=get_rate_limiter(model),
+                token_limiter=RateLimiter(tpm, per=60.0, burst=tpm) if tpm > 0 else None
+            )
+        return _pools[model]
+
+
+def get_chat_model(provider: str, model: str, temperature: float = 0.1, **kwargs) -> GatewayChatModel:
+    """Shared gateway-wrapped chat model ("clova" -> ChatClovaX, "gemini" -> ChatGoogleGenerativeAI)"""
+    provider = os.getenv("DART_LLM_PROVIDER") or provider
+    key = (provider, model, temperature, tuple(sorted(kwargs.items())))
+    pool = get_model_pool(model)
+    with _shared_lock:
+        if key not in _models:
+            _models[key] = GatewayChatModel(client=_create_client(provider, model, temperature, **kwargs), pool=pool)
+        return _models[key]
+
+
+def llm_stats() -> Dict[str, Any]:
+    """Metrics of every model used in this process"""
+    with _shared_lock:
+        pools = dict(_pools)
+    return {model: pool.stats() for model, pool in pools.items()}
@@ -7,10 +7,18 @@ Convert API data to markdown text within JSON structure
 import json
 from typing import Dict, Any, List
 
+try:
+    from .corpus_io import load_document
+except ImportError:
+    from corpus_io import load_document
+
 
 class DartRegularPostprocessor:
     """DART regular disclosure data postprocessor - JSON output"""
 
+    # Bump whenever the rendered output changes (invalidates the processed disk cache)
+    VERSION = "1"
+
     def __init__(self):
         # Common fields to exclude
         self.exclude_fields = {'rcept_no', 'corp_cls', 'corp_code', 'corp_name', 'stlm_dt'}
@@ -73,9 +81,8 @@ class DartRegularPostprocessor:
         return "\n".join(lines)
 
     def process_file(self, input_path: str) -> Dict[str, Any]:
-        """Read file and process - returns JSON structure"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """Read file (plain, .json.zst or packed) and process - returns JSON structure"""
+        data = load_document(input_path)
 
         return self.process_regular_data(data)
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+DART processed cache - on-disk cache of DartRegularPostprocessor output
+Entries are keyed by the source file sha256 and the postprocessor version, so a
+collector rewriting a file (or a postprocessor change) simply misses the cache
+
+Layout: {year}/Q{n}/.processed_cache/v{version}/{sha256}.json
+        (or $DART_PROCESSED_CACHE_DIR/v{version}/{sha256}.json when set)
+
+Usage:
+    python processed_cache.py precompute dart_api_data
+    python processed_cache.py prune dart_api_data
+"""
+
+import os
+import sys
+import json
+import hashlib
+from typing import Dict, Any, Optional
+
+try:
+    from .postprocess_regular import DartRegularPostprocessor
+    from .corpus_io import split_pack_member_path, read_document_bytes
+    from .corpus_index import CorpusIndex
+except ImportError:
+    from postprocess_regular import DartRegularPostprocessor
+    from corpus_io import split_pack_member_path, read_document_bytes
+    from corpus_index import CorpusIndex
+
+
+PROCESSED_CACHE_DIRNAME = ".processed_cache"
+
+
+def source_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ProcessedDiskCache:
+    """Read-through disk cache of rendered markdown sections"""
+
+    def __init__(self, postprocessor: Optional[DartRegularPostprocessor] = None, cache_root: Optional[str] = None):
+        self.postprocessor = postprocessor or DartRegularPostprocessor()
+        self.cache_root = cache_root or os.getenv("DART_PROCESSED_CACHE_DIR")
+        self.version = self.postprocessor.VERSION
+
+    def _version_dir(self, document_path: str) -> str:
+        if self.cache_root:
+            root = self.cache_root
+        else:
+            pack_path, _ = split_pack_member_path(document_path)
+            if pack_path is not None:
+                quarter_dir = os.path.dirname(pack_path)
+            else:
+                quarter_dir = os.path.dirname(os.path.dirname(document_path))
+            root = os.path.join(quarter_dir, PROCESSED_CACHE_DIRNAME)
+        return os.path.join(root, f"v{self.version}")
+
+    def cache_path(self, document_path: str, sha256: str) -> str:
+        return os.path.join(self._version_dir(document_path), f"{sha256}.json")
+
+    def load(self, document_path: str, sha256: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.cache_path(document_path, sha256), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, document_path: str, sha256: str, processed_data: Dict[str, Any]):
+        path = self.cache_path(document_path, sha256)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Concurrent writers produce identical content; rename keeps readers safe
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(processed_data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[PROCESSED_CACHE] 저장 실패: {path} - {e}")
+
+    def get_or_render(self, document_path: str, sha256: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        processed_data = self.load(document_path, sha256)
+        if processed_data is None:
+            processed_data = self.postprocessor.process_regular_data(raw_data)
+            self.store(document_path, sha256, processed_data)
+        return processed_data
+
+    def precompute(self, base_path: str, force: bool = False) -> Dict[str, int]:
+        """Render every indexed document that has no cache entry yet"""
+        index = CorpusIndex(base_path)
+        stats = {"rendered": 0, "cached": 0, "failed": 0}
+
+        for year, quarter in index.quarters():
+            for entry in index.entries(year, quarter):
+                try:
+                    payload = read_document_bytes(entry["file_path"])
+                    sha256 = source_hash(payload)
+                    if not force and os.path.exists(self.cache_path(entry["file_path"], sha256)):
+                        stats["cached"] += 1
+                        continue
+                    processed_data = self.postprocessor.process_regular_data(json.loads(payload))
+                    self.store(entry["file_path"], sha256, processed_data)
+                    stats["rendered"] += 1
+                except Exception as e:
+                    print(f"⚠️  {entry['filename']} 렌더링 실패: {e}")
+                    stats["failed"] += 1
+            print(f"🧾 {year} Q{quarter} 완료 (누적): {stats}")
+
+        return stats
+
+    def prune(self, base_path: str) -> int:
+        """Delete entries of other postprocessor versions or of files that changed"""
+        index = CorpusIndex(base_path)
+        live = {}
+        for year, quarter in index.quarters():
+            for entry in index.entries(year, quarter):
+                sha256 = source_hash(read_document_bytes(entry["file_path"]))
+                live.setdefault(os.path.dirname(self._version_dir(entry["file_path"])), set()).add(
+                    os.path.basename(self.cache_path(entry["file_path"], sha256))
+                )
+
+        removed = 0
+        for root, names in live.items():
+            if not os.path.isdir(root):
+                continue
+            for version_name in os.listdir(root):
+                version_dir = os.path.join(root, version_name)
+                for filename in os.listdir(version_dir):
+                    if version_name != f"v{self.version}" or filename not in names:
+                        os.remove(os.path.join(version_dir, filename))
+                        removed += 1
+
+        print(f"🧹 {removed}개 캐시 파일 삭제")
+        return removed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DART 후처리 결과 디스크 캐시')
+    parser.add_argument('command', choices=['precompute', 'prune'])
+    parser.add_argument('base_path', help='데이터 경로 (예: dart_api_data)')
+    parser.add_argument('--force', action='store_true', help='precompute 시 기존 캐시도 다시 렌더링')
+
+    args = parser.parse_args()
+    cache = ProcessedDiskCache()
+
+    if args.command == 'precompute':
+        cache.precompute(args.base_path, force=args.force)
+    else:
+        cache.prune(args.base_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Query parse cache - SQLite store of {company_name, year, quarter} per question
+Questions are normalized (case, whitespace, trailing punctuation) before lookup,
+so repeated questions skip both the rule-based parser and the LLM call.
+
+Lookups are read-only: per-entry hit counts are kept in memory and written
+in batches (every HIT_FLUSH_BATCH hits or HIT_FLUSH_SECONDS), so cache hits
+never wait for the SQLite write lock (counts not flushed yet are lost when
+the process exits; they are statistics only).
+
+Entries expire after a TTL and are tied to the corpus version (the list of
+indexed quarters): when a new quarter is collected the "latest quarter"
+default changes, so every older entry is treated as stale and purged.
+
+Usage:
+    python query_cache.py stats dart_api_data
+    python query_cache.py clear dart_api_data
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+
+try:
+    from .corpus_index import get_corpus_index, CorpusIndex
+except ImportError:
+    from corpus_index import get_corpus_index, CorpusIndex
+
+
+CACHE_FILENAME = ".query_cache.sqlite"
+# Stored hit counters are updated in batches of this many hits, or after this many seconds
+HIT_FLUSH_BATCH = 64
+HIT_FLUSH_SECONDS = 30.0
+
+# Bump when the parsing rules change, so results parsed under the old rules are purged
+PARSE_RULES_VERSION = 2
+DEFAULT_TTL_SECONDS = int(os.getenv("DART_QUERY_CACHE_TTL", str(7 * 24 * 3600)))
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_TRAILING_PATTERN = re.compile(r'[\s?!.~]+$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parses (
+    query_key TEXT PRIMARY KEY,
+    corpus_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    source TEXT,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_parses_created ON parses (created_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Cache key of a question: lowercase, single spaces, no trailing punctuation"""
+    return _TRAILING_PATTERN.sub('', _WHITESPACE_PATTERN.sub(' ', (query or "").strip().lower()))
+
+
+class QueryParseCache:
+    """Persistent parse results keyed by normalized question and corpus version"""
+
+    def __init__(self, db_path: str, corpus_index: CorpusIndex, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.db_path = db_path
+        self.corpus_index = corpus_index
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._purged_version: Optional[str] = None
+        self._pending_hits: Dict[str, int] = {}
+        self._pending_total = 0
+        self._last_flush = time.time()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stale = 0
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def corpus_version(self) -> str:
+        """Rules version + indexed quarters, e.g. "r2:2025Q1,2025Q2" - changes when a quarter is added"""
+        quarters = ",".join(f"{year}Q{quarter}" for year, quarter in self.corpus_index.quarters())
+        return f"r{PARSE_RULES_VERSION}:{quarters}"
+
+    def _purge_stale(self, version: str):
+        """Drop entries of older corpus versions (once per version change)"""
+        if self._purged_version == version:
+            return
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM parses WHERE corpus_version != ?", (version,)).rowcount
+        conn.commit()
+        with self._lock:
+            self.stale += removed
+            self._purged_version = version
+        if removed:
+            print(f"[QUERY_CACHE] 새 분기 감지 ({version}) - 이전 파싱 결과 {removed}건 무효화")
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        key = normalize_query(query)
+        if not key:
+            return None
+
+        version = self.corpus_version()
+        self._purge_stale(version)
+
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT result, created_at FROM parses WHERE query_key = ? AND corpus_version = ?",
+            (key, version)
+        ).fetchone()
+
+        if row is not None and time.time() - row["created_at"] > self.ttl_seconds:
+            conn.execute("DELETE FROM parses WHERE query_key = ?", (key,))
+            conn.commit()
+            with self._lock:
+                self.expired += 1
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+            self._pending_total += 1
+            flush = self._pending_total >= HIT_FLUSH_BATCH or time.time() - self._last_flush >= HIT_FLUSH_SECONDS
+        if flush:
+            self.flush_hits()
+        return json.loads(row["result"])
+
+    def flush_hits(self):
+        """Write the hit counts gathered since the last flush (one transaction)"""
+        with self._lock:
+            pending = self._pending_hits
+            self._pending_hits = {}
+            self._pending_total = 0
+            self._last_flush = time.time()
+        if not pending:
+            return
+        conn = self._conn()
+        conn.executemany("UPDATE parses SET hits = hits + ? WHERE query_key = ?",
+                         [(count, key) for key, count in pending.items()])
+        conn.commit()
+
+    def put(self, query: str, result: Dict[str, Any], source: Optional[str] = None):
+        key = normalize_query(query)
+        if not key or not result:
+            return
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO parses (query_key, corpus_version, result, source, created_at, hits) "
+            "VALUES (?, ?, ?, ?, ?, 0)",
+            (key, self.corpus_version(), json.dumps(result, ensure_ascii=False), source, time.time())
+        )
+        conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._pending_hits = {}
+            self._pending_total = 0
+        conn = self._conn()
+        conn.execute("DELETE FROM parses")
+        conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush_hits()
+        conn = self._conn()
+        totals = conn.execute(
+            "SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS stored_hits FROM parses"
+        ).fetchone()
+        sources = dict(conn.execute("SELECT COALESCE(source, ''), COUNT(*) FROM parses GROUP BY source").fetchall())
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": totals["entries"],
+                "stored_hits": totals["stored_hits"],
+                "sources": sources,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "stale": self.stale,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
+_shared_caches: Dict[str, QueryParseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_query_cache(base_path: str) -> QueryParseCache:
+    """Process-wide QueryParseCache stored at {base_path}/.query_cache.sqlite"""
+    index = get_corpus_index(base_path)
+    with _shared_lock:
+        if index.base_path not in _shared_caches:
+            _shared_caches[index.base_path] = QueryParseCache(os.path.join(index.base_path, CACHE_FILENAME), index)
+        return _shared_caches[index.base_path]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='질문 파싱 결과 캐시')
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('base_path', help='DART 데이터 디렉토리 (예: dart_api_data)')
+
+    args = parser.parse_args()
+    cache = get_query_cache(args.base_path)
+
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"📊 저장된 파싱 결과 {stats['entries']}개, 누적 적중 {stats['stored_hits']}회 "
+              f"(TTL {stats['ttl_seconds'] // 3600}시간, 분기 버전 {cache.corpus_version()})")
+        for source, count in sorted(stats["sources"].items()):
+            print(f"   {source or '-'}: {count}개")
+    else:
+        cache.clear()
+        print("🗑️  파싱 결과 캐시 삭제 완료")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
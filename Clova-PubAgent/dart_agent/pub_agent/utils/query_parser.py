@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Deterministic query parser - company / year / quarter without an LLM call
+Companies are found with an Aho-Corasick automaton over the indexed corp names
+and a small alias table; years and quarters with Korean date patterns.
+Every result carries a confidence so callers can fall back to the LLM.
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from .corpus_index import get_corpus_index, CorpusIndex
+except ImportError:
+    from corpus_index import get_corpus_index, CorpusIndex
+
+
+# Same normalisation rules the LLM prompts spell out, plus common short forms
+COMPANY_ALIASES = {
+    "lg엔솔": "LG에너지솔루션",
+    "엘지엔솔": "LG에너지솔루션",
+    "엘지에너지솔루션": "LG에너지솔루션",
+    "kakao": "카카오",
+    "삼전": "삼성전자",
+    "samsung": "삼성전자",
+    "현대차": "현대자동차",
+    "하이닉스": "SK하이닉스",
+    "하닉": "SK하이닉스",
+    "네이버": "NAVER",
+    "naver": "NAVER",
+    "엘지전자": "LG전자",
+    "카뱅": "카카오뱅크",
+    "삼바": "삼성바이오로직스",
+    "기아차": "기아",
+    "포스코홀딩스": "POSCO홀딩스",
+}
+
+# Parses at or above this confidence skip the LLM
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+_SEPARATOR_PATTERN = re.compile(r'[\s,.?!·/()\[\]"\'~]')
+# Particles and words that may directly follow a company name
+_NAME_SUFFIX_PATTERN = re.compile(r'(의|은|는|이|가|을|를|와|과|도|에|랑|하고|\d|실적|보고서|공시|분기|반기|주가|배당)')
+
+_YEAR_PATTERN = re.compile(r'(?<!\d)(20\d{2})\s*년?(?!\d)')
+# "24년" is a year, "10년 후" / "3년간" are durations
+_SHORT_YEAR_PATTERN = re.compile(r'(?<!\d)(\d{2})\s*년(?!\s*(?:후|뒤|전|간|동안|만|째|이상|이내|넘))')
+# "전년 대비", "작년 동기" compare against the previous year rather than asking for it
+_COMPARISON_PATTERN = re.compile(r'(?:재작년|작년|지난해|전년)도?(?:동기|대비|비|같은기간)')
+_RELATIVE_YEARS = (("재작년", -2), ("작년", -1), ("지난해", -1), ("전년", -1), ("올해", 0), ("금년", 0), ("이번해", 0))
+_QUARTER_PATTERN = re.compile(r'(?<!\d)([1-4])\s*(?:분기|사분기|q)|q\s*([1-4])(?!\d)', re.IGNORECASE)
+_NAMED_QUARTERS = (("하반기", 4), ("사업보고서", 4), ("연간", 4), ("상반기", 2), ("반기", 2))
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; patterns map to arbitrary values"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[str, Any]]] = [[]]
+
+    def add(self, pattern: str, value: Any):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((pattern, value))
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def iter(self, text: str):
+        """Yield (start, end, pattern, value) for every occurrence"""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern, value in self._outputs[node]:
+                yield i - len(pattern) + 1, i + 1, pattern, value
+
+
+def _normalize(text: str) -> Tuple[str, List[int]]:
+    """Lowercase without separators, plus the original index of every kept character"""
+    chars = []
+    positions = []
+    for i, char in enumerate(text):
+        if not _SEPARATOR_PATTERN.match(char):
+            chars.append(char.lower())
+            positions.append(i)
+    return "".join(chars), positions
+
+
+class QueryParser:
+    """Rule-based company / year / quarter extraction over a CorpusIndex"""
+
+    def __init__(self, corpus_index: CorpusIndex, aliases: Optional[Dict[str, str]] = None):
+        self.corpus_index = corpus_index
+        self.aliases = dict(COMPANY_ALIASES if aliases is None else aliases)
+        self._lock = threading.Lock()
+        self._automaton: Optional[AhoCorasick] = None
+        self._quarters: List[Tuple[int, int]] = []
+
+    def _get_automaton(self) -> AhoCorasick:
+        """Automaton over all indexed names, rebuilt when the quarter list changes"""
+        quarters = self.corpus_index.quarters()
+        with self._lock:
+            if self._automaton is None or quarters != self._quarters:
+                automaton = AhoCorasick()
+                names = {}
+                for year, quarter in quarters:
+                    for entry in self.corpus_index.entries(year, quarter):
+                        for name in (entry["corp_name"], entry["company_name"]):
+                            if name:
+                                names.setdefault(_normalize(name)[0], entry["corp_name"] or name)
+                for alias, canonical in self.aliases.items():
+                    names[_normalize(alias)[0]] = canonical
+                for pattern, canonical in names.items():
+                    if pattern:
+                        automaton.add(pattern, canonical)
+                automaton.build()
+                self._automaton = automaton
+                self._quarters = quarters
+            return self._automaton
+
+    def _find_company(self, query: str) -> Tuple[Optional[str], float]:
+        scored = self._score_companies(query)
+        if not scored:
+            return None, 0.0
+
+        confidence, _, canonical = scored[0]
+        # Several companies at word starts ("삼성전자와 SK하이닉스 비교") - let the LLM decide
+        rivals = {name for c, _, name in scored if c >= 0.85 and name != canonical}
+        if rivals:
+            confidence = min(confidence, 0.5)
+        return canonical, confidence
+
+    def _score_companies(self, query: str) -> List[Tuple[float, int, str]]:
+        """(confidence, pattern length, canonical name) of every matched company, best first"""
+        normalized, positions = _normalize(query)
+        matches = sorted(
+            self._get_automaton().iter(normalized),
+            key=lambda match: (-(match[1] - match[0]), match[0])
+        )
+
+        # Longest non-overlapping matches ("카카오뱅크" wins over "카카오")
+        taken = []
+        for start, end, pattern, canonical in matches:
+            if all(end <= s or start >= e for s, e, _, _ in taken):
+                taken.append((start, end, pattern, canonical))
+
+        scored = []
+        for start, end, pattern, canonical in taken:
+            original_start = positions[start]
+            original_end = positions[end - 1] + 1
+            starts_word = original_start == 0 or _SEPARATOR_PATTERN.match(query[original_start - 1]) is not None
+            rest = query[original_end:]
+            ends_word = not rest or _SEPARATOR_PATTERN.match(rest[0]) is not None or _NAME_SUFFIX_PATTERN.match(rest) is not None
+
+            if starts_word and ends_word:
+                confidence = 1.0
+            elif starts_word:
+                confidence = 0.85
+            else:
+                confidence = 0.4
+            if len(pattern) <= 2 and confidence < 1.0:
+                confidence = min(confidence, 0.4)
+            scored.append((confidence, len(pattern), canonical))
+
+        scored.sort(reverse=True)
+        return scored
+
+    def _latest_quarter(self, year: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        quarters = [q for q in self.corpus_index.quarters() if year is None or q[0] == year]
+        return quarters[-1] if quarters else None
+
+    def _find_year(self, query: str, current_year: int) -> Tuple[Optional[int], bool]:
+        """(year, ambiguous)"""
+        years = {int(match) for match in _YEAR_PATTERN.findall(query)}
+        years |= {2000 + int(match) for match in _SHORT_YEAR_PATTERN.findall(query)}
+        compact = _COMPARISON_PATTERN.sub("", query.replace(" ", ""))
+        for word, delta in _RELATIVE_YEARS:
+            if word in compact:
+                years.add(current_year + delta)
+                compact = compact.replace(word, "")
+        if not years:
+            return None, False
+        return max(years), len(years) > 1
+
+    def _find_quarter(self, query: str) -> Tuple[Optional[int], bool]:
+        """(quarter, ambiguous)"""
+        quarters = {int(a or b) for a, b in _QUARTER_PATTERN.findall(query)}
+        if not quarters:
+            compact = query.replace(" ", "")
+            for word, quarter in _NAMED_QUARTERS:
+                if word in compact:
+                    quarters.add(quarter)
+                    break
+        if not quarters:
+            return None, False
+        return max(quarters), len(quarters) > 1
+
+    def parse(self, query: str) -> Dict[str, Any]:
+        """
+        {"company_name", "year", "quarter", "confidence"}
+
+        Missing dates default to the newest indexed quarter (of the given year),
+        which is also what the LLM prompt asks for. "올해"/"작년" are relative
+        to the newest indexed year. A period that is not indexed (e.g. a
+        misread duration) caps the confidence so the LLM takes over.
+        """
+        latest = self._latest_quarter()
+        current_year = latest[0] if latest else None
+
+        company_name, confidence = self._find_company(query or "")
+        year, year_ambiguous = self._find_year(query or "", current_year) if current_year else (None, False)
+        quarter, quarter_ambiguous = self._find_quarter(query or "")
+
+        if year is None and latest:
+            year = current_year
+        if quarter is None:
+            latest_of_year = self._latest_quarter(year)
+            quarter = latest_of_year[1] if latest_of_year else 4
+        if year_ambiguous or quarter_ambiguous:
+            confidence = min(confidence, 0.5)
+        if (year, quarter) not in self.corpus_index.quarters():
+            confidence = min(confidence, 0.5)
+
+        return {
+            "company_name": company_name,
+            "year": year,
+            "quarter": quarter,
+            "confidence": confidence
+        }
+
+    def candidates(self, query: str, k: int = 2) -> List[Dict[str, Any]]:
+        """
+        Up to k distinct company guesses for the parsed period, best first
+
+        Used to prefetch files while the LLM parses a query the fast path
+        was not sure about; the guesses may well be wrong.
+        """
+        parsed = self.parse(query)
+        guesses = []
+        for confidence, _, canonical in self._score_companies(query or ""):
+            if canonical in (guess["company_name"] for guess in guesses):
+                continue
+            guesses.append({
+                "company_name": canonical,
+                "year": parsed["year"],
+                "quarter": parsed["quarter"],
+                "confidence": confidence
+            })
+            if len(guesses) >= k:
+                break
+        return guesses
+
+
+_shared_parsers: Dict[str, QueryParser] = {}
+_shared_lock = threading.Lock()
+
+
+def get_query_parser(base_path: str) -> QueryParser:
+    """Process-wide QueryParser over the shared CorpusIndex of base_path"""
+    index = get_corpus_index(base_path)
+    with _shared_lock:
+        if index.base_path not in _shared_parsers:
+            _shared_parsers[index.base_path] = QueryParser(index)
+        return _shared_parsers[index.base_path]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rate limiter - token bucket per LLM provider or model
+One bucket per provider (or model) name, shared by every thread in the
+process, so a batch job and the API running in the same process draw from the
+same quota. The rate comes from DART_LLM_RPM_{NAME} (calls per minute, name
+upper-cased with other characters as "_", e.g. DART_LLM_RPM_GEMINI_2_5_PRO)
+and the burst from DART_LLM_BURST_{NAME} unless given.
+"""
+
+import os
+import re
+import time
+import threading
+from typing import Dict, Any, Optional
+
+
+DEFAULT_RPM = 60
+# Calls that may start back to back before the rate applies (the gateway's default concurrency)
+DEFAULT_BURST = 8
+
+
+class RateLimiter:
+    """Token bucket: `rate` calls per `per` seconds, bursts up to `burst` calls"""
+
+    def __init__(self, rate: float, per: float = 60.0, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = burst if burst is not None else max(1.0, min(float(DEFAULT_BURST), rate))
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now (the balance may go negative); seconds to wait before using them"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            self.acquired += 1
+            wait = max(0.0, -self._tokens * self.per / self.rate)
+            self.waited_seconds += wait
+            return wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if they are available right now"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            self.acquired += 1
+            return True
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` calls are allowed"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "per": self.per,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 3),
+                "acquired": self.acquired,
+                "waited_seconds": round(self.waited_seconds, 3)
+            }
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def env_suffix(name: str) -> str:
+    """Environment variable suffix for a provider/model name ("gemini-2.5-pro" -> "GEMINI_2_5_PRO")"""
+    return re.sub(r'[^A-Z0-9]', '_', name.upper())
+
+
+def get_rate_limiter(provider: str, rate_per_minute: Optional[float] = None,
+                     burst: Optional[float] = None) -> RateLimiter:
+    """Process-wide limiter for a provider or model (created on first use, later settings are ignored)"""
+    key = provider.lower()
+    with _shared_lock:
+        if key not in _shared_limiters:
+            if rate_per_minute is None:
+                rate_per_minute = float(os.getenv(f"DART_LLM_RPM_{env_suffix(key)}", DEFAULT_RPM))
+            if burst is None and os.getenv(f"DART_LLM_BURST_{env_suffix(key)}"):
+                burst = float(os.getenv(f"DART_LLM_BURST_{env_suffix(key)}"))
+            _shared_limiters[key] = RateLimiter(rate_per_minute, per=60.0, burst=burst)
+        return _shared_limiters[key]
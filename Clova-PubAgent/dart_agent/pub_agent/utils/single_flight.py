@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Single flight - identical concurrent calls share one execution
+The first caller of a key (the leader) runs the work; callers arriving
+while it is in flight wait for the leader's result instead of repeating
+it. Nothing is kept once the call finishes (caching is the caller's job),
+so only truly concurrent calls are coalesced.
+
+Works across threads and asyncio: every flight is a concurrent.futures
+Future, awaited with asyncio.wrap_future on the event loop.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Awaitable, Callable, Hashable, Tuple
+
+
+class SingleFlight:
+    """In-flight calls by key plus leader/deduplicated counters"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.deduplicated = 0
+        self.failures = 0
+
+    def join(self, key: Hashable) -> Tuple[Future, bool]:
+        """(flight, is_leader) - the leader must call finish() exactly once"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        """Publish the leader's result (or error) to every waiting caller"""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if error is not None:
+                self.failures += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """fn() once per concurrent group of callers"""
+        future, leader = self.join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except Exception as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async do(); the shared call keeps running if the leader's own request is cancelled"""
+        future, leader = self.join(key)
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        task = asyncio.ensure_future(coro_fn())
+
+        def publish(done: asyncio.Future):
+            if done.cancelled():
+                self.finish(key, future, error=asyncio.CancelledError())
+            elif done.exception() is not None:
+                self.finish(key, future, error=done.exception())
+            else:
+                self.finish(key, future, done.result())
+
+        task.add_done_callback(publish)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.leaders + self.deduplicated
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "deduplicated": self.deduplicated,
+                "failures": self.failures,
+                "dedup_rate": self.deduplicated / calls if calls else 0.0
+            }
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Speculative prefetch - load candidate files while the LLM parses a query
+The caller guesses the file(s) a query is about (e.g. from the rule-based
+parser's low-confidence answer) and starts loading them on a small thread
+pool. Once the LLM has answered and the real file is known, a matching
+prefetch is used (waiting for it if it is still running); otherwise the
+prefetches are dropped and the file is loaded as usual.
+
+Settings:
+    DART_PREFETCH_CANDIDATES   files loaded per query (0 disables, default 2)
+    DART_PREFETCH_WORKERS      loader threads (default 2)
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+
+
+DEFAULT_MAX_CANDIDATES = int(os.getenv("DART_PREFETCH_CANDIDATES", "2"))
+DEFAULT_WORKERS = int(os.getenv("DART_PREFETCH_WORKERS", "2"))
+
+
+class Speculation:
+    """Prefetches started for one query: file path -> Future of (data, load seconds)"""
+
+    def __init__(self, futures: Dict[str, Future]):
+        self.futures = futures
+        self.resolved = False
+
+
+class SpeculativePrefetcher:
+    """Thread pool of speculative file loads plus hit/miss accounting"""
+
+    def __init__(self, loader: Callable[[str], Any], max_candidates: int = DEFAULT_MAX_CANDIDATES,
+                 max_workers: int = DEFAULT_WORKERS):
+        self.loader = loader
+        self.max_candidates = max_candidates
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+
+        self.started = 0
+        self.skipped = 0
+        self.hits = 0
+        self.misses = 0
+        self.abandoned = 0
+        self.files_loaded = 0
+        self.files_wasted = 0
+        self.saved_seconds = 0.0
+
+    def _timed_load(self, file_path: str) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        data = self.loader(file_path)
+        return data, time.perf_counter() - start
+
+    def start(self, file_paths: Iterable[Optional[str]]) -> Optional[Speculation]:
+        """Start loading up to max_candidates distinct paths (None entries are ignored)"""
+        paths = []
+        for file_path in file_paths:
+            if file_path and file_path not in paths:
+                paths.append(file_path)
+        paths = paths[:self.max_candidates]
+
+        if not paths:
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        futures = {path: self._executor.submit(self._timed_load, path) for path in paths}
+        with self._lock:
+            self.started += 1
+        return Speculation(futures)
+
+    def resolve(self, speculation: Optional[Speculation], file_path: Optional[str]) -> Tuple[bool, Any]:
+        """
+        (hit, data) for the file the query really needs
+
+        On a hit the prefetched data is returned (after waiting for the load
+        if it is still running); the other candidates are cancelled or counted
+        as wasted. A failed prefetch counts as a miss so the caller reloads.
+        """
+        if speculation is None or speculation.resolved:
+            return False, None
+        speculation.resolved = True
+
+        future = speculation.futures.get(file_path) if file_path else None
+        data, hit, saved = None, False, 0.0
+        if future is not None:
+            waited_from = time.perf_counter()
+            try:
+                data, load_seconds = future.result()
+                hit = True
+                # Part of the load that ran while the caller was busy with the LLM
+                saved = max(0.0, load_seconds - (time.perf_counter() - waited_from))
+            except Exception as e:
+                print(f"[PREFETCH] 미리 로드 실패: {file_path} - {e}")
+
+        wasted = self._discard(speculation, keep=file_path if hit else None)
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_seconds += saved
+            else:
+                self.misses += 1
+            self.files_loaded += wasted + (1 if hit else 0)
+            self.files_wasted += wasted
+        return hit, data
+
+    def abandon(self, speculation: Optional[Speculation]):
+        """Drop a speculation whose query could not be parsed at all"""
+        if speculation is None or speculation.resolved:
+            return
+        speculation.resolved = True
+        wasted = self._discard(speculation)
+        with self._lock:
+            self.abandoned += 1
+            self.files_loaded += wasted
+            self.files_wasted += wasted
+
+    def _discard(self, speculation: Speculation, keep: Optional[str] = None) -> int:
+        """Cancel pending loads except `keep`; number of loads that ran for nothing"""
+        wasted = 0
+        for path, future in speculation.futures.items():
+            if path == keep:
+                continue
+            if not future.cancel():
+                wasted += 1
+        return wasted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            resolved = self.hits + self.misses
+            return {
+                "max_candidates": self.max_candidates,
+                "started": self.started,
+                "skipped": self.skipped,
+                "hits": self.hits,
+                "misses": self.misses,
+                "abandoned": self.abandoned,
+                "hit_rate": self.hits / resolved if resolved else 0.0,
+                "files_loaded": self.files_loaded,
+                "files_wasted": self.files_wasted,
+                "saved_seconds": round(self.saved_seconds, 3)
+            }
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Summary cache - LLM summaries keyed by what actually went into the prompt
+Key: (corp_code, year, quarter, source file sha256, prompt version, intent),
+the intent being the sections the question's keywords add to the context.
+A collector rewriting the file changes the hash and a template change bumps
+the prompt version, so stale summaries are never served.
+
+In-memory LRU in front of an optional disk tier:
+    {base_path}/.summary_cache/{key[:2]}/{key}.json
+    (or $DART_SUMMARY_CACHE_DIR/...; DART_SUMMARY_CACHE_DISK=0 disables it)
+
+Usage:
+    python summary_cache.py stats dart_api_data
+    python summary_cache.py clear dart_api_data
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+try:
+    from .context_builder import query_section_keys
+except ImportError:
+    from context_builder import query_section_keys
+
+
+SUMMARY_CACHE_DIRNAME = ".summary_cache"
+DEFAULT_MAX_ENTRIES = int(os.getenv("DART_SUMMARY_CACHE_ENTRIES", "512"))
+
+
+def summary_intent(query: str) -> str:
+    """Sections the question adds to the summary context, e.g. "api_02+api_08", or "overview"
+
+    Uses the context builder's keyword table, so two questions share a cache
+    entry only when they put the same sections into the prompt.
+    """
+    return "+".join(query_section_keys(query)) or "overview"
+
+
+def summary_key(corp_code: str, year: int, quarter: int, source_sha256: str,
+                prompt_version: Any, intent: str) -> str:
+    parts = [corp_code, int(year), int(quarter), source_sha256, str(prompt_version), intent]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """LRU of generated summaries with a read-through disk tier"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_disk(self, key: str, entry: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SUMMARY_CACHE] 저장 실패: {path} - {e}")
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{"summary", "created_at", ...} or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, summary: str, **meta):
+        entry = {"summary": summary, "created_at": time.time(), **meta}
+        self._remember(key, entry)
+        self._store_disk(key, entry)
+
+    def clear(self, disk: bool = True):
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_dir": self.cache_dir,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+_shared_caches: Dict[str, SummaryCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_summary_cache(base_path: str) -> SummaryCache:
+    """Process-wide SummaryCache (disk tier under base_path unless disabled)"""
+    key = os.path.abspath(base_path)
+    with _shared_lock:
+        if key not in _shared_caches:
+            cache_dir = None
+            if os.getenv("DART_SUMMARY_CACHE_DISK", "1") != "0":
+                cache_dir = os.getenv("DART_SUMMARY_CACHE_DIR") or os.path.join(key, SUMMARY_CACHE_DIRNAME)
+            _shared_caches[key] = SummaryCache(cache_dir=cache_dir)
+        return _shared_caches[key]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='요약 결과 캐시')
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('base_path', help='DART 데이터 디렉토리 (예: dart_api_data)')
+
+    args = parser.parse_args()
+    cache = get_summary_cache(args.base_path)
+
+    if not cache.cache_dir:
+        print("디스크 캐시가 비활성화되어 있습니다 (DART_SUMMARY_CACHE_DISK=0)")
+        return 1
+
+    if args.command == 'stats':
+        files = []
+        if os.path.isdir(cache.cache_dir):
+            for root, _, names in os.walk(cache.cache_dir):
+                files.extend(os.path.join(root, name) for name in names if name.endswith('.json'))
+        total_bytes = sum(os.path.getsize(path) for path in files)
+        print(f"📊 {cache.cache_dir}: 요약 {len(files)}개, {total_bytes / 1024:.1f}KB")
+    else:
+        cache.clear()
+        print("🗑️  요약 캐시 삭제 완료")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,9 +25,12 @@ from dart_api_requests import (
     api_21_adtServcCnclsSttus, api_22_accnutAdtorNonAdtServcCnclsSttus, api_23_outcmpnyDrctrNdChangeSttus, api_24_unrstExctvMendngSttus,
     api_25_drctrAdtAllMendngSttusGmtsckConfmAmount, api_26_drctrAdtAllMendngSttusMendngPymntamtTyCl, api_27_pssrpCptalUseDtls, api_28_prvsrpCptalUseDtls
 )
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dart_agent', 'pub_agent', 'utils'))
+from corpus_compress import COMPRESSED_SUFFIX, latest_dictionary, write_company_file
+from corpus_manifest import record_files
 
 class DartBatchCollector:
-    def __init__(self, year='2023', quarter='Q4'):
+    def __init__(self, year='2023', quarter='Q4', compress=False):
         self.year = year
         self.quarter = quarter
         self.base_dir = Path('dart_api_data')
@@ -36,6 +39,10 @@ class DartBatchCollector:
         self.logs_dir = self.base_dir / 'logs'
         self.progress_file = self.quarter_dir / 'progress.json'
 
+        # zstd 압축 저장 (dart_api_data/zstd_dicts 의 최신 사전 사용)
+        self.compress = compress
+        self.zstd_dict = latest_dictionary(str(self.base_dir)) if compress else None
+
         # 분기별 보고서 코드 매핑
         self.quarter_codes = {
             'Q1': '11013',  # 1분기보고서
@@ -128,6 +135,13 @@ class DartBatchCollector:
         except Exception as e:
             print(f"⚠️  진행상황 저장 실패: {e}")
 
+    def record_manifest(self, saved_path):
+        """분기 manifest.json에 저장한 파일 기록 (크기, sha256, 성공 API 수 등)"""
+        try:
+            record_files(str(self.quarter_dir), [saved_path])
+        except Exception as e:
+            print(f"   ⚠️ manifest 기록 실패: {e}")
+
     def collect_company_data(self, company, progress):
         """개별 회사 데이터 수집"""
         corp_code = company['corp_code']
@@ -145,8 +159,8 @@ class DartBatchCollector:
         filename = f"{stock_code}_{safe_name}.json"
         file_path = self.companies_dir / filename
 
-        # 이미 파일이 존재하면 건너뛰기
-        if file_path.exists():
+        # 이미 파일이 존재하면 건너뛰기 (압축본 포함)
+        if file_path.exists() or Path(str(file_path) + COMPRESSED_SUFFIX).exists():
             print(f"   ✅ 이미 존재함: {filename}")
             progress['completed_companies'].append(corp_code)
             return True
@@ -204,10 +218,10 @@ class DartBatchCollector:
 
         # 파일 저장
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(company_data, f, ensure_ascii=False, indent=2)
+            saved_path = write_company_file(file_path, company_data, self.compress, self.zstd_dict)
 
-            print(f"   💾 저장 완료: {filename} ({successful_apis}/{len(self.api_functions)} API 성공)")
+            print(f"   💾 저장 완료: {os.path.basename(saved_path)} ({successful_apis}/{len(self.api_functions)} API 성공)")
+            self.record_manifest(saved_path)
             progress['completed_companies'].append(corp_code)
             return True
 
@@ -314,10 +328,11 @@ def main():
                        help='수집 분기 (기본값: Q4)')
     parser.add_argument('--batch-size', type=int, default=50, help='배치 크기 (기본값: 50)')
     parser.add_argument('--start-from', type=int, default=0, help='시작 회사 인덱스 (기본값: 0)')
+    parser.add_argument('--compress', action='store_true', help='zstd 압축(.json.zst)으로 저장')
 
     args = parser.parse_args()
 
-    collector = DartBatchCollector(year=args.year, quarter=args.quarter)
+    collector = DartBatchCollector(year=args.year, quarter=args.quarter, compress=args.compress)
     collector.run_batch_collection(
         batch_size=args.batch_size,
         start_from=args.start_from
@@ -27,9 +27,12 @@ from dart_api_requests import (
     api_25_drctrAdtAllMendngSttusGmtsckConfmAmount, api_26_drctrAdtAllMendngSttusMendngPymntamtTyCl, api_27_pssrpCptalUseDtls, api_28_prvsrpCptalUseDtls,
     set_api_key, get_current_api_key, AVAILABLE_API_KEYS
 )
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dart_agent', 'pub_agent', 'utils'))
+from corpus_compress import COMPRESSED_SUFFIX, latest_dictionary, write_company_file
+from corpus_manifest import record_files
 
 class FastDartCollector:
-    def __init__(self, year='2024', quarter='Q4'):
+    def __init__(self, year='2024', quarter='Q4', compress=False):
         self.year = year
         self.quarter = quarter
         self.base_dir = Path('dart_api_data')
@@ -37,6 +40,10 @@ class FastDartCollector:
         self.companies_dir = self.quarter_dir / 'companies'
         self.progress_file = self.quarter_dir / 'progress.json'
 
+        # zstd 압축 저장 (dart_api_data/zstd_dicts 의 최신 사전 사용)
+        self.compress = compress
+        self.zstd_dict = latest_dictionary(str(self.base_dir)) if compress else None
+
         # 분기별 보고서 코드 매핑
         self.quarter_codes = {
             'Q1': '11013', 'Q2': '11012', 'Q3': '11014', 'Q4': '11011'
@@ -95,6 +102,13 @@ class FastDartCollector:
         except:
             pass
 
+    def record_manifest(self, saved_path):
+        """분기 manifest.json에 저장한 파일 기록 (크기, sha256, 성공 API 수 등)"""
+        try:
+            record_files(str(self.quarter_dir), [saved_path])
+        except Exception as e:
+            print(f"   ⚠️ manifest 기록 실패: {e}")
+
     def collect_company_data_fast(self, company, progress):
         """개별 회사 데이터 수집 (고속화 버전)"""
         corp_code = company['corp_code']
@@ -110,8 +124,8 @@ class FastDartCollector:
         filename = f"{stock_code}_{safe_name}.json"
         file_path = self.companies_dir / filename
 
-        # 이미 파일이 존재하면 건너뛰기
-        if file_path.exists():
+        # 이미 파일이 존재하면 건너뛰기 (압축본 포함)
+        if file_path.exists() or Path(str(file_path) + COMPRESSED_SUFFIX).exists():
             progress['completed_companies'].append(corp_code)
             return True
 
@@ -150,12 +164,14 @@ class FastDartCollector:
         if successful_apis > 0:
             company_data['metadata']['successful_apis'] = successful_apis
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(company_data, f, ensure_ascii=False, indent=2)
+                saved_path = write_company_file(file_path, company_data, self.compress, self.zstd_dict)
                 progress['completed_companies'].append(corp_code)
-                return True
             except:
-                pass
+                saved_path = None
+
+            if saved_path:
+                self.record_manifest(saved_path)
+                return True
 
         progress['failed_companies'].append(corp_code)
         return False
@@ -234,10 +250,11 @@ def main():
     parser.add_argument('--start-index', type=int, default=0, help='처리 시작 인덱스')
     parser.add_argument('--end-index', type=int, default=None, help='처리 종료 인덱스 (미지정 시 끝까지)')
     parser.add_argument('--api-key', choices=list(AVAILABLE_API_KEYS.keys()), help='사용할 API 키 선택')
+    parser.add_argument('--compress', action='store_true', help='zstd 압축(.json.zst)으로 저장')
 
     args = parser.parse_args()
 
-    collector = FastDartCollector(year=args.year, quarter=args.quarter)
+    collector = FastDartCollector(year=args.year, quarter=args.quarter, compress=args.compress)
     collector.run_fast_collection(
         batch_size=args.batch_size,
         start_index=args.start_index,
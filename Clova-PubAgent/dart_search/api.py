@@ -1,8 +1,79 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import os
+import json
+import math
+import asyncio
+from typing import List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field
 from search_engine import DartSearchEngine
+from query_cache import normalize_query
+from llm_gateway import llm_stats
+from admission import AdmissionLane, AdmissionRejected
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional dependency
+    BrotliMiddleware = None
+
+class OrjsonResponse(JSONResponse):
+    """orjson으로 인코딩하는 JSONResponse"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+# orjson이 있으면 응답 JSON 인코딩에 사용 (raw_data가 수백 KB라 기본 json보다 훨씬 빠름)
+JSON_RESPONSE_CLASS = OrjsonResponse if orjson is not None else JSONResponse
+
+app = FastAPI(title="DART 공시 AI 요약 API", version="1.0.0", default_response_class=JSON_RESPONSE_CLASS)
+
+# 요청 수용 제한: 동시 처리 수 + 대기열 (대기열이 차면 429, 대기 시간 초과 시 503, 둘 다 Retry-After)
+# 요약/분석(LLM) 요청과 회사 데이터 조회를 나눠서 요약 폭주 중에도 /company_data, /company_reports는 처리
+QUEUE_TIMEOUT = float(os.getenv("DART_API_QUEUE_TIMEOUT", "30"))
+summarize_lane = AdmissionLane(
+    "summarize",
+    concurrency=int(os.getenv("DART_API_SUMMARIZE_CONCURRENCY", "8")),
+    max_queue=int(os.getenv("DART_API_SUMMARIZE_QUEUE", "32")),
+    queue_timeout=QUEUE_TIMEOUT,
+    workers=int(os.getenv("DART_API_SUMMARIZE_WORKERS", "8"))
+)
+company_lane = AdmissionLane(
+    "company",
+    concurrency=int(os.getenv("DART_API_COMPANY_CONCURRENCY", "16")),
+    max_queue=int(os.getenv("DART_API_COMPANY_QUEUE", "64")),
+    queue_timeout=QUEUE_TIMEOUT,
+    workers=int(os.getenv("DART_API_COMPANY_WORKERS", "8"))
+)
+
+@app.on_event("startup")
+async def use_summarize_executor():
+    """엔진의 asyncio.to_thread(파일 로드/후처리)가 요약 lane의 스레드풀을 쓰도록 기본 executor 교체"""
+    asyncio.get_running_loop().set_default_executor(summarize_lane.executor)
+
+@app.exception_handler(AdmissionRejected)
+class StreamExcludedGZipMiddleware(GZipMiddleware):
+    """SSE 경로(/stream)는 압축하지 않는 GZipMiddleware
+
+    Starlette 0.27(fastapi 0.104)의 GZipMiddleware는 text/event-stream도 압축해
+    이벤트가 버퍼에 모였다가 전달되므로 경로로 직접 제외
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
-app = FastAPI(title="DART 공시 AI 요약 API", version="1.0.0")
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    print(f"[API] 요청 거절 ({exc.lane}, {exc.status_code}): {request.url.path}")
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)},
+                        headers={"Retry-After": str(exc.retry_after)})
 
 
 
@@ -15,13 +86,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축: br(brotli-asgi 설치 시, br 미지원 클라이언트는 gzip), gzip, off
+# SSE 스트림은 압축하면 이벤트가 모여서 전달되므로 제외
+COMPRESSION = os.getenv("DART_API_COMPRESSION", "br")
+COMPRESS_MIN_BYTES = int(os.getenv("DART_API_COMPRESS_MIN_BYTES", "1024"))
+if COMPRESSION == "br" and BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESS_MIN_BYTES, excluded_handlers=[r"/stream$"])
+elif COMPRESSION in ("br", "gzip"):
+    app.add_middleware(StreamExcludedGZipMiddleware, minimum_size=COMPRESS_MIN_BYTES)
 
 
 
+
+# /batch: 요청당 최대 항목 수, 한 배치 안에서 동시에 처리할 항목 수 (각 항목은 해당 lane에 따로 수용됨)
+BATCH_MAX_ITEMS = int(os.getenv("DART_API_BATCH_MAX_ITEMS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("DART_API_BATCH_CONCURRENCY", "8"))
+
 # 검색 엔진 인스턴스 생성
 search_engine = DartSearchEngine()
 
-class QueryRequest(BaseModel):
+class RawDataOptions(BaseModel):
+    """raw_data 응답 옵션 (기본값은 기존과 같이 전체 포함)"""
+    include_raw_data: bool = True  # False면 raw_data 생략
+    sections: Optional[List[str]] = None  # 포함할 API 섹션 (예: ["api_02", "api_08"]), None이면 전체
+    page: int = Field(1, ge=1)  # page_size 사용 시 섹션(표)별 페이지
+    page_size: Optional[int] = Field(None, ge=1)  # 섹션별 행 수, None이면 전체 행
+
+class QueryRequest(RawDataOptions):
     query: str
 
 class ModeAnalysisRequest(BaseModel):
@@ -32,7 +123,7 @@ class ModeAnalysisRequest(BaseModel):
 class CompanyRequest(BaseModel):
     company_name: str
 
-class CompanyDataRequest(BaseModel):
+class CompanyDataRequest(RawDataOptions):
     company_name: str
     year: int
     quarter: int
@@ -42,13 +133,16 @@ class SummaryResponse(BaseModel):
     extracted_info: dict = None
     company_name: str = None
     success: bool = True
+    cached: bool = False
     raw_data: dict = None
+    raw_data_pages: dict = None  # page_size 사용 시 섹션별 {"total", "page", "page_size", "pages"}
 
 class SearchResponse(BaseModel):
     extracted_info: dict = None
     company_name: str = None
     success: bool = True
     raw_data: dict = None
+    raw_data_pages: dict = None
 
 class QuarterlyReportsResponse(BaseModel):
     company_name: str = None
@@ -61,8 +155,105 @@ class CompanyDataResponse(BaseModel):
     year: int = None
     quarter: int = None
     raw_data: dict = None
+    raw_data_pages: dict = None
     success: bool = True
 
+class BatchItem(BaseModel):
+    """배치 항목: query(/search_only) 또는 company_name + year + quarter(/company_data) 중 하나"""
+    query: Optional[str] = None
+    company_name: Optional[str] = None
+    year: Optional[int] = None
+    quarter: Optional[int] = None
+
+class BatchRequest(RawDataOptions):
+    items: List[BatchItem]  # raw_data 옵션은 모든 항목에 적용
+
+class BatchResponse(BaseModel):
+    results: list  # 요청 순서대로 항목별 결과 (실패 항목은 success=False, status_code, error)
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    deduplicated: int = 0  # 같은 항목이라 한 번만 처리한 수
+    success: bool = True
+
+# 프록시(nginx 등)가 이벤트를 모아서 보내지 않도록
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def format_sse(event: str, data) -> str:
+    """Server-Sent Events 한 건 (data는 JSON 한 줄)"""
+    payload = orjson.dumps(data).decode("utf-8") if orjson is not None else json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """스트림이 어떻게 끝나든(완료, 오류, 클라이언트 연결 끊김) 수용 슬롯을 반납하는 StreamingResponse"""
+
+    def __init__(self, *args, ticket=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.ticket is not None:
+                self.ticket.release()
+
+def sse_response(events, ticket=None) -> StreamingResponse:
+    """{"event", "data"} 비동기 이벤트 이터레이터를 text/event-stream 응답으로 (ticket은 스트림 종료 시 반납)"""
+    async def stream():
+        try:
+            async for event in events:
+                yield format_sse(event["event"], event["data"])
+        except Exception as e:
+            yield format_sse("error", {"message": f"서버 오류가 발생했습니다: {str(e)}"})
+    return AdmittedStreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS, ticket=ticket)
+
+def page_table(table, start: int, size: int):
+    """(표의 start부터 size행, 전체 행 수) - 행 리스트(원본) 또는 마크다운 표 문자열(후처리), 표가 아니면 (그대로, None)"""
+    if isinstance(table, list):
+        return table[start:start + size], len(table)
+    if isinstance(table, str):
+        lines = table.split("\n")
+        separator = next((i for i, line in enumerate(lines) if line.startswith("| ---")), None)
+        if separator is not None:
+            rows = lines[separator + 1:]
+            return "\n".join(lines[:separator + 1] + rows[start:start + size]), len(rows)
+    return table, None
+
+def raw_data_sections(options: RawDataOptions) -> Optional[List[str]]:
+    """엔진이 로드할 섹션 (raw_data 제외면 없음, sections 지정 시 그 섹션만, None이면 전체)"""
+    if not options.include_raw_data:
+        return []
+    return options.sections
+
+def shape_raw_data(raw_data: Optional[dict], options: RawDataOptions) -> Tuple[Optional[dict], Optional[dict]]:
+    """(요청 옵션대로 줄인 raw_data, 섹션별 페이지 정보) - 캐시된 원본은 수정하지 않고 필요한 부분만 새로 만듦"""
+    if raw_data is None or not options.include_raw_data:
+        return None, None
+    api_data = raw_data.get("api_data")
+    if not isinstance(api_data, dict) or (options.sections is None and options.page_size is None):
+        return raw_data, None
+
+    if options.sections is not None:
+        api_data = {key: table for key, table in api_data.items() if key in options.sections}
+
+    pages = None
+    if options.page_size is not None:
+        start = (options.page - 1) * options.page_size
+        pages, paged = {}, {}
+        for key, table in api_data.items():
+            paged[key], total = page_table(table, start, options.page_size)
+            if total is not None:
+                pages[key] = {
+                    "total": total,
+                    "page": options.page,
+                    "page_size": options.page_size,
+                    "pages": math.ceil(total / options.page_size)
+                }
+        api_data = paged
+
+    return {**raw_data, "api_data": api_data}, pages
+
 @app.post("/summarize", response_model=SummaryResponse)
 async def summarize_disclosure(request: QueryRequest):
     """사용자 질문을 받아 DART 공시 요약을 반환
@@ -77,27 +268,63 @@ async def summarize_disclosure(request: QueryRequest):
         print(f"[API] 에러: 빈 질문")
         raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
 
-    try:
-        print(f"[API] search_engine.search_and_summarize 호출 시작")
-        result = search_engine.search_and_summarize(request.query)
+    async with summarize_lane.admit():
+        try:
+            print(f"[API] search_engine.asearch_and_summarize 호출 시작")
+            result = await search_engine.asearch_and_summarize(request.query, raw_data_sections(request))
+
+            if result.get("error"):
+                # 요약 LLM 실패(게이트웨이 재시도 후)는 done 결과의 success=False로 옴 → 502, 정보 추출/파일 검색 실패는 404
+                status_code = 502 if result.get("success") is False else 404
+                raise HTTPException(status_code=status_code, detail=result["error"])
+
+            # 사용자가 모드를 고르기 전에 초보/애널리스트 분석을 백그라운드에서 시작
+            search_engine.prefetch_mode_analyses(request.query, result["summary"], failed=not result.get("success", True))
+
+            raw_data, raw_data_pages = shape_raw_data(result.get("raw_data"), request)
+            response_data = {
+                "summary": result["summary"],
+                "extracted_info": result.get("extracted_info"),
+                "company_name": result.get("company_name"),
+                "success": True,
+                "cached": result.get("cached", False),  # 요약 캐시 사용 여부
+                "raw_data": raw_data,  # 기본은 원본 데이터 전체 (include_raw_data/sections/page_size로 축소)
+                "raw_data_pages": raw_data_pages
+            }
+
+            # 큰 raw_data를 response_model로 다시 검증/변환하지 않고 바로 인코딩
+            return JSON_RESPONSE_CLASS(response_data)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+
+@app.post("/summarize/stream")
+async def summarize_disclosure_stream(request: QueryRequest):
+    """/summarize의 SSE 버전: info → file → summary_token... → done (실패 시 error)
 
-        if result.get("error"):
-            raise HTTPException(status_code=404, detail=result["error"])
+    Args:
+        request: 질문 요청
+    """
+    print(f"[API] POST /summarize/stream 요청 받음")
+    print(f"[API] 질문: '{request.query}'")
 
-        response_data = {
-            "summary": result["summary"],
-            "extracted_info": result.get("extracted_info"),
-            "company_name": result.get("company_name"),
-            "success": True,
-            "raw_data": result.get("raw_data")  # 항상 원본 데이터 포함
-        }
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
 
-        return response_data
+    async def events():
+        async for event in search_engine.astream_search_and_summarize(request.query, raw_data_sections(request)):
+            if event["event"] == "done":
+                # 사용자가 모드를 고르기 전에 초보/애널리스트 분석을 백그라운드에서 시작
+                search_engine.prefetch_mode_analyses(request.query, event["data"]["summary"],
+                                                     failed=not event["data"].get("success", True))
+                raw_data, raw_data_pages = shape_raw_data(event["data"].get("raw_data"), request)
+                event = {"event": "done", "data": {**event["data"], "raw_data": raw_data, "raw_data_pages": raw_data_pages}}
+            yield event
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+    ticket = await summarize_lane.enter()
+    return sse_response(events(), ticket)
 
 @app.post("/search_only", response_model=SearchResponse)
 async def search_disclosure(request: QueryRequest):
@@ -113,30 +340,33 @@ async def search_disclosure(request: QueryRequest):
         print(f"[API] 에러: 빈 질문")
         raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
 
-    try:
-        print(f"[API] search_engine.search_only 호출 시작")
-        result = search_engine.search_only(request.query)
+    async with summarize_lane.admit():
+        try:
+            print(f"[API] search_engine.asearch_only 호출 시작")
+            result = await search_engine.asearch_only(request.query, raw_data_sections(request))
 
-        if result.get("error"):
-            raise HTTPException(status_code=404, detail=result["error"])
+            if result.get("error"):
+                raise HTTPException(status_code=404, detail=result["error"])
 
-        response_data = {
-            "extracted_info": result.get("extracted_info"),
-            "company_name": result.get("company_name"),
-            "success": True,
-            "raw_data": result.get("raw_data")
-        }
+            raw_data, raw_data_pages = shape_raw_data(result.get("raw_data"), request)
+            response_data = {
+                "extracted_info": result.get("extracted_info"),
+                "company_name": result.get("company_name"),
+                "success": True,
+                "raw_data": raw_data,
+                "raw_data_pages": raw_data_pages
+            }
 
-        return response_data
+            return JSON_RESPONSE_CLASS(response_data)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
 
 @app.post("/analyze_mode")
 async def analyze_mode(request: ModeAnalysisRequest):
-    """모드별 추가 분석 (초보자/애널리스트)"""
+    """모드별 추가 분석 (초보자/애널리스트, /summarize 후 미리 생성된 분석이 있으면 재사용)"""
     print(f"[API] POST /analyze_mode 요청 받음")
     print(f"[API] 질문: '{request.query}', 모드: {request.mode}")
 
@@ -146,12 +376,35 @@ async def analyze_mode(request: ModeAnalysisRequest):
     if request.mode not in ['beginner', 'analyst']:
         raise HTTPException(status_code=400, detail="모드는 'beginner' 또는 'analyst'여야 합니다.")
 
-    try:
-        analysis = search_engine.analyze_by_mode_with_summary(request.query, request.mode, request.summary)
-        return {"analysis": analysis, "success": True}
+    async with summarize_lane.admit():
+        try:
+            analysis = await search_engine.aanalyze_by_mode_with_summary(request.query, request.mode, request.summary)
+            return {"analysis": analysis, "success": True}
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/analyze_mode/stream")
+async def analyze_mode_stream(request: ModeAnalysisRequest):
+    """/analyze_mode의 SSE 버전: analysis_token... → done"""
+    print(f"[API] POST /analyze_mode/stream 요청 받음")
+    print(f"[API] 질문: '{request.query}', 모드: {request.mode}")
+
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
+
+    if request.mode not in ['beginner', 'analyst']:
+        raise HTTPException(status_code=400, detail="모드는 'beginner' 또는 'analyst'여야 합니다.")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+    async def events():
+        chunks = []
+        async for chunk in search_engine.astream_analysis_by_mode(request.query, request.mode, request.summary):
+            chunks.append(chunk)
+            yield {"event": "analysis_token", "data": {"text": chunk}}
+        yield {"event": "done", "data": {"analysis": "".join(chunks), "success": True}}
+
+    ticket = await summarize_lane.enter()
+    return sse_response(events(), ticket)
 
 @app.post("/company_reports", response_model=QuarterlyReportsResponse)
 async def get_company_reports(request: CompanyRequest):
@@ -167,26 +420,27 @@ async def get_company_reports(request: CompanyRequest):
         print(f"[API] 에러: 빈 회사명")
         raise HTTPException(status_code=400, detail="회사명을 입력해주세요.")
 
-    try:
-        print(f"[API] search_engine.get_company_quarterly_reports 호출 시작")
-        result = search_engine.get_company_quarterly_reports(request.company_name)
+    async with company_lane.admit():
+        try:
+            print(f"[API] search_engine.get_company_quarterly_reports 호출 시작 (company lane)")
+            result = await company_lane.run(search_engine.get_company_quarterly_reports, request.company_name)
 
-        if result.get("error"):
-            raise HTTPException(status_code=404, detail=result["error"])
+            if result.get("error"):
+                raise HTTPException(status_code=404, detail=result["error"])
 
-        response_data = {
-            "company_name": result["company_name"],
-            "available_reports": result["available_reports"],
-            "total_count": result["total_count"],
-            "success": True
-        }
+            response_data = {
+                "company_name": result["company_name"],
+                "available_reports": result["available_reports"],
+                "total_count": result["total_count"],
+                "success": True
+            }
 
-        return response_data
+            return response_data
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
 
 @app.post("/company_data", response_model=CompanyDataResponse)
 async def get_company_data(request: CompanyDataRequest):
@@ -205,33 +459,152 @@ async def get_company_data(request: CompanyDataRequest):
     if request.quarter not in [1, 2, 3, 4]:
         raise HTTPException(status_code=400, detail="분기는 1, 2, 3, 4 중 하나여야 합니다.")
 
-    try:
-        print(f"[API] search_engine.get_company_data 호출 시작")
-        result = search_engine.get_company_data(request.company_name, request.year, request.quarter)
-
+    async with company_lane.admit():
+        try:
+            print(f"[API] search_engine.get_company_data 호출 시작 (company lane)")
+            result = await company_lane.run(search_engine.get_company_data, request.company_name, request.year, request.quarter)
+
+            if result.get("error"):
+                raise HTTPException(status_code=404, detail=result["error"])
+
+            raw_data, raw_data_pages = shape_raw_data(result["raw_data"], request)
+            response_data = {
+                "company_name": result["company_name"],
+                "year": result["year"],
+                "quarter": result["quarter"],
+                "raw_data": raw_data,
+                "raw_data_pages": raw_data_pages,
+                "success": True
+            }
+
+            return JSON_RESPONSE_CLASS(response_data)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+
+def batch_item_key(item: BatchItem) -> Tuple:
+    """같은 결과를 낼 항목끼리 같은 키 (질문은 정규화, 회사는 이름/연도/분기)"""
+    if item.query is not None:
+        return ("query", normalize_query(item.query))
+    return ("company", (item.company_name or "").strip(), item.year, item.quarter)
+
+async def run_batch_item(item: BatchItem, options: RawDataOptions) -> dict:
+    """배치 항목 하나를 /search_only 또는 /company_data와 같이 처리 (실패는 HTTPException/AdmissionRejected)"""
+    if item.query is not None:
+        if item.company_name is not None:
+            raise HTTPException(status_code=400, detail="query와 company_name 중 하나만 입력해주세요.")
+        if not item.query.strip():
+            raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
+
+        async with summarize_lane.admit():
+            result = await search_engine.asearch_only(item.query, raw_data_sections(options))
         if result.get("error"):
             raise HTTPException(status_code=404, detail=result["error"])
 
-        response_data = {
-            "company_name": result["company_name"],
-            "year": result["year"],
-            "quarter": result["quarter"],
-            "raw_data": result["raw_data"],
-            "success": True
+        raw_data, raw_data_pages = shape_raw_data(result.get("raw_data"), options)
+        return {
+            "type": "query",
+            "extracted_info": result.get("extracted_info"),
+            "company_name": result.get("company_name"),
+            "raw_data": raw_data,
+            "raw_data_pages": raw_data_pages
         }
 
-        return response_data
+    if not (item.company_name or "").strip():
+        raise HTTPException(status_code=400, detail="질문 또는 회사명을 입력해주세요.")
+    if item.year is None:
+        raise HTTPException(status_code=400, detail="연도를 입력해주세요.")
+    if item.quarter not in [1, 2, 3, 4]:
+        raise HTTPException(status_code=400, detail="분기는 1, 2, 3, 4 중 하나여야 합니다.")
+
+    async with company_lane.admit():
+        result = await company_lane.run(search_engine.get_company_data, item.company_name, item.year, item.quarter)
+    if result.get("error"):
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    raw_data, raw_data_pages = shape_raw_data(result["raw_data"], options)
+    return {
+        "type": "company",
+        "company_name": result["company_name"],
+        "year": result["year"],
+        "quarter": result["quarter"],
+        "raw_data": raw_data,
+        "raw_data_pages": raw_data_pages
+    }
+
+@app.post("/batch", response_model=BatchResponse)
+async def batch_search(request: BatchRequest):
+    """여러 질문/회사 데이터 조회를 한 번에 처리 (요청 순서대로 결과, 실패한 항목만 항목별 에러)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다: {str(e)}")
+    Args:
+        request: 배치 항목 목록 + raw_data 옵션
+    """
+    print(f"[API] POST /batch 요청 받음")
+    print(f"[API] 항목 수: {len(request.items)}")
+
+    if not request.items:
+        raise HTTPException(status_code=400, detail="항목을 하나 이상 입력해주세요.")
+
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"항목은 최대 {BATCH_MAX_ITEMS}개까지 요청할 수 있습니다.")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(item: BatchItem) -> dict:
+        async with semaphore:
+            try:
+                return {"success": True, **await run_batch_item(item, request)}
+            except HTTPException as e:
+                return {"success": False, "status_code": e.status_code, "error": e.detail}
+            except AdmissionRejected as e:
+                return {"success": False, "status_code": e.status_code, "error": str(e), "retry_after": e.retry_after}
+            except Exception as e:
+                return {"success": False, "status_code": 500, "error": f"서버 오류가 발생했습니다: {str(e)}"}
+
+    # 같은 항목은 한 번만 처리하고 결과를 나눠 씀
+    tasks = {}
+    for item in request.items:
+        key = batch_item_key(item)
+        if key not in tasks:
+            tasks[key] = asyncio.ensure_future(run(item))
+    await asyncio.gather(*tasks.values())
+
+    results = [{"index": index, **tasks[batch_item_key(item)].result()} for index, item in enumerate(request.items)]
+    succeeded = sum(1 for result in results if result["success"])
+    print(f"[API] /batch 완료: 성공 {succeeded}/{len(results)}, 중복 {len(results) - len(tasks)}")
+
+    response_data = {
+        "results": results,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "deduplicated": len(results) - len(tasks),
+        "success": True
+    }
+
+    return JSON_RESPONSE_CLASS(response_data)
 
 @app.get("/health")
 async def health_check():
     """서버 상태 확인"""
     return {"status": "healthy", "message": "DART 공시 AI 요약 서비스가 정상 작동 중입니다."}
 
+@app.get("/stats")
+async def cache_stats():
+    """캐시 적중/미스, 추측/분석 프리페치 적중률, 모델별 LLM 호출, 요청 수용, 중복 요청 합치기 통계 조회"""
+    return {
+        "disclosure_cache": search_engine.disclosure_cache.stats(),
+        "query_cache": search_engine.query_cache.stats(),
+        "summary_cache": search_engine.summary_cache.stats(),
+        "prefetch": search_engine.prefetcher.stats(),
+        "analysis_prefetch": search_engine.analysis_prefetcher.stats(),
+        "admission": {"summarize": summarize_lane.stats(), "company": company_lane.stats()},
+        "single_flight": {"parse": search_engine.parse_flight.stats(), "summary": search_engine.summary_flight.stats()},
+        "llm": llm_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=6000)
@@ -1,12 +1,6 @@
 # -*- coding: utf-8 -*-
 from dotenv import load_dotenv
 load_dotenv('.env')
-from langchain_naver import ChatClovaX
-
-llm = ChatClovaX(
-    model = "HCX-005",
-    temperature=0.1
-)
 
 import sys
 import os
@@ -17,6 +11,9 @@ from pydantic import BaseModel
 # 상위 디렉토리의 search_engine을 import하기 위해 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from search_engine import DartSearchEngine
+from llm_gateway import get_chat_model
+
+llm = get_chat_model("clova", "HCX-005", temperature=0.1)
 
 # 검색 엔진 인스턴스 생성
 search_engine = DartSearchEngine()
@@ -31,6 +28,7 @@ class SummarizeState(BaseModel):
     company_name: Optional[str] = None
     error: Optional[str] = None
     success: bool = False
+    cached: bool = False
     raw_data: Optional[Dict] = None
     need_finagent: bool = False
     finagent_result: Optional[str] = None
@@ -62,6 +60,7 @@ def summarize_node(state: SummarizeState) -> Dict[str, Any]:
                 "extracted_info": result.get("extracted_info"),
                 "company_name": result.get("company_name"),
                 "success": True,
+                "cached": result.get("cached", False),
                 "raw_data": result.get("raw_data")
             }
     except Exception as e:
@@ -194,6 +193,7 @@ def merge_parallel_results_node(state: SummarizeState) -> Dict[str, Any]:
         "extracted_info": state.extracted_info,
         "company_name": state.company_name,
         "success": state.success,
+        "cached": state.cached,
         "error": state.error,
         "need_finagent": state.need_finagent
     }
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+분기 전체 회사 요약 사전 생성 (오프라인 배치)
+- 최신 분기(기본)의 모든 회사 공시로 기본 요약("overview" 의도)을 생성해 요약 캐시에 저장
+- 라이브 API의 /summarize는 같은 캐시 키(원본 해시, 프롬프트 버전, 질문 의도)로 조회하므로
+  "OO 실적 알려줘" 같은 일반 질문은 LLM 없이 응답
+- 워커 수 제한(--workers) + 요약 LLM 분당 호출 제한(--rpm, 게이트웨이의 요약 모델 토큰 버킷)
+- 진행상황은 수집기와 같은 형식으로 {분기}/presummarize_progress.json에 저장 (중단 후 재실행 시 이어서)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dart_agent", "pub_agent", "utils"))
+from rate_limiter import get_rate_limiter
+
+import search_engine
+from search_engine import DartSearchEngine, SUMMARY_PROMPT_VERSION, SUMMARY_MODEL
+
+# 질문 의도가 "overview"가 되는 기본 질문 (summary_intent 기준)
+DEFAULT_QUERY = "{company_name} {year}년 {quarter}분기 실적 요약"
+
+
+class PresummarizeJob:
+    def __init__(self, engine: DartSearchEngine, year: int, quarter: int, query_template: str = DEFAULT_QUERY):
+        self.engine = engine
+        self.year = year
+        self.quarter = quarter
+        self.query_template = query_template
+        self.quarter_dir = os.path.join(search_engine.BASE_DATA_PATH, str(year), f"Q{quarter}")
+        self.progress_file = os.path.join(self.quarter_dir, "presummarize_progress.json")
+        # 프롬프트/컨텍스트 설정이 바뀌면 이전 진행상황은 무효
+        self.cache_version = f"{SUMMARY_PROMPT_VERSION}-{engine.context_builder.version}"
+        self._lock = threading.Lock()
+
+    def load_progress(self, reset: bool = False):
+        """진행상황 로드 (캐시 버전이 다르면 새로 시작)"""
+        if not reset and os.path.exists(self.progress_file):
+            try:
+                with open(self.progress_file, 'r', encoding='utf-8') as f:
+                    progress = json.load(f)
+                if progress.get('cache_version') == self.cache_version:
+                    return progress
+                print(f"⚠️ 요약 버전 변경 ({progress.get('cache_version')} → {self.cache_version}), 처음부터 진행")
+            except (OSError, ValueError):
+                pass
+
+        return {
+            'started_at': datetime.now().isoformat(),
+            'cache_version': self.cache_version,
+            'total': 0, 'completed': 0, 'generated': 0, 'cached': 0, 'failed': 0,
+            'completed_companies': [], 'failed_companies': []
+        }
+
+    def save_progress(self, progress):
+        """진행상황 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            progress['updated_at'] = datetime.now().isoformat()
+            tmp_path = f"{self.progress_file}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(progress, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.progress_file)
+            except OSError as e:
+                print(f"⚠️ 진행상황 저장 실패: {e}")
+
+    def company_key(self, entry):
+        return entry.get("corp_code") or entry["filename"]
+
+    def summarize_company(self, entry):
+        """한 회사 요약 생성 → {"cached": bool, ...} (실패 시 예외)"""
+        info = {"company_name": entry["company_name"], "year": self.year, "quarter": self.quarter}
+        query = self.query_template.format(**info)
+        return self.engine.presummarize(entry["file_path"], info, query)
+
+    def run(self, workers: int = 4, rpm: float = 30, start_index: int = 0, end_index=None, reset: bool = False):
+        entries = self.engine.corpus_index.entries(self.year, self.quarter)
+        if not entries:
+            print(f"❌ {self.year}년 {self.quarter}분기 데이터가 없습니다.")
+            return
+
+        entries_to_process = entries[start_index:end_index]
+        progress = self.load_progress(reset)
+        progress['total'] = len(entries_to_process)
+        done = set(progress['completed_companies'])
+        pending = [entry for entry in entries_to_process if self.company_key(entry) not in done]
+
+        # 게이트웨이가 쓰는 요약 모델 버킷 (main()에서 엔진 생성 전에 --rpm으로 만들어 둠)
+        rate_limiter = get_rate_limiter(SUMMARY_MODEL, rpm)
+        print(f"🚀 요약 사전 생성 시작 ({self.year} Q{self.quarter}, 버전 {self.cache_version})")
+        print(f"📊 처리대상: {len(entries_to_process):,}개 | 완료: {len(done):,}개 | 남은 회사: {len(pending):,}개 | "
+              f"워커 {workers}개, {SUMMARY_MODEL} 분당 {rate_limiter.rate:g}회")
+
+        start_time = time.time()
+        finished = 0
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = {pool.submit(self.summarize_company, entry): entry for entry in pending}
+        try:
+            for future in as_completed(futures):
+                entry = futures[future]
+                key = self.company_key(entry)
+                try:
+                    result = future.result()
+                    with self._lock:
+                        progress['completed_companies'].append(key)
+                        if key in progress['failed_companies']:
+                            progress['failed_companies'].remove(key)
+                        progress['cached' if result["cached"] else 'generated'] += 1
+                except Exception as e:
+                    print(f"   ❌ {entry['company_name']}: {e}")
+                    with self._lock:
+                        if key not in progress['failed_companies']:
+                            progress['failed_companies'].append(key)
+                        progress['failed'] += 1
+
+                finished += 1
+                if finished % 10 == 0 or finished == len(pending):
+                    progress['completed'] = len(progress['completed_companies'])
+                    self.save_progress(progress)
+                    elapsed = time.time() - start_time
+                    rate_per_min = finished / (elapsed / 60) if elapsed > 0 else 0
+                    print(f"진행률: {progress['completed'] / progress['total'] * 100:5.1f}% "
+                          f"({progress['completed']:4d}/{progress['total']}) | 생성 {progress['generated']} / "
+                          f"캐시 {progress['cached']} / 실패 {progress['failed']} | 속도: {rate_per_min:.1f}개/분")
+        except KeyboardInterrupt:
+            print("\n⚠️ 사용자 중단 (진행 중인 요청은 버림)")
+            pool.shutdown(wait=False, cancel_futures=True)
+            progress['completed'] = len(progress['completed_companies'])
+            self.save_progress(progress)
+            return
+        pool.shutdown()
+
+        progress['completed'] = len(progress['completed_companies'])
+        self.save_progress(progress)
+        total_time = time.time() - start_time
+        print(f"\n🎯 완료! 소요시간: {total_time / 60:.1f}분")
+        print(f"생성: {progress['generated']}개, 캐시 적중: {progress['cached']}개, 실패: {len(progress['failed_companies'])}개 "
+              f"(실패한 회사는 다시 실행하면 재시도)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='분기 전체 회사 요약 사전 생성')
+    parser.add_argument('--data', help='DART 데이터 디렉토리 (기본: search_engine.BASE_DATA_PATH)')
+    parser.add_argument('--year', type=int, help='연도 (미지정 시 최신 분기)')
+    parser.add_argument('--quarter', type=int, choices=[1, 2, 3, 4], help='분기 (미지정 시 최신 분기)')
+    parser.add_argument('--workers', type=int, default=4, help='동시 요약 수')
+    parser.add_argument('--rpm', type=float, default=30, help='요약 LLM 분당 최대 호출 수')
+    parser.add_argument('--start-index', type=int, default=0, help='처리 시작 인덱스')
+    parser.add_argument('--end-index', type=int, default=None, help='처리 종료 인덱스 (미지정 시 끝까지)')
+    parser.add_argument('--query', default=DEFAULT_QUERY, help='요약 질문 템플릿 ({company_name}, {year}, {quarter})')
+    parser.add_argument('--reset', action='store_true', help='진행상황 무시하고 처음부터 (캐시된 요약은 재사용)')
+
+    args = parser.parse_args()
+
+    if args.data:
+        search_engine.BASE_DATA_PATH = os.path.abspath(args.data)
+    # 요약 모델 버킷은 처음 만들 때의 속도로 고정되므로 엔진(게이트웨이)보다 먼저 생성
+    get_rate_limiter(SUMMARY_MODEL, args.rpm)
+    engine = DartSearchEngine()
+
+    year, quarter = args.year, args.quarter
+    if year is None or quarter is None:
+        quarters = engine.corpus_index.quarters()
+        if not quarters:
+            print("❌ 인덱싱된 분기가 없습니다.")
+            return
+        year, quarter = quarters[-1]
+
+    job = PresummarizeJob(engine, year, quarter, args.query)
+    job.run(workers=args.workers, rpm=args.rpm, start_index=args.start_index,
+            end_index=args.end_index, reset=args.reset)
+
+
+if __name__ == "__main__":
+    main()
+
+
+"""
+nohup python batch_presummarize.py --workers 8 --rpm 60 > log_presummarize.txt 2>&1 &
+"""
@@ -1,6 +1,7 @@
 import requests
-from flask import Flask, render_template, request, session
+from flask import Flask, render_template, request, session, Response, stream_with_context
 import markdown
+import json
 import sys
 
 # Python print 버퍼링 비활성화
@@ -10,6 +11,9 @@ app = Flask(__name__)
 
 # 설정
 API_URL = "http://127.0.0.1:6000/summarize"
+API_STREAM_URL = "http://127.0.0.1:6000/summarize/stream"
+ANALYZE_STREAM_URL = "http://127.0.0.1:6000/analyze_mode/stream"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 def convert_raw_data_to_html(raw_data):
     """원본 데이터를 HTML 테이블로 변환"""
@@ -72,9 +76,57 @@ def dict_to_table(data_dict):
     html += "</tbody></table>"
     return html
 
+def format_sse(event, data):
+    """Server-Sent Events 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def iter_sse_events(response):
+    """API 서버의 SSE 응답을 (event, data dict)로 분해"""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+def proxy_sse(url, payload, timeout, render_done):
+    """API 서버 SSE를 그대로 전달하되 done 이벤트는 render_done으로 HTML 변환 후 전달"""
+    def generate():
+        try:
+            # (연결 타임아웃, 토큰 사이 최대 대기)
+            with requests.post(url, json=payload, stream=True, timeout=(5, timeout)) as response:
+                if response.status_code != 200:
+                    try:
+                        error_detail = response.json().get("detail", "알 수 없는 오류")
+                    except ValueError:
+                        error_detail = response.text
+                    yield format_sse("error", {"message": f"요청 처리 중 오류가 발생했습니다: {error_detail}"})
+                    return
+
+                for event, data in iter_sse_events(response):
+                    if event == "done":
+                        data = render_done(data)
+                    yield format_sse(event, data)
+
+        except requests.exceptions.Timeout:
+            yield format_sse("error", {"message": "요청 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."})
+        except requests.exceptions.ConnectionError:
+            yield format_sse("error", {"message": "API 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."})
+        except Exception as e:
+            yield format_sse("error", {"message": f"예상치 못한 오류가 발생했습니다: {str(e)}"})
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers=SSE_HEADERS)
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     summary = ""
+    raw_summary = ""
     error = ""
     query = ""
     raw_data = None
@@ -135,6 +187,7 @@ def index():
     return render_template(
         "index.html",
         summary=summary,
+        raw_summary=raw_summary,
         error=error,
         query=query,
         raw_data=raw_data,
@@ -178,6 +231,47 @@ def analyze_mode():
         print(f"[FRONTEND] 모드 분석 오류: {e}")
         return {"error": f"분석 중 오류가 발생했습니다: {str(e)}"}, 500
 
+@app.route("/summarize_stream", methods=["POST"])
+def summarize_stream():
+    """요약 스트리밍 (API 서버 /summarize/stream 전달, 완료 시 마크다운/원본 데이터를 HTML로)"""
+    data = request.get_json(silent=True) or {}
+    query = data.get("query", "").strip()
+    if not query:
+        return {"error": "질문을 입력해주세요."}, 400
+
+    print(f"[FRONTEND] 스트리밍 요약 요청: {query}", flush=True)
+
+    def render_done(result):
+        return {
+            "summary": result.get("summary", ""),
+            "summary_html": markdown.markdown(result.get("summary", ""), extensions=['nl2br']),
+            "raw_data_html": convert_raw_data_to_html(result.get("raw_data")),
+            "company_name": result.get("company_name"),
+            "cached": result.get("cached", False)
+        }
+
+    return proxy_sse(API_STREAM_URL, {"query": query}, 120, render_done)
+
+@app.route("/analyze_mode_stream", methods=["POST"])
+def analyze_mode_stream():
+    """모드별 분석 스트리밍 (API 서버 /analyze_mode/stream 전달)"""
+    data = request.get_json(silent=True) or {}
+    query = data.get('query', '').strip()
+    mode = data.get('mode', '')
+
+    if not query:
+        return {"error": "질문을 입력해주세요."}, 400
+
+    if mode not in ['beginner', 'analyst']:
+        return {"error": "올바른 모드를 선택해주세요."}, 400
+
+    print(f"[FRONTEND] 스트리밍 모드 분석 요청: {mode}, 질문: {query}", flush=True)
+
+    def render_done(result):
+        return {"analysis_html": markdown.markdown(result.get("analysis", ""), extensions=['nl2br'])}
+
+    return proxy_sse(ANALYZE_STREAM_URL, {"query": query, "mode": mode, "summary": data.get('summary', '')}, 60, render_done)
+
 @app.errorhandler(404)
 def not_found(error):
     return render_template("index.html", error="페이지를 찾을 수 없습니다."), 404
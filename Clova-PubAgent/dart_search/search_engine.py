@@ -4,15 +4,29 @@ DART 공시 검색 엔진 - 핵심 로직
 """
 
 import os
+import sys
 import json
-from typing import Dict, Optional, List
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_naver import ChatClovaX
+import asyncio
+import hashlib
+from typing import Dict, Optional, List, Iterator, AsyncIterator, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from difflib import SequenceMatcher
 from dotenv import load_dotenv
+
+# pub_agent/utils의 공용 모듈(postprocess_regular, corpus_index 등)을 import하기 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dart_agent", "pub_agent", "utils"))
 from postprocess_regular import DartRegularPostprocessor
+from corpus_index import get_corpus_index
+from disclosure_cache import get_disclosure_cache
+from company_timeline import get_timeline_store, compare_quarters, format_comparison
+from query_parser import get_query_parser, FAST_PATH_MIN_CONFIDENCE
+from query_cache import get_query_cache, normalize_query
+from summary_cache import get_summary_cache, summary_key, summary_intent
+from context_builder import SummaryContextBuilder
+from speculative_prefetch import SpeculativePrefetcher, Speculation
+from llm_gateway import get_chat_model
+from analysis_prefetch import AnalysisPrefetcher
+from single_flight import SingleFlight
 
 # .env 파일 로드
 load_dotenv()
@@ -20,26 +34,164 @@ load_dotenv()
 # 설정 (하드코딩)
 BASE_DATA_PATH = "/home/sese/Insight-Agent/Clova-PubAgent/dart_api_data"
 
+# 요약 템플릿(매출/영업이익, 직원 수, 주요 투자)에 필요한 API 섹션
+# api_02: 배당에관한사항, api_08: 직원현황, api_12: 타법인출자현황 (None이면 전체 사용)
+SUMMARY_API_KEYS = ("api_02", "api_08", "api_12")
+
+# 요약 프롬프트/섹션 선택을 바꾸면 올릴 것 (이전 요약 캐시 무효화)
+SUMMARY_PROMPT_VERSION = 2
+SUMMARY_ERROR_MESSAGE = "요약 생성 중 오류가 발생했습니다"
+
+# LLM 모델 (동시 호출/분당 호출 제한, 재시도는 llm_gateway가 모델별로 공유)
+QUERY_PARSER_MODEL = "HCX-007"
+SUMMARY_MODEL = "gemini-2.5-pro"
+
 
 class DartSearchEngine:
     def __init__(self):
         # Clova HCX-007 for query parsing
-        self.query_parser_llm = ChatClovaX(
-            model="HCX-007",
-            temperature=0.1
-        )
+        self.query_parser_llm = get_chat_model("clova", QUERY_PARSER_MODEL, temperature=0.1)
 
         # Google Gemini for summary generation
-        self.summary_llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-pro",
+        self.summary_llm = get_chat_model(
+            "gemini", SUMMARY_MODEL,
             temperature=0.1,
             convert_system_message_to_human=True
         )
         
         self.postprocessor = DartRegularPostprocessor()
 
+        # 회사 → 파일 인덱스 (시작 시 한 번 구축, 디렉토리 mtime 변경 시 갱신)
+        self.corpus_index = get_corpus_index(BASE_DATA_PATH)
+
+        # 로드/후처리된 공시 캐시 (프로세스 전역 LRU, (경로, mtime) 기준)
+        self.disclosure_cache = get_disclosure_cache()
+
+        # 회사별 전 분기 타임라인 (전분기 대비 비교용)
+        self.timeline_store = get_timeline_store(BASE_DATA_PATH)
+
+        # 규칙 기반 질문 파서 (확신도가 높으면 LLM 호출 생략)
+        self.query_parser = get_query_parser(BASE_DATA_PATH)
+
+        # 질문 파싱 결과 캐시 (SQLite, 에이전트 노드와 공유)
+        self.query_cache = get_query_cache(BASE_DATA_PATH)
+
+        # 생성된 요약 캐시 (메모리 LRU + 디스크, 원본 해시/프롬프트 버전 기준)
+        self.summary_cache = get_summary_cache(BASE_DATA_PATH)
+
+        # 요약 컨텍스트 구성 (토큰 예산 DART_SUMMARY_TOKEN_BUDGET, 표당 최대 행 DART_SUMMARY_MAX_ROWS)
+        self.context_builder = SummaryContextBuilder(template_keys=SUMMARY_API_KEYS)
+
+        # LLM 파싱 동안 규칙 기반 추측으로 후보 공시 파일을 미리 로드/후처리 (DART_PREFETCH_CANDIDATES=0이면 끔)
+        self.prefetcher = SpeculativePrefetcher(self.load_disclosure_file)
+
+        # 요약이 나오면 초보/애널리스트 분석을 백그라운드에서 미리 생성 (DART_ANALYSIS_PREFETCH_WORKERS=0이면 끔)
+        self.analysis_prefetcher = AnalysisPrefetcher(self._analyze_by_mode)
+
+        # 동시에 들어온 같은 요청은 한 번만 계산 (LLM 파싱: 정규화한 질문, 요약: 요약 캐시 키)
+        self.parse_flight = SingleFlight("parse")
+        self.summary_flight = SingleFlight("summary")
+
     def extract_info_from_query(self, query: str) -> Optional[Dict]:
-        """사용자 질문에서 회사명, 연도, 분기 추출"""
+        """사용자 질문에서 회사명, 연도, 분기 추출 (캐시 → 규칙 기반 → LLM 순)"""
+        return self._extract_info_without_llm(query) or self._extract_info_with_llm(query)
+
+    async def aextract_info_from_query(self, query: str) -> Optional[Dict]:
+        """extract_info_from_query의 비동기 버전 (캐시 조회/저장은 스레드풀, LLM은 ainvoke)"""
+        return await asyncio.to_thread(self._extract_info_without_llm, query) or \
+            await self._aextract_info_with_llm(query)
+
+    def extract_info_speculatively(self, query: str) -> Tuple[Optional[Dict], Optional[Speculation]]:
+        """(info, speculation) - LLM 파싱이 필요하면 그동안 추측한 후보 파일을 미리 로드"""
+        info = self._extract_info_without_llm(query)
+        if info:
+            return info, None
+
+        speculation = self.start_prefetch(query)
+        info = self._extract_info_with_llm(query)
+        if not info:
+            self.prefetcher.abandon(speculation)
+        return info, speculation
+
+    async def aextract_info_speculatively(self, query: str) -> Tuple[Optional[Dict], Optional[Speculation]]:
+        """extract_info_speculatively의 비동기 버전"""
+        info = await asyncio.to_thread(self._extract_info_without_llm, query)
+        if info:
+            return info, None
+
+        speculation = self.start_prefetch(query)
+        info = await self._aextract_info_with_llm(query)
+        if not info:
+            self.prefetcher.abandon(speculation)
+        return info, speculation
+
+    def start_prefetch(self, query: str) -> Optional[Speculation]:
+        """규칙 기반 파서의 (확신도 낮은) 후보 회사/기간으로 공시 파일 로드 시작 (후보가 없으면 None)"""
+        if self.prefetcher.max_candidates <= 0:
+            return None
+        file_paths = []
+        for guess in self.query_parser.candidates(query, k=self.prefetcher.max_candidates):
+            entry, _ = self.corpus_index.find(guess["company_name"], guess["year"], guess["quarter"])
+            if entry:
+                file_paths.append(entry["file_path"])
+        speculation = self.prefetcher.start(file_paths)
+        if speculation:
+            print(f"[SEARCH_ENGINE] 추측 프리페치 시작: {[os.path.basename(path) for path in speculation.futures]}")
+        return speculation
+
+    def _extract_info_with_llm(self, query: str) -> Optional[Dict]:
+        """LLM 파싱 (같은 질문의 파싱이 진행 중이면 그 결과를 공유)"""
+        return self.parse_flight.do(normalize_query(query), lambda: self._parse_with_llm(query))
+
+    async def _aextract_info_with_llm(self, query: str) -> Optional[Dict]:
+        return await self.parse_flight.ado(normalize_query(query), lambda: self._aparse_with_llm(query))
+
+    def _parse_with_llm(self, query: str) -> Optional[Dict]:
+        chain, inputs = self._build_query_parse_chain(query)
+        try:
+            info = chain.invoke(inputs)
+            self._remember_parsed_info(query, info)
+            return info
+        except Exception as e:
+            print(f"정보 추출 중 오류 발생: {e}")
+            return None
+
+    async def _aparse_with_llm(self, query: str) -> Optional[Dict]:
+        chain, inputs = self._build_query_parse_chain(query)
+        try:
+            info = await chain.ainvoke(inputs)
+            await asyncio.to_thread(self._remember_parsed_info, query, info)
+            return info
+        except Exception as e:
+            print(f"정보 추출 중 오류 발생: {e}")
+            return None
+
+    def _extract_info_without_llm(self, query: str) -> Optional[Dict]:
+        """파싱 캐시 → 규칙 기반 파서 (둘 다 실패하면 None, LLM 호출 필요)"""
+        cached_info = self.query_cache.get(query)
+        if cached_info:
+            print(f"[SEARCH_ENGINE] 파싱 캐시 적중: {cached_info.get('company_name')} {cached_info.get('year')}년 {cached_info.get('quarter')}분기")
+            return cached_info
+
+        fast_info = self.query_parser.parse(query)
+        if fast_info["company_name"] and fast_info["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+            print(f"[SEARCH_ENGINE] 규칙 기반 파싱: {fast_info['company_name']} {fast_info['year']}년 {fast_info['quarter']}분기")
+            info = {
+                "company_name": fast_info["company_name"],
+                "year": fast_info["year"],
+                "quarter": fast_info["quarter"]
+            }
+            self.query_cache.put(query, info, source="rule")
+            return info
+        return None
+
+    def _remember_parsed_info(self, query: str, info):
+        """LLM 파싱 결과를 캐시 (회사명이 있는 경우만)"""
+        if isinstance(info, dict) and info.get("company_name"):
+            self.query_cache.put(query, info, source="llm")
+
+    def _build_query_parse_chain(self, query: str) -> Tuple:
+        """질문 파싱 체인과 입력값 (extract_info_from_query / aextract_info_from_query 공용)"""
         parser = JsonOutputParser()
 
         prompt = ChatPromptTemplate.from_template(
@@ -77,38 +229,33 @@ class DartSearchEngine:
 
         chain = prompt | self.query_parser_llm | parser
 
-        try:
-            info = chain.invoke({
-                "query": query,
-                "format_instructions": parser.get_format_instructions()
-            })
-            return info
-        except Exception as e:
-            print(f"정보 추출 중 오류 발생: {e}")
-            return None
+        return chain, {
+            "query": query,
+            "format_instructions": parser.get_format_instructions()
+        }
 
-    def find_similar_company_names(self, target_name: str, file_list: List[str]) -> List[str]:
-        """파일 리스트에서 유사한 회사명 찾기"""
-        candidates = []
+    def find_similar_company_names(self, target_name: str, year: int, quarter: int) -> List:
+        """분기 인덱스에서 유사한 회사명 찾기 (자모 trigram 퍼지 검색, 상위 5개)"""
+        return [
+            (entry["filename"], entry["company_name"], similarity)
+            for entry, similarity in self.corpus_index.fuzzy_find(target_name, year, quarter, k=5)
+        ]
+
+    def load_disclosure_file(self, file_path: str, api_keys: Optional[List[str]] = None) -> Dict:
+        """공시 파일 로드 및 후처리 (api_keys 지정 시 해당 섹션만 파싱)"""
+        if api_keys is None:
+            return self.disclosure_cache.load_processed(file_path)
+        return self.disclosure_cache.load_processed_sections(file_path, api_keys)
+
+    def find_and_load_disclosure(self, info: Dict, api_keys: Optional[List[str]] = None) -> Optional[Dict]:
+        """추출된 정보로 공시 파일 검색 및 로드 (api_keys 지정 시 해당 섹션만 로드)"""
+        file_path = self.find_disclosure_path(info)
+        if not file_path:
+            return None
+        return self.load_disclosure_file(file_path, api_keys)
 
-        for filename in file_list:
-            if filename.endswith('.json'):
-                # 파일명에서 회사명 부분 추출 (예: "000010_신한은행.json" -> "신한은행")
-                try:
-                    if '_' in filename:
-                        company_part = filename.split('_', 1)[1].replace('.json', '')
-                        similarity = SequenceMatcher(None, target_name, company_part).ratio()
-                        if similarity > 0.5:  # 50% 이상 유사도
-                            candidates.append((filename, company_part, similarity))
-                except:
-                    continue
-
-        # 유사도 순으로 정렬
-        candidates.sort(key=lambda x: x[2], reverse=True)
-        return candidates[:5]  # 상위 5개만 반환
-
-    def find_and_load_disclosure(self, info: Dict) -> Optional[Dict]:
-        """추출된 정보로 공시 파일 검색 및 로드"""
+    def find_disclosure_path(self, info: Dict) -> Optional[str]:
+        """추출된 정보로 공시 파일 경로 검색 (정확 → 부분 → 유사도 매칭 순)"""
         company_name = info.get("company_name")
         year = info.get("year")
         quarter = info.get("quarter")
@@ -117,62 +264,32 @@ class DartSearchEngine:
             print("파일 검색에 필요한 정보가 부족합니다.")
             return None
 
-        target_path = os.path.join(BASE_DATA_PATH, str(year), f"Q{quarter}", "companies")
-
-        if not os.path.exists(target_path):
-            print(f"경로를 찾을 수 없습니다: {target_path}")
+        if not self.corpus_index.has_quarter(year, quarter):
+            print(f"{year}년 {quarter}분기 데이터를 찾을 수 없습니다.")
             return None
 
         try:
-            file_list = os.listdir(target_path)
-
-            exact_match = None
-            partial_matches = []
-
-            for filename in file_list:
-                if filename.endswith('.json') and '_' in filename:
-                    if "카카오" in filename:
-                        print(filename)
-                    try:
-                        file_company_name = filename.split('_', 1)[1].replace('.json', '')
-                        # 정확히 일치하는 경우
-                        if company_name == file_company_name:
-                            exact_match = filename
-                            break
-                        # 부분 매칭 후보 저장 (바로 return하지 않음)
-                        elif company_name in file_company_name or file_company_name in company_name:
-                            partial_matches.append((filename, file_company_name))
-                    except:
-                        continue
-
-            # 정확 매칭 우선
-            if exact_match:
-                file_path = os.path.join(target_path, exact_match)
-                print(f"파일을 찾았습니다: {exact_match}")
-                result = self.postprocessor.process_file(file_path)
-                return result
-
-            # 부분 매칭이 여러 개 있으면 가장 짧은 이름 선택 (예: 카카오 vs 카카오뱅크 → 카카오 선택)
-            if partial_matches:
-                partial_matches.sort(key=lambda x: len(x[1]))  # 이름 길이 기준 정렬
-                best_match = partial_matches[0][0]
-                file_path = os.path.join(target_path, best_match)
-                print(f"부분 매칭 파일을 사용합니다: {best_match}")
-                result = self.postprocessor.process_file(file_path)
-                return result
+            entry, match_type = self.corpus_index.find(company_name, year, quarter)
+
+            # 정확 매칭 우선, 없으면 가장 짧은 이름의 부분 매칭 (예: 카카오 vs 카카오뱅크 → 카카오 선택)
+            if entry:
+                if match_type == "exact":
+                    print(f"파일을 찾았습니다: {entry['filename']}")
+                else:
+                    print(f"부분 매칭 파일을 사용합니다: {entry['filename']}")
+                return entry["file_path"]
 
             # 유사도 검색
-            similar_companies = self.find_similar_company_names(company_name, file_list)
+            similar_companies = self.find_similar_company_names(company_name, year, quarter)
             if similar_companies:
                 print(f"정확한 매칭을 찾지 못했습니다. 유사한 회사들:")
                 for filename, company_part, similarity in similar_companies:
                     print(f"  - {company_part} (유사도: {similarity:.2f})")
 
                 best_match = similar_companies[0][0]
-                file_path = os.path.join(target_path, best_match)
+                file_path = self.corpus_index.get_by_filename(best_match, year, quarter)["file_path"]
                 print(f"가장 유사한 파일을 사용합니다: {best_match}")
-                result = self.postprocessor.process_file(file_path)
-                return result
+                return file_path
 
             print(f"'{company_name}'와 유사한 회사를 찾지 못했습니다.")
             return None
@@ -182,20 +299,73 @@ class DartSearchEngine:
             return None
 
 
-    def generate_summary(self, data: Dict, query: str) -> str:
-        """공시 데이터 요약 생성"""
-        context = json.dumps(data, indent=2, ensure_ascii=False)
+    def get_quarter_comparison(self, data: Dict, year: int, quarter: int) -> str:
+        """요약 섹션의 전분기 대비 변동 표 (타임라인 기준, 이전 분기가 없으면 빈 문자열)"""
+        corp_code = data.get("metadata", {}).get("corp_code")
+        if not corp_code:
+            return ""
+
         try:
-            new_context = f"""# 메타데이터: {data.get("metadata", {})}\n\n\n# 데이터"""
-            for api_data in data.get("api_data", {}).values():
-                new_context += f"\n\n{api_data}"
+            timeline = self.timeline_store.get(corp_code)
+            if not timeline:
+                return ""
+            return format_comparison(compare_quarters(timeline, year, quarter, SUMMARY_API_KEYS))
+        except Exception as e:
+            print(f"[SEARCH_ENGINE] 전분기 비교 생성 실패: {e}")
+            return ""
 
-            context = new_context
+    def get_previous_quarter_stamp(self, data: Dict, year: int, quarter: int) -> Optional[List]:
+        """전분기 비교 대상 파일의 [연도, 분기, 파일명, mtime] (타임라인을 읽지 않음, 없으면 None)"""
+        corp_code = data.get("metadata", {}).get("corp_code")
+        if not corp_code:
+            return None
+
+        try:
+            return self.timeline_store.previous_stamp(corp_code, year, quarter)
+        except Exception as e:
+            print(f"[SEARCH_ENGINE] 이전 분기 확인 실패: {e}")
+            return None
+
+    def get_summary_cache_key(self, file_path: str, data: Dict, info: Dict, query: str) -> str:
+        """요약 캐시 키 (corp_code, 연도, 분기, 원본+이전 분기 파일 해시, 프롬프트 버전, 질문 의도)"""
+        metadata = data.get("metadata", {})
+        source_hash = self.disclosure_cache.source_sha256(file_path)
+        previous_stamp = self.get_previous_quarter_stamp(data, info.get("year"), info.get("quarter"))
+        if previous_stamp:
+            # 전분기 비교 표는 이전 분기 파일로 정해지므로 그 파일의 스탬프를 반영 (비교는 캐시 미스일 때만 계산)
+            source_hash = hashlib.sha256(f"{source_hash}\n{json.dumps(previous_stamp)}".encode("utf-8")).hexdigest()
+        return summary_key(
+            metadata.get("corp_code") or metadata.get("corp_name", ""),
+            info.get("year"),
+            info.get("quarter"),
+            source_hash,
+            f"{SUMMARY_PROMPT_VERSION}-{self.context_builder.version}",
+            summary_intent(query)
+        )
+
+    def load_summary_data(self, file_path: str, query: str) -> Dict:
+        """요약 컨텍스트용 원본 데이터 (요약 템플릿 + 질문 키워드 섹션만, 컨텍스트 빌더가 고를 수 있는 섹션)"""
+        api_keys = self.context_builder.section_keys(query)
+        if api_keys is None:
+            return self.disclosure_cache.load_raw(file_path)
+        return self.disclosure_cache.load_raw_sections(file_path, api_keys)
+
+    def _build_summary_chain(self, data: Dict, query: str, quarter_comparison: str = "") -> Tuple:
+        """요약 체인과 입력값 (generate_summary / stream_summary 공용)"""
+        try:
+            # 템플릿/질문 관련도 순으로 섹션을 넣되 토큰 예산 안에서 (원본 행 데이터면 빈 열 제거, 행 수 제한)
+            built = self.context_builder.build(data, query, quarter_comparison)
+            stats = built["stats"]
+            print(f"[SEARCH_ENGINE] 요약 컨텍스트: {stats['tokens_kept']}토큰 사용, {stats['tokens_removed']}토큰 제외 "
+                  f"(섹션 {len(stats['sections_kept'])}개, 예산 초과 {len(stats['sections_dropped'])}개, "
+                  f"생략 행 {stats['rows_dropped']}개, 빈 열 {stats['columns_dropped']}개)")
+            context = built["context"]
         except Exception as e:
             print(f"{type(data)} 컨텍스트 변환 중 오류 발생: {e}")
             import traceback
             traceback.print_exc()
             print(type(data))
+            context = json.dumps(data, indent=2, ensure_ascii=False)
 
         prompt_template = ChatPromptTemplate.from_template(
             """
@@ -242,20 +412,40 @@ class DartSearchEngine:
         year = year_quarter[0] if len(year_quarter) > 0 else "알 수 없음"
         quarter = year_quarter[1].replace('Q', '') if len(year_quarter) > 1 else "알 수 없음"
 
-        try:
-            response = chain.invoke({
-                "context": context,
-                "query": query,
-                "company_name": corp_name,
-                "year": year,
-                "quarter": quarter
-            })
-            return response
-        except Exception as e:
-            return f"요약 생성 중 오류가 발생했습니다: {e}"
+        return chain, {
+            "context": context,
+            "query": query,
+            "company_name": corp_name,
+            "year": year,
+            "quarter": quarter
+        }
 
-    def search_only(self, query: str) -> Dict:
-        """공시문서 검색만 수행 (요약 제외)"""
+    def generate_summary(self, data: Dict, query: str, quarter_comparison: str = "") -> str:
+        """공시 데이터 요약 생성 (quarter_comparison: 전분기 대비 변동 표, 오류는 게이트웨이 재시도 후 호출자에게 전달)"""
+        chain, inputs = self._build_summary_chain(data, query, quarter_comparison)
+        return chain.invoke(inputs)
+
+    async def agenerate_summary(self, data: Dict, query: str, quarter_comparison: str = "") -> str:
+        """generate_summary의 비동기 버전 (컨텍스트 구성은 스레드풀, LLM은 ainvoke)"""
+        chain, inputs = await asyncio.to_thread(self._build_summary_chain, data, query, quarter_comparison)
+        return await chain.ainvoke(inputs)
+
+    def stream_summary(self, data: Dict, query: str, quarter_comparison: str = "") -> Iterator[str]:
+        """공시 데이터 요약을 토큰 단위로 생성 (오류는 호출자에게 전달)"""
+        chain, inputs = self._build_summary_chain(data, query, quarter_comparison)
+        for chunk in chain.stream(inputs):
+            if chunk:
+                yield chunk
+
+    async def astream_summary(self, data: Dict, query: str, quarter_comparison: str = "") -> AsyncIterator[str]:
+        """stream_summary의 비동기 버전 (오류는 호출자에게 전달)"""
+        chain, inputs = await asyncio.to_thread(self._build_summary_chain, data, query, quarter_comparison)
+        async for chunk in chain.astream(inputs):
+            if chunk:
+                yield chunk
+
+    def search_only(self, query: str, api_keys: Optional[List[str]] = None) -> Dict:
+        """공시문서 검색만 수행 (요약 제외, api_keys 지정 시 해당 섹션만 로드)"""
         print("[SEARCH_ENGINE] 검색 시작")
 
         # 1. 정보 추출
@@ -269,8 +459,27 @@ class DartSearchEngine:
 
         # 2. 파일 검색 및 로드
         print("[SEARCH_ENGINE] 2단계: 공시 파일 검색 및 로드 중...")
-        data = self.find_and_load_disclosure(info)
-        
+        data = self.find_and_load_disclosure(info, api_keys)
+        return self._search_result(info, data)
+
+    async def asearch_only(self, query: str, api_keys: Optional[List[str]] = None) -> Dict:
+        """search_only의 비동기 버전"""
+        print("[SEARCH_ENGINE] 검색 시작")
+
+        print("[SEARCH_ENGINE] 1단계: 질문에서 정보 추출 중...")
+        info = await self.aextract_info_from_query(query)
+        if not info:
+            print("[SEARCH_ENGINE] 에러: 정보 추출 실패")
+            return {"error": "질문에서 정보를 추출할 수 없습니다."}
+
+        print(f"[SEARCH_ENGINE] 정보 추출 완료: {info}")
+
+        print("[SEARCH_ENGINE] 2단계: 공시 파일 검색 및 로드 중...")
+        data = await asyncio.to_thread(self.find_and_load_disclosure, info, api_keys)
+        return self._search_result(info, data)
+
+    def _search_result(self, info: Dict, data: Optional[Dict]) -> Dict:
+        """search_only 응답 (파일이 없으면 error)"""
         if not data:
             print(f"[SEARCH_ENGINE] 에러: 파일을 찾을 수 없음 - {info.get('company_name')}")
             return {"error": f"해당 회사({info.get('company_name')})의 공시 데이터를 찾을 수 없습니다."}
@@ -286,94 +495,286 @@ class DartSearchEngine:
 
         return result
 
-    def search_and_summarize(self, query: str) -> Dict:
-        """전체 검색 및 요약 프로세스"""
+    def search_and_summarize(self, query: str, api_keys: Optional[List[str]] = None) -> Dict:
+        """전체 검색 및 요약 프로세스 (api_keys: 응답 raw_data에 넣을 섹션, 지정 시 해당 섹션만 로드)
+
+        실패하면 error 포함 (요약 LLM 실패는 done 결과 그대로, success=False)
+        """
+        for event in self.stream_search_and_summarize(query, api_keys):
+            if event["event"] == "error":
+                return {"error": event["data"]["message"]}
+            if event["event"] == "done":
+                return event["data"]
+        return {"error": "요약 결과를 받지 못했습니다."}
+
+    async def asearch_and_summarize(self, query: str, api_keys: Optional[List[str]] = None) -> Dict:
+        """search_and_summarize의 비동기 버전"""
+        async for event in self.astream_search_and_summarize(query, api_keys):
+            if event["event"] == "error":
+                return {"error": event["data"]["message"]}
+            if event["event"] == "done":
+                return event["data"]
+        return {"error": "요약 결과를 받지 못했습니다."}
+
+    def locate_disclosure(self, info: Dict, speculation: Optional[Speculation] = None,
+                          api_keys: Optional[List[str]] = None) -> Tuple[Optional[str], Optional[Dict]]:
+        """(파일 경로, 후처리된 공시) - 파일이 없으면 (None, None)
+
+        speculation: start_prefetch 결과. 실제 파일이 추측과 같으면 미리 로드한 데이터를 사용
+        api_keys: 지정 시 해당 섹션만 로드 (빈 리스트면 메타데이터만)
+        """
+        file_path = self.find_disclosure_path(info)
+        hit, data = self.prefetcher.resolve(speculation, file_path)
+        if hit:
+            print("[SEARCH_ENGINE] 추측 프리페치 적중")
+        elif speculation is not None:
+            print("[SEARCH_ENGINE] 추측 프리페치 빗나감 (폐기)")
+        if data is None and file_path:
+            data = self.load_disclosure_file(file_path, api_keys)
+        return file_path, data
+
+    def prepare_summary(self, file_path: str, data: Dict, info: Dict, query: str) -> Tuple[str, Optional[Dict]]:
+        """(요약 캐시 키, 캐시 항목 또는 None) - 전분기 비교 표는 생성할 때 get_quarter_comparison으로"""
+        cache_key = self.get_summary_cache_key(file_path, data, info, query)
+        return cache_key, self.summary_cache.get(cache_key)
+
+    def presummarize(self, file_path: str, info: Dict, query: str) -> Dict:
+        """요약을 미리 생성해 요약 캐시에 저장 (배치용)
+
+        이미 캐시돼 있으면 LLM을 호출하지 않음. 호출 제한은 요약 모델의 게이트웨이 풀이 적용.
+        LLM 오류(재시도 후)는 캐시하지 않고 예외로 전달 (다음 실행에서 재시도)
+        """
+        # 캐시 키에는 메타데이터와 원본 해시만 필요 (섹션은 디코딩하지 않음)
+        data = self.disclosure_cache.load_raw_sections(file_path, [])
+        cache_key, cached_entry = self.prepare_summary(file_path, data, info, query)
+        company_name = data.get("metadata", {}).get("corp_name")
+        if cached_entry:
+            return {"company_name": company_name, "cache_key": cache_key, "cached": True}
+
+        quarter_comparison = self.get_quarter_comparison(data, info.get("year"), info.get("quarter"))
+        summary_data = self.load_summary_data(file_path, query)
+        chain, inputs = self._build_summary_chain(summary_data, query, quarter_comparison)
+        summary = chain.invoke(inputs)
+        self._remember_summary(cache_key, summary, company_name, info)
+        return {"company_name": company_name, "cache_key": cache_key, "cached": False}
+
+    def stream_search_and_summarize(self, query: str, api_keys: Optional[List[str]] = None) -> Iterator[Dict]:
+        """검색 및 요약 단계별 이벤트 생성
+
+        {"event": "info"} → {"event": "file"} → {"event": "summary_token"}... → {"event": "done"}
+        실패 시 {"event": "error", "data": {"message": ...}} 후 종료
+        요약 LLM이 (재시도 후) 실패하면 오류 메시지를 마지막 토큰으로 보내고 done의 success=False, error에 메시지
+        api_keys: done 이벤트 raw_data에 넣을 섹션 (None이면 전체, 빈 리스트면 메타데이터만 로드)
+        """
         print("[SEARCH_ENGINE] 검색 및 요약 시작")
 
         # 1. 정보 추출
         print("[SEARCH_ENGINE] 1단계: 질문에서 정보 추출 중...")
-        info = self.extract_info_from_query(query)
+        info, speculation = self.extract_info_speculatively(query)
         if not info:
             print("[SEARCH_ENGINE] 에러: 정보 추출 실패")
-            return {"error": "질문에서 정보를 추출할 수 없습니다."}
+            yield {"event": "error", "data": {"message": "질문에서 정보를 추출할 수 없습니다."}}
+            return
 
         print(f"[SEARCH_ENGINE] 정보 추출 완료: {info}")
+        yield {"event": "info", "data": info}
 
-        # 2. 파일 검색 및 로드
+        # 2. 파일 검색 및 로드 (LLM 파싱 중 미리 로드한 파일이 맞으면 재사용)
         print("[SEARCH_ENGINE] 2단계: 공시 파일 검색 및 로드 중...")
-        data = self.find_and_load_disclosure(info)
+        file_path, data = self.locate_disclosure(info, speculation, api_keys)
         if not data:
             print(f"[SEARCH_ENGINE] 에러: 파일을 찾을 수 없음 - {info.get('company_name')}")
-            return {"error": f"해당 회사({info.get('company_name')})의 공시 데이터를 찾을 수 없습니다."}
+            yield {"event": "error", "data": {"message": f"해당 회사({info.get('company_name')})의 공시 데이터를 찾을 수 없습니다."}}
+            return
 
         print("[SEARCH_ENGINE] 파일 로드 완료")
+        company_name = data.get("metadata", {}).get("corp_name")
+        yield {"event": "file", "data": self._file_event_data(file_path, info, company_name)}
 
-        # 3. 요약 생성
+        # 3. 요약 생성 (같은 원본/프롬프트/질문 의도면 캐시 사용)
         print("[SEARCH_ENGINE] 3단계: AI 요약 생성 중...")
-        summary = self.generate_summary(data, query)
-        print("[SEARCH_ENGINE] 요약 생성 완료")
+        cache_key, cached_entry = self.prepare_summary(file_path, data, info, query)
 
-        result = {
-            "summary": summary,
-            "extracted_info": info,
-            "company_name": data.get("metadata", {}).get("corp_name"),
-            "success": True,
-            "raw_data": data  # 항상 원본 데이터 포함
-        }
+        summary_error = None
+        if cached_entry:
+            summary = cached_entry["summary"]
+            print("[SEARCH_ENGINE] 요약 캐시 적중")
+            yield {"event": "summary_token", "data": {"text": summary}}
+        else:
+            # 같은 요약을 생성 중인 요청이 있으면 그 결과를 받음 (실패하면 직접 생성)
+            flight, leader = self.summary_flight.join(cache_key)
+            summary = None
+            if not leader:
+                print("[SEARCH_ENGINE] 같은 요약 생성 중 - 결과 공유 대기")
+                try:
+                    summary = flight.result()
+                    yield {"event": "summary_token", "data": {"text": summary}}
+                except Exception as e:
+                    print(f"[SEARCH_ENGINE] 공유 요약 실패, 직접 생성: {e}")
 
-        return result
+            if summary is None:
+                chunks = []
+                failure = None
+                try:
+                    # 컨텍스트는 원본 행 데이터로 구성 (빈 열 제거/행 정렬이 가능하도록)
+                    quarter_comparison = self.get_quarter_comparison(data, info.get("year"), info.get("quarter"))
+                    summary_data = self.load_summary_data(file_path, query)
+                    for chunk in self.stream_summary(summary_data, query, quarter_comparison):
+                        chunks.append(chunk)
+                        yield {"event": "summary_token", "data": {"text": chunk}}
+                    summary = "".join(chunks)
+                    self._remember_summary(cache_key, summary, company_name, info)
+                except Exception as e:
+                    # 요약 실패는 캐시하지 않고 본문 끝에 오류 메시지로 표시 (대기 중인 요청에는 실패로 전달)
+                    failure = e
+                    summary_error = f"{SUMMARY_ERROR_MESSAGE}: {e}"
+                    error_text = ("\n\n" if chunks else "") + summary_error
+                    summary = "".join(chunks) + error_text
+                    yield {"event": "summary_token", "data": {"text": error_text}}
+                finally:
+                    if leader:
+                        self._finish_summary_flight(cache_key, flight, summary, failure)
+            print("[SEARCH_ENGINE] 요약 생성 완료")
+
+        yield {"event": "done", "data": self._done_event_data(summary, info, company_name, cached_entry is not None, data,
+                                                              summary_error)}
+
+    async def astream_search_and_summarize(self, query: str, api_keys: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        """stream_search_and_summarize의 비동기 버전 (이벤트 순서 동일)
+
+        LLM 호출은 ainvoke/astream, 파일 읽기·캐시 조회처럼 블로킹되는 단계는
+        asyncio.to_thread로 넘겨 이벤트 루프가 다른 요청을 계속 처리하도록 함
+        """
+        print("[SEARCH_ENGINE] 검색 및 요약 시작 (async)")
 
-    def get_company_quarterly_reports(self, company_name: str) -> Dict:
-        """회사명으로 사용 가능한 분기 보고서 목록 조회"""
-        print(f"[SEARCH_ENGINE] {company_name}의 분기 보고서 목록 조회 시작")
+        # 1. 정보 추출
+        print("[SEARCH_ENGINE] 1단계: 질문에서 정보 추출 중...")
+        info, speculation = await self.aextract_info_speculatively(query)
+        if not info:
+            print("[SEARCH_ENGINE] 에러: 정보 추출 실패")
+            yield {"event": "error", "data": {"message": "질문에서 정보를 추출할 수 없습니다."}}
+            return
 
-        available_reports = []
+        print(f"[SEARCH_ENGINE] 정보 추출 완료: {info}")
+        yield {"event": "info", "data": info}
+
+        # 2. 파일 검색 및 로드 (LLM 파싱 중 미리 로드한 파일이 맞으면 재사용)
+        print("[SEARCH_ENGINE] 2단계: 공시 파일 검색 및 로드 중...")
+        file_path, data = await asyncio.to_thread(self.locate_disclosure, info, speculation, api_keys)
+        if not data:
+            print(f"[SEARCH_ENGINE] 에러: 파일을 찾을 수 없음 - {info.get('company_name')}")
+            yield {"event": "error", "data": {"message": f"해당 회사({info.get('company_name')})의 공시 데이터를 찾을 수 없습니다."}}
+            return
 
-        # 2024, 2025년의 모든 분기 검색
-        for year in [2024, 2025]:
-            for quarter in [1, 2, 3, 4]:
-                target_path = os.path.join(BASE_DATA_PATH, str(year), f"Q{quarter}", "companies")
+        print("[SEARCH_ENGINE] 파일 로드 완료")
+        company_name = data.get("metadata", {}).get("corp_name")
+        yield {"event": "file", "data": self._file_event_data(file_path, info, company_name)}
 
-                if not os.path.exists(target_path):
-                    continue
+        # 3. 요약 생성 (같은 원본/프롬프트/질문 의도면 캐시 사용)
+        print("[SEARCH_ENGINE] 3단계: AI 요약 생성 중...")
+        cache_key, cached_entry = await asyncio.to_thread(self.prepare_summary, file_path, data, info, query)
 
+        summary_error = None
+        if cached_entry:
+            summary = cached_entry["summary"]
+            print("[SEARCH_ENGINE] 요약 캐시 적중")
+            yield {"event": "summary_token", "data": {"text": summary}}
+        else:
+            flight, leader = self.summary_flight.join(cache_key)
+            summary = None
+            if not leader:
+                print("[SEARCH_ENGINE] 같은 요약 생성 중 - 결과 공유 대기")
                 try:
-                    file_list = os.listdir(target_path)
-
-                    for filename in file_list:
-                        if filename.endswith('.json') and '_' in filename:
-                            try:
-                                file_company_name = filename.split('_', 1)[1].replace('.json', '')
-
-                                # 정확 매칭 또는 부분 매칭
-                                if (company_name == file_company_name or
-                                    company_name in file_company_name or
-                                    file_company_name in company_name):
-
-                                    # 파일이 실제로 존재하는지 확인
-                                    file_path = os.path.join(target_path, filename)
-                                    if os.path.exists(file_path):
-                                        available_reports.append({
-                                            "year": year,
-                                            "quarter": quarter,
-                                            "company_name": file_company_name,
-                                            "filename": filename,
-                                            "file_path": file_path
-                                        })
-                                        break  # 같은 분기에서 첫 번째 매칭만 취함
-                            except:
-                                continue
+                    summary = await asyncio.shield(asyncio.wrap_future(flight))
+                    yield {"event": "summary_token", "data": {"text": summary}}
+                except Exception as e:
+                    print(f"[SEARCH_ENGINE] 공유 요약 실패, 직접 생성: {e}")
 
+            if summary is None:
+                chunks = []
+                failure = None
+                try:
+                    quarter_comparison = await asyncio.to_thread(
+                        self.get_quarter_comparison, data, info.get("year"), info.get("quarter"))
+                    summary_data = await asyncio.to_thread(self.load_summary_data, file_path, query)
+                    async for chunk in self.astream_summary(summary_data, query, quarter_comparison):
+                        chunks.append(chunk)
+                        yield {"event": "summary_token", "data": {"text": chunk}}
+                    summary = "".join(chunks)
+                    await asyncio.to_thread(self._remember_summary, cache_key, summary, company_name, info)
                 except Exception as e:
-                    print(f"경로 {target_path} 검색 중 오류: {e}")
-                    continue
+                    failure = e
+                    summary_error = f"{SUMMARY_ERROR_MESSAGE}: {e}"
+                    error_text = ("\n\n" if chunks else "") + summary_error
+                    summary = "".join(chunks) + error_text
+                    yield {"event": "summary_token", "data": {"text": error_text}}
+                finally:
+                    if leader:
+                        self._finish_summary_flight(cache_key, flight, summary, failure)
+            print("[SEARCH_ENGINE] 요약 생성 완료")
+
+        yield {"event": "done", "data": self._done_event_data(summary, info, company_name, cached_entry is not None, data,
+                                                              summary_error)}
+
+    def _finish_summary_flight(self, cache_key: str, flight, summary: Optional[str],
+                               error: Optional[BaseException] = None):
+        """대기 중인 같은 요청들에 요약 전달
+
+        생성이 실패했거나(error) 요청이 중간에 끊겨 요약이 없으면 실패로 전달해
+        대기 중인 요청들이 오류 문구를 요약으로 받지 않고 각자 다시 생성하도록 함
+        """
+        if error is None and summary is not None:
+            self.summary_flight.finish(cache_key, flight, summary)
+        else:
+            self.summary_flight.finish(cache_key, flight, error=error or RuntimeError("요약 생성이 중단되었습니다"))
+
+    def _remember_summary(self, cache_key: str, summary: str, company_name: Optional[str], info: Dict):
+        self.summary_cache.put(cache_key, summary, corp_name=company_name,
+                               year=info.get("year"), quarter=info.get("quarter"))
+
+    def _file_event_data(self, file_path: str, info: Dict, company_name: Optional[str]) -> Dict:
+        return {
+            "company_name": company_name,
+            "filename": os.path.basename(file_path),
+            "year": info.get("year"),
+            "quarter": info.get("quarter")
+        }
+
+    def _done_event_data(self, summary: str, info: Dict, company_name: Optional[str], cached: bool, data: Dict,
+                         error: Optional[str] = None) -> Dict:
+        done = {
+            "summary": summary,
+            "extracted_info": info,
+            "company_name": company_name,
+            "success": error is None,
+            "cached": cached,
+            "raw_data": data  # api_keys로 로드한 섹션 (기본은 전체)
+        }
+        if error is not None:
+            done["error"] = error
+        return done
+
+    def get_company_quarterly_reports(self, company_name: str) -> Dict:
+        """회사명으로 사용 가능한 분기 보고서 목록 조회"""
+        print(f"[SEARCH_ENGINE] {company_name}의 분기 보고서 목록 조회 시작")
+
+        # 2024, 2025년의 모든 분기 검색 (인덱스 조회, 최신순)
+        available_reports = [
+            {
+                "year": entry["year"],
+                "quarter": entry["quarter"],
+                "company_name": entry["company_name"],
+                "filename": entry["filename"],
+                "file_path": entry["file_path"],
+                # manifest.json이 있는 분기만 채워짐 (파일을 열지 않고 누락 API 확인)
+                "successful_apis": entry["successful_apis"]
+            }
+            for entry in self.corpus_index.find_company_quarters(company_name, years=[2024, 2025])
+        ]
 
         if not available_reports:
             return {"error": f"'{company_name}'에 해당하는 분기 보고서를 찾을 수 없습니다."}
 
-        # 연도, 분기 순으로 정렬 (최신순)
-        available_reports.sort(key=lambda x: (x["year"], x["quarter"]), reverse=True)
-
         return {
             "company_name": company_name,
             "available_reports": available_reports,
@@ -385,70 +786,140 @@ class DartSearchEngine:
         """회사명, 연도, 분기로 직접 원본 데이터 조회"""
         print(f"[SEARCH_ENGINE] {company_name} {year}년 {quarter}분기 데이터 조회 시작")
 
-        target_path = os.path.join(BASE_DATA_PATH, str(year), f"Q{quarter}", "companies")
-
-        if not os.path.exists(target_path):
+        if not self.corpus_index.has_quarter(year, quarter):
             return {"error": f"{year}년 {quarter}분기 데이터 경로를 찾을 수 없습니다."}
 
         try:
-            file_list = os.listdir(target_path)
-
-            exact_match = None
-            partial_matches = []
-
-            for filename in file_list:
-                if filename.endswith('.json') and '_' in filename:
-                    try:
-                        file_company_name = filename.split('_', 1)[1].replace('.json', '')
-
-                        # 정확히 일치하는 경우
-                        if company_name == file_company_name:
-                            exact_match = filename
-                            break
-                        # 부분 매칭 후보 저장
-                        elif company_name in file_company_name or file_company_name in company_name:
-                            partial_matches.append((filename, file_company_name))
-                    except:
-                        continue
-
-            # 정확 매칭 우선
-            if exact_match:
-                file_path = os.path.join(target_path, exact_match)
-                print(f"파일을 찾았습니다: {exact_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return {
-                        "company_name": data.get("metadata", {}).get("corp_name"),
-                        "year": year,
-                        "quarter": quarter,
-                        "raw_data": data,
-                        "success": True
-                    }
-
-            # 부분 매칭이 있으면 사용
-            if partial_matches:
-                partial_matches.sort(key=lambda x: len(x[1]))  # 이름 길이 기준 정렬
-                best_match = partial_matches[0][0]
-                file_path = os.path.join(target_path, best_match)
-                print(f"부분 매칭 파일을 사용합니다: {best_match}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return {
-                        "company_name": data.get("metadata", {}).get("corp_name"),
-                        "year": year,
-                        "quarter": quarter,
-                        "raw_data": data,
-                        "success": True
-                    }
+            entry, match_type = self.corpus_index.find(company_name, year, quarter)
+
+            # 정확 매칭 우선, 없으면 부분 매칭 사용
+            if entry:
+                if match_type == "exact":
+                    print(f"파일을 찾았습니다: {entry['filename']}")
+                else:
+                    print(f"부분 매칭 파일을 사용합니다: {entry['filename']}")
+                data = self.disclosure_cache.load_raw(entry["file_path"])
+                return {
+                    "company_name": data.get("metadata", {}).get("corp_name"),
+                    "year": year,
+                    "quarter": quarter,
+                    "raw_data": data,
+                    "success": True
+                }
 
             return {"error": f"'{company_name}'의 {year}년 {quarter}분기 데이터를 찾을 수 없습니다."}
 
         except Exception as e:
             return {"error": f"파일 검색 중 오류 발생: {str(e)}"}
 
+    async def aget_company_quarterly_reports(self, company_name: str) -> Dict:
+        """get_company_quarterly_reports의 비동기 버전 (스레드풀에서 인덱스 조회)"""
+        return await asyncio.to_thread(self.get_company_quarterly_reports, company_name)
+
+    async def aget_company_data(self, company_name: str, year: int, quarter: int) -> Dict:
+        """get_company_data의 비동기 버전 (스레드풀에서 파일 읽기)"""
+        return await asyncio.to_thread(self.get_company_data, company_name, year, quarter)
+
+    def prefetch_mode_analyses(self, query: str, summary: str, failed: bool = False) -> int:
+        """요약의 모드별 분석을 백그라운드에서 시작, 시작한 분석 수
+
+        failed: 요약 단계가 실패했는지 (done 결과의 success=False, 중간까지 생성된 요약은 분석하지 않음)
+        """
+        if failed or not summary:
+            return 0
+        started = self.analysis_prefetcher.schedule(query, summary)
+        if started:
+            print(f"[SEARCH_ENGINE] 모드별 분석 미리 생성 시작: {started}개")
+        return started
+
+    def _analyze_by_mode(self, query: str, mode: str, existing_summary: str) -> str:
+        """모드별 분석 LLM 호출 (오류는 예외로, 미리 생성용)"""
+        chain, inputs = self._build_mode_analysis_chain(query, mode, existing_summary)
+        return chain.invoke(inputs)
+
+    def _prefetched_analysis(self, query: str, mode: str, existing_summary: str) -> Optional[str]:
+        """미리 생성된(또는 생성 중인) 분석 결과, 없거나 실패했으면 None"""
+        future = self.analysis_prefetcher.lookup(mode, query, existing_summary)
+        if future is None:
+            return None
+        try:
+            analysis = future.result()
+        except Exception:
+            return None
+        print(f"[SEARCH_ENGINE] 미리 생성된 모드별 분석 사용: {mode}")
+        return analysis
+
+    async def _aprefetched_analysis(self, query: str, mode: str, existing_summary: str) -> Optional[str]:
+        """_prefetched_analysis의 비동기 버전 (요청이 끊겨도 진행 중인 분석은 취소하지 않음)"""
+        future = self.analysis_prefetcher.lookup(mode, query, existing_summary)
+        if future is None:
+            return None
+        try:
+            analysis = await asyncio.shield(asyncio.wrap_future(future))
+        except Exception:
+            return None
+        print(f"[SEARCH_ENGINE] 미리 생성된 모드별 분석 사용: {mode}")
+        return analysis
+
     def analyze_by_mode_with_summary(self, query: str, mode: str, existing_summary: str) -> str:
         """모드별 추가 분석 (이미 생성된 요약 사용) HCX-007 사용"""
         print(f"[SEARCH_ENGINE] 모드별 분석 시작 (기존 요약 사용): {mode}")
+        analysis = self._prefetched_analysis(query, mode, existing_summary)
+        if analysis is not None:
+            return analysis
+        chain, inputs = self._build_mode_analysis_chain(query, mode, existing_summary)
+        try:
+            return chain.invoke(inputs)
+        except Exception as e:
+            return f"분석 중 오류가 발생했습니다: {str(e)}"
+
+    def stream_analysis_by_mode(self, query: str, mode: str, existing_summary: str) -> Iterator[str]:
+        """모드별 추가 분석을 토큰 단위로 생성 (오류 시 오류 메시지를 마지막 토큰으로)
+
+        미리 생성된 분석이 있으면 한 번에 전달
+        """
+        print(f"[SEARCH_ENGINE] 모드별 분석 스트리밍 시작 (기존 요약 사용): {mode}")
+        analysis = self._prefetched_analysis(query, mode, existing_summary)
+        if analysis is not None:
+            yield analysis
+            return
+        chain, inputs = self._build_mode_analysis_chain(query, mode, existing_summary)
+        try:
+            for chunk in chain.stream(inputs):
+                if chunk:
+                    yield chunk
+        except Exception as e:
+            yield f"분석 중 오류가 발생했습니다: {str(e)}"
+
+    async def aanalyze_by_mode_with_summary(self, query: str, mode: str, existing_summary: str) -> str:
+        """analyze_by_mode_with_summary의 비동기 버전 (ainvoke)"""
+        print(f"[SEARCH_ENGINE] 모드별 분석 시작 (기존 요약 사용, async): {mode}")
+        analysis = await self._aprefetched_analysis(query, mode, existing_summary)
+        if analysis is not None:
+            return analysis
+        chain, inputs = self._build_mode_analysis_chain(query, mode, existing_summary)
+        try:
+            return await chain.ainvoke(inputs)
+        except Exception as e:
+            return f"분석 중 오류가 발생했습니다: {str(e)}"
+
+    async def astream_analysis_by_mode(self, query: str, mode: str, existing_summary: str) -> AsyncIterator[str]:
+        """stream_analysis_by_mode의 비동기 버전 (astream)"""
+        print(f"[SEARCH_ENGINE] 모드별 분석 스트리밍 시작 (기존 요약 사용, async): {mode}")
+        analysis = await self._aprefetched_analysis(query, mode, existing_summary)
+        if analysis is not None:
+            yield analysis
+            return
+        chain, inputs = self._build_mode_analysis_chain(query, mode, existing_summary)
+        try:
+            async for chunk in chain.astream(inputs):
+                if chunk:
+                    yield chunk
+        except Exception as e:
+            yield f"분석 중 오류가 발생했습니다: {str(e)}"
+
+    def _build_mode_analysis_chain(self, query: str, mode: str, existing_summary: str) -> Tuple:
+        """모드별 분석 체인과 입력값 (analyze_by_mode_with_summary / stream_analysis_by_mode 공용)"""
 
         # HTML 태그 제거하여 텍스트만 추출
         import re
@@ -538,15 +1009,11 @@ class DartSearchEngine:
 
         chain = prompt_template | self.query_parser_llm | StrOutputParser()
 
-        try:
-            analysis = chain.invoke({
-                "query": query,
-                "summary": summary_text,
-                "company_name": company_name
-            })
-            return analysis
-        except Exception as e:
-            return f"분석 중 오류가 발생했습니다: {str(e)}"
+        return chain, {
+            "query": query,
+            "summary": summary_text,
+            "company_name": company_name
+        }
 
 
 # 테스트용 함수
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+요약 single flight 테스트 - 리더(처음 요청)의 요약이 실패하면
+같은 요약을 기다리던 요청들은 오류 문구를 받지 않고 각자 다시 생성해야 함
+
+    cd dart_search && python -m pytest -q test_single_flight.py
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+os.environ.setdefault("DART_LLM_PROVIDER", "fake")
+os.environ.setdefault("DART_SUMMARY_CACHE_DISK", "0")
+os.environ.setdefault("DART_ANALYSIS_PREFETCH_WORKERS", "0")
+os.environ.setdefault("DART_PREFETCH_CANDIDATES", "0")
+
+import search_engine
+from search_engine import DartSearchEngine, SUMMARY_ERROR_MESSAGE
+from single_flight import SingleFlight
+
+QUERY = "테스트전자 2025년 2분기 실적"
+INFO = {"company_name": "테스트전자", "year": 2025, "quarter": 2}
+FOLLOWERS = 2
+SUMMARY = "정상 요약"
+
+
+def test_leader_error_reaches_followers_and_next_join_leads():
+    flight = SingleFlight("test")
+    future, leader = flight.join("key")
+    followers = [flight.join("key") for _ in range(FOLLOWERS)]
+    assert leader and not any(is_leader for _, is_leader in followers)
+
+    flight.finish("key", future, error=RuntimeError("boom"))
+    for follower, _ in followers:
+        with pytest.raises(RuntimeError):
+            follower.result(timeout=1)
+
+    # 실패한 호출은 남지 않으므로 다음 요청이 새 리더
+    assert flight.join("key")[1]
+    assert flight.stats()["failures"] == 1
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """파일/캐시 단계는 고정값, 요약 스트림은 첫 호출(리더)만 실패하는 엔진"""
+    monkeypatch.setattr(search_engine, "BASE_DATA_PATH", str(tmp_path))
+    engine = DartSearchEngine()
+    data = {"metadata": {"corp_name": INFO["company_name"]}}
+
+    monkeypatch.setattr(engine, "extract_info_speculatively", lambda query: (dict(INFO), None))
+    monkeypatch.setattr(engine, "locate_disclosure", lambda info, speculation=None, api_keys=None:
+                        (str(tmp_path / "000000_테스트전자.json"), data))
+    monkeypatch.setattr(engine, "prepare_summary", lambda file_path, data, info, query: ("summary-key", None))
+    monkeypatch.setattr(engine, "get_quarter_comparison", lambda data, year, quarter: "")
+    monkeypatch.setattr(engine, "load_summary_data", lambda file_path, query: {})
+    monkeypatch.setattr(engine, "_remember_summary", lambda *args: None)
+
+    async def aextract_info_speculatively(query):
+        return dict(INFO), None
+
+    monkeypatch.setattr(engine, "aextract_info_speculatively", aextract_info_speculatively)
+
+    calls = []
+    lock = threading.Lock()
+
+    def followers_joined():
+        # 대기 요청이 모두 붙은 뒤에 실패시켜야 공유 실패를 검증할 수 있음
+        deadline = time.monotonic() + 5
+        while engine.summary_flight.stats()["deduplicated"] < FOLLOWERS:
+            assert time.monotonic() < deadline, "대기 요청이 붙지 않음"
+            time.sleep(0.01)
+
+    def first_call():
+        with lock:
+            calls.append(None)
+            return len(calls) == 1
+
+    def stream_summary(data, query, quarter_comparison=""):
+        if first_call():
+            followers_joined()
+            yield "중간까지 생성된 요약"
+            raise RuntimeError("LLM 실패")
+        yield SUMMARY
+
+    async def astream_summary(data, query, quarter_comparison=""):
+        if first_call():
+            await asyncio.to_thread(followers_joined)
+            yield "중간까지 생성된 요약"
+            raise RuntimeError("LLM 실패")
+        yield SUMMARY
+
+    monkeypatch.setattr(engine, "stream_summary", stream_summary)
+    monkeypatch.setattr(engine, "astream_summary", astream_summary)
+    engine.summary_calls = calls
+    return engine
+
+
+def assert_followers_recovered(engine, results):
+    failed = [result for result in results if not result["success"]]
+    recovered = [result for result in results if result["success"]]
+
+    assert len(failed) == 1
+    assert SUMMARY_ERROR_MESSAGE in failed[0]["error"]
+    assert len(recovered) == FOLLOWERS
+    assert all(result["summary"] == SUMMARY for result in recovered)
+
+    stats = engine.summary_flight.stats()
+    assert stats["failures"] == 1 and stats["in_flight"] == 0
+    assert len(engine.summary_calls) == 1 + FOLLOWERS
+
+
+def test_leader_fails_followers_recover(engine):
+    with ThreadPoolExecutor(max_workers=1 + FOLLOWERS) as pool:
+        results = list(pool.map(lambda _: engine.search_and_summarize(QUERY), range(1 + FOLLOWERS)))
+    assert_followers_recovered(engine, results)
+
+
+def test_leader_fails_followers_recover_async(engine):
+    async def run():
+        return await asyncio.gather(*(engine.asearch_and_summarize(QUERY) for _ in range(1 + FOLLOWERS)))
+
+    assert_followers_recovered(engine, asyncio.run(run()))